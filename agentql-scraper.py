@@ -7,11 +7,15 @@ Scrape any website using AgentQL API (formerly TinyFish)
 import os
 import sys
 import json
-import requests
 from datetime import datetime
 from urllib.parse import urlparse
 import re
 
+from http_transport import create_session
+from intel_index import index_intel
+from response_cache import ResponseCache
+from jake_triggers import JAKE_TRIGGERS, TRIGGER_SCANNER
+
 # Load API key
 API_KEY = None
 # Check multiple locations for API key
@@ -38,7 +42,7 @@ if not API_KEY:
     sys.exit(1)
 
 class AgentQLScraper:
-    def __init__(self):
+    def __init__(self, use_cache=True, refresh=False):
         self.api_key = API_KEY
         self.base_url = "https://api.agentql.com"
         self.headers = {
@@ -46,6 +50,9 @@ class AgentQLScraper:
             "Content-Type": "application/json",
             "X-AgentQL-API-Key": self.api_key  # Some endpoints may use this
         }
+        self.session = create_session(self.headers)
+        self.cache = ResponseCache() if use_cache else None
+        self.refresh = refresh
         
     def get_query_template(self, url):
         """Get platform-specific query template for AgentQL"""
@@ -111,29 +118,42 @@ class AgentQLScraper:
         # Add any custom options
         if options:
             payload.update(options)
+        # Keyed by the normalized URL plus the query, not the raw URL
+        cache_options = {key: value for key, value in payload.items() if key != "url"}
+            
+        # Paid API call: serve from cache while the entry is fresh
+        if self.cache and not self.refresh:
+            cached = self.cache.get_json(url, cache_options)
+            if cached and cached["fresh"]:
+                print(f"📦 Cache hit: {url}")
+                return self.process_response(cached["body"], url)
             
         try:
             # Make request to AgentQL
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/extract",
-                headers=self.headers,
                 json=payload,
                 timeout=30
             )
             
             if response.status_code == 200:
-                return self.process_response(response.json(), url)
+                data = response.json()
+                if self.cache:
+                    self.cache.put(url, data, cache_options)
+                return self.process_response(data, url)
             else:
                 # Try alternative endpoint
-                alt_response = requests.post(
+                alt_response = self.session.post(
                     f"{self.base_url}/scrape",
-                    headers=self.headers,
                     json={"targetUrl": url, "query": query},
                     timeout=30
                 )
                 
                 if alt_response.status_code == 200:
-                    return self.process_response(alt_response.json(), url)
+                    data = alt_response.json()
+                    if self.cache:
+                        self.cache.put(url, data, cache_options)
+                    return self.process_response(data, url)
                 else:
                     return {"error": f"API returned {response.status_code}: {response.text}"}
                     
@@ -277,29 +297,23 @@ class AgentQLScraper:
         if not content:
             return {}
             
-        content_lower = content.lower()
         word_count = len(content.split())
         
-        # Jake trigger detection
-        triggers = {
-            "father_wound": ["father", "dad", "absent", "disappointed", "failed him", "never there", "old man"],
-            "marriage_death": ["marriage", "divorce", "wife", "alone", "empty bed", "she left", "lonely"],
-            "porn_struggle": ["porn", "lust", "addiction", "struggle", "temptation", "relapse", "shame"],
-            "church_hurt": ["church", "pastor", "ministry", "fake", "hypocrite", "burned out", "lost faith"],
-            "masculinity": ["man", "masculine", "weak", "strong", "warrior", "leader", "passive"],
-            "grace": ["grace", "forgiven", "mercy", "second chance", "redemption", "worthy"]
-        }
+        # Jake trigger detection: one pass of the shared phrase automaton
+        scan = TRIGGER_SCANNER.analyze(content)
+        counts = scan["categories"]
         
         found_triggers = []
         trigger_density = 0
         
-        for trigger_type, keywords in triggers.items():
-            count = sum(1 for keyword in keywords if keyword in content_lower)
+        for trigger_type in JAKE_TRIGGERS:
+            count = counts[trigger_type]
             if count > 0:
                 found_triggers.append({
                     "type": trigger_type,
                     "count": count,
-                    "density": (count / word_count) * 100
+                    "density": (count / word_count) * 100,
+                    "keywords": TRIGGER_SCANNER.category_phrases(trigger_type, scan["phrases"])
                 })
                 trigger_density += count
                 
@@ -307,9 +321,7 @@ class AgentQLScraper:
         first_line = content.split('\n')[0] if content else ""
         
         # Emotional density
-        emotional_words = ["pain", "hurt", "broken", "lost", "angry", "alone", "empty", 
-                          "shame", "guilt", "fear", "hate", "love", "hope", "peace"]
-        emotional_count = sum(1 for word in emotional_words if word in content_lower)
+        emotional_count = counts["emotional"]
         emotional_density = (emotional_count / word_count) * 100 if word_count > 0 else 0
         
         return {
@@ -335,6 +347,7 @@ class AgentQLScraper:
         json_file = f"intel/agentql_{platform}_{timestamp}.json"
         with open(json_file, 'w') as f:
             json.dump(data, f, indent=2)
+        index_intel(data, json_file, source="agentql")
             
         # Save markdown summary
         md_file = f"intel/agentql_{platform}_{timestamp}.md"
@@ -380,13 +393,18 @@ class AgentQLScraper:
         return {"json": json_file, "markdown": md_file}
 
 def main():
+    use_cache = "--no-cache" not in sys.argv
+    refresh = "--refresh" in sys.argv
+    sys.argv = [arg for arg in sys.argv if arg not in ("--no-cache", "--refresh")]
+    
     if len(sys.argv) < 2:
         print("AgentQL Intelligence Extractor")
         print("Usage: agentql-scraper.py <URL>")
         print("       agentql-scraper.py batch <file.txt>")
+        print("Flags: --no-cache (skip response cache), --refresh (force re-fetch)")
         sys.exit(1)
         
-    scraper = AgentQLScraper()
+    scraper = AgentQLScraper(use_cache=use_cache, refresh=refresh)
     
     if sys.argv[1] == "batch" and len(sys.argv) > 2:
         # Batch processing
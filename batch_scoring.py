@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Batch Scoring
+Score many documents at once with NumPy. Each chunk of documents is
+tokenized once, mapped to integer term ids and counted into a document x
+lexicon-phrase matrix; every density, trigger count and theme score is
+then a matrix operation.
+Results match the per-document methods:
+
+  IntelExtractor.analyze_content   -> BatchScorer.intel_metrics   (the 'metrics' block)
+  AgentQLScraper.analyze_content   -> BatchScorer.agentql_analyses
+  ThemeCategorizer.analyze_content -> BatchScorer.theme_scores
+"""
+
+import re
+from itertools import chain, repeat
+
+import numpy as np
+
+from intel_extractor import LEXICON_CATEGORIES, LEXICON_INDEX
+from jake_triggers import JAKE_TRIGGERS, TRIGGER_SCANNER
+from phrase_scanner import TOKEN_PATTERN
+from theme_categorizer import ThemeCategorizer
+
+# Documents tokenized per NumPy pass; bounds the token array's memory
+CHUNK_SIZE = 1000
+
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+
+class BatchScorer:
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.theme_categorizer = ThemeCategorizer()
+
+        # One column per distinct phrase across every lexicon
+        phrases = list(LEXICON_INDEX)
+        theme_scanner = self.theme_categorizer.scanner
+        for scanner in (TRIGGER_SCANNER, theme_scanner):
+            phrases += [p for p in scanner.phrase_categories if p not in phrases]
+        self.phrases = phrases
+        self.columns = {phrase: i for i, phrase in enumerate(phrases)}
+        self.phrase_tokens = [phrase.split() for phrase in phrases]
+        self.phrase_lengths = np.array([len(words) for words in self.phrase_tokens], dtype=np.int64)
+        self.phrase_triggers = [TRIGGER_SCANNER.phrase_categories.get(phrase, ()) for phrase in phrases]
+
+        # Every word of every phrase gets an integer term id (0: not in any lexicon),
+        # so matching runs over int arrays instead of string arrays
+        self.term_ids = {}
+        for words in self.phrase_tokens:
+            for word in words:
+                self.term_ids.setdefault(word, len(self.term_ids) + 1)
+        self.single_columns = np.full(len(self.term_ids) + 1, -1, dtype=np.int64)
+        for phrase, column in self.columns.items():
+            if ' ' not in phrase:
+                self.single_columns[self.term_ids[phrase]] = column
+        self.multiword = [(self.columns[p], [self.term_ids[w] for w in p.split()]) for p in phrases if ' ' in p]
+
+        # Phrase -> category membership matrices
+        self.intel_categories = list(LEXICON_CATEGORIES)
+        self.intel_matrix = np.zeros((len(phrases), len(self.intel_categories)), dtype=np.int64)
+        for phrase, mask in LEXICON_INDEX.items():
+            for j, category in enumerate(self.intel_categories):
+                if mask & LEXICON_CATEGORIES[category]:
+                    self.intel_matrix[self.columns[phrase], j] = 1
+
+        self.trigger_categories = list(TRIGGER_SCANNER.lexicon)
+        self.trigger_matrix = np.zeros((len(phrases), len(self.trigger_categories)), dtype=np.int64)
+        for phrase, categories in TRIGGER_SCANNER.phrase_categories.items():
+            for category in categories:
+                self.trigger_matrix[self.columns[phrase], self.trigger_categories.index(category)] = 1
+
+        self.themes = list(theme_scanner.lexicon)
+        self.theme_matrix = np.zeros((len(phrases), len(self.themes)), dtype=np.int64)
+        for phrase, themes in theme_scanner.phrase_categories.items():
+            for theme in themes:
+                self.theme_matrix[self.columns[phrase], self.themes.index(theme)] = 1
+
+    def _chunks(self, texts):
+        texts = list(texts)
+        for start in range(0, len(texts), self.chunk_size):
+            yield texts[start:start + self.chunk_size]
+
+    def count_matrix(self, texts):
+        """
+        Tokenize a chunk once and count every lexicon phrase
+
+        Returns:
+            tuple: (counts [docs x phrases], first [docs x phrases] token index
+            where each phrase first ends (-1 if absent), token count per doc,
+            total token length per doc)
+        """
+        token_lists = [TOKEN_PATTERN.findall(text.lower()) for text in texts]
+        docs = len(texts)
+        width = len(self.phrases)
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=docs)
+        char_totals = np.fromiter((sum(map(len, tokens)) for tokens in token_lists), dtype=np.int64, count=docs)
+
+        ids = np.fromiter(map(self.term_ids.get, chain.from_iterable(token_lists), repeat(0)),
+                          dtype=np.int64, count=int(lengths.sum()))
+        doc_ids = np.repeat(np.arange(docs), lengths)
+        positions = np.arange(len(ids))
+
+        hit_docs, hit_columns, hit_positions = [], [], []
+
+        if len(ids):
+            single = self.single_columns[ids]
+            hits = single >= 0
+            hit_docs.append(doc_ids[hits])
+            hit_columns.append(single[hits])
+            hit_positions.append(positions[hits])
+
+        for column, words in self.multiword:
+            span = len(words)
+            if len(ids) < span:
+                continue
+            starts = len(ids) - span + 1
+            hits = doc_ids[:starts] == doc_ids[span - 1:]
+            for offset, word in enumerate(words):
+                hits &= ids[offset:offset + starts] == word
+            hit_docs.append(doc_ids[:starts][hits])
+            hit_columns.append(np.full(int(hits.sum()), column))
+            hit_positions.append(positions[:starts][hits] + span - 1)
+
+        counts = np.zeros(docs * width, dtype=np.int64)
+        first = np.full(docs * width, np.iinfo(np.int64).max, dtype=np.int64)
+        if hit_docs:
+            cells = np.concatenate(hit_docs) * width + np.concatenate(hit_columns)
+            counts += np.bincount(cells, minlength=docs * width)
+            np.minimum.at(first, cells, np.concatenate(hit_positions))
+        first[first == np.iinfo(np.int64).max] = -1
+
+        return counts.reshape(docs, width), first.reshape(docs, width), lengths, char_totals
+
+    def intel_metrics(self, texts):
+        """IntelExtractor.analyze_content()['analysis']['metrics'] for each text"""
+        results = []
+        for chunk in self._chunks(texts):
+            counts, _, words, char_totals = self.count_matrix(chunk)
+            category = counts @ self.intel_matrix
+            column = {name: category[:, j] for j, name in enumerate(self.intel_categories)}
+            has_words = words > 0
+            safe_words = np.where(has_words, words, 1)
+
+            def density(values):
+                return np.where(has_words, values / safe_words * 100, 0).tolist()
+
+            metrics = {
+                'word_count': words.tolist(),
+                'avg_word_length': np.where(has_words, char_totals / safe_words, 0).tolist(),
+                'sentence_count': [len(SENTENCE_SPLIT.split(text)) for text in chunk],
+                'emotional_density': density(column['emotional']),
+                'power_word_density': density(column['power']),
+                'cta_density': density(column['cta']),
+                'spiritual_density': density(column['spiritual']),
+                'sentiment_score': density(column['positive'] - column['negative'])
+            }
+            for i in range(len(chunk)):
+                results.append({key: values[i] for key, values in metrics.items()})
+        return results
+
+    def agentql_analyses(self, texts):
+        """AgentQLScraper.analyze_content() for each text"""
+        results = []
+        emotional = self.trigger_categories.index('emotional')
+        trigger_columns = [self.trigger_categories.index(t) for t in JAKE_TRIGGERS]
+
+        for chunk in self._chunks(texts):
+            counts, first, _, _ = self.count_matrix(chunk)
+            category = counts @ self.trigger_matrix
+            word_counts = np.array([len(text.split()) for text in chunk], dtype=np.int64)
+            has_words = word_counts > 0
+            safe_words = np.where(has_words, word_counts, 1)
+
+            trigger_counts = category[:, trigger_columns]
+            trigger_densities = (trigger_counts / safe_words[:, None]) * 100
+            trigger_totals = trigger_counts.sum(axis=1)
+            trigger_density = np.where(has_words, (trigger_totals / safe_words) * 100, 0)
+            emotional_density = np.where(has_words, (category[:, emotional] / safe_words) * 100, 0)
+
+            for i, content in enumerate(chunk):
+                if not content:
+                    results.append({})
+                    continue
+
+                # Keyword order as the phrase scanner reports them: by end token, longest first
+                present = np.nonzero(counts[i])[0]
+                present = present[np.lexsort((-self.phrase_lengths[present], first[i, present]))]
+                keywords = {}
+                for c in present.tolist():
+                    for trigger_type in self.phrase_triggers[c]:
+                        keywords.setdefault(trigger_type, []).append(self.phrases[c])
+
+                found_triggers = []
+                for j, trigger_type in enumerate(JAKE_TRIGGERS):
+                    count = int(trigger_counts[i, j])
+                    if count > 0:
+                        found_triggers.append({
+                            "type": trigger_type,
+                            "count": count,
+                            "density": float(trigger_densities[i, j]),
+                            "keywords": keywords.get(trigger_type, [])
+                        })
+
+                total = int(trigger_totals[i])
+                emotional_value = float(emotional_density[i])
+                results.append({
+                    "triggers": found_triggers,
+                    "trigger_density": float(trigger_density[i]),
+                    "emotional_density": emotional_value,
+                    "hook": content.split('\n')[0][:100],
+                    "word_count": int(word_counts[i]),
+                    "viral_potential": "HIGH" if emotional_value > 5 or total > 3 else "MEDIUM" if emotional_value > 2 else "LOW"
+                })
+        return results
+
+    def theme_scores(self, texts):
+        """ThemeCategorizer.analyze_content() for each text ({CoreTheme: score})"""
+        results = []
+        for chunk in self._chunks(texts):
+            counts, _, _, _ = self.count_matrix(chunk)
+            theme_counts = counts @ self.theme_matrix
+            word_counts = np.array([len(text.split()) for text in chunk], dtype=np.int64)
+            has_words = word_counts[:, None] > 0
+            safe_words = np.where(has_words, word_counts[:, None], 1)
+            scores = np.where(has_words, np.minimum(theme_counts / (safe_words * 0.01), 1.0), 0.0).tolist()
+            for row in scores:
+                results.append(dict(zip(self.themes, row)))
+        return results
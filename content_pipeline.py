@@ -1,12 +1,75 @@
 from voice_dna_matcher import VoiceDNAMatcher
-from kjv_reference_system import KJVReferenceSystem
+from kjv_reference_system import KJVReferenceSystem, LOOKUP_PATTERN
 from theme_categorizer import ThemeCategorizer
+from draft_scorer import DraftScorer
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import glob
+import json
+import os
+import sys
+
+# Documents whose analysis is kept between calls (process then validate, re-runs)
+CONTEXT_CACHE_SIZE = 32
+
+# Documents submitted per worker ahead of the one being yielded
+IN_FLIGHT_PER_WORKER = 4
+
+class AnalysisContext:
+    """
+    One document's analysis, computed on first use and cached, so every
+    pipeline stage shares a single tokenization and a single run of each
+    analyzer
+    """
+    def __init__(self, content, voice_matcher, theme_categorizer):
+        self.content = content
+        self.voice_matcher = voice_matcher
+        self.theme_categorizer = theme_categorizer
+        self._results = {}
+    
+    def _cached(self, stage, compute):
+        if stage not in self._results:
+            self._results[stage] = compute()
+        return self._results[stage]
+    
+    @property
+    def tokens(self):
+        """Sentences and word tokens, split once"""
+        return self._cached('tokens', lambda: self.voice_matcher.tokenize(self.content))
+    
+    @property
+    def voice(self):
+        return self._cached('voice', lambda: self.voice_matcher.analyze_text(self.content, tokens=self.tokens))
+    
+    @property
+    def voice_suggestions(self):
+        return self._cached('voice_suggestions',
+                            lambda: self.voice_matcher.get_voice_suggestions(self.content, stats=self.voice))
+    
+    @property
+    def themes(self):
+        return self._cached('themes', lambda: self.theme_categorizer.categorize_content(self.content))
 
 class ContentPipeline:
-    def __init__(self):
-        self.voice_matcher = VoiceDNAMatcher()
+    def __init__(self, context_cache_size=CONTEXT_CACHE_SIZE, tokenizer=None):
+        self.voice_matcher = VoiceDNAMatcher(tokenizer)
         self.scripture_system = KJVReferenceSystem()
         self.theme_categorizer = ThemeCategorizer()
+        self.context_cache_size = context_cache_size
+        self.contexts = OrderedDict()
+    
+    def context(self, content):
+        """The (possibly cached) AnalysisContext for a document"""
+        context = self.contexts.get(content)
+        if context is None:
+            context = AnalysisContext(content, self.voice_matcher, self.theme_categorizer)
+            self.contexts[content] = context
+            while len(self.contexts) > self.context_cache_size:
+                self.contexts.popitem(last=False)
+        else:
+            self.contexts.move_to_end(content)
+        return context
     
     def process_content(self, content, scripture_refs=None):
         """
@@ -14,29 +77,96 @@ class ContentPipeline:
         
         Args:
             content (str): The main content to process
-            scripture_refs (list): Optional list of scripture references
+            scripture_refs (list): Scripture references to resolve; None
+                extracts every reference cited in the content
             
         Returns:
             dict: Complete analysis results
         """
+        context = self.context(content)
+        # Copies, so callers editing their results can't corrupt the cached context
         results = {
-            'voice_dna': self.voice_matcher.analyze_text(content),
-            'voice_suggestions': self.voice_matcher.get_voice_suggestions(content),
-            'themes': self.theme_categorizer.categorize_content(content),
+            'voice_dna': dict(context.voice),
+            'voice_suggestions': list(context.voice_suggestions),
+            'themes': {key: copy.copy(value) for key, value in context.themes.items()},
             'scriptures': {}
         }
         
-        # Process scripture references if provided
-        if scripture_refs:
-            for ref in scripture_refs:
-                try:
-                    verses = self.scripture_system.get_verses(ref)
-                    results['scriptures'][ref] = verses
-                except ValueError as e:
-                    results['scriptures'][ref] = str(e)
+        # Resolve scripture references: the given ones, or every one cited in the content
+        scriptures = self.scripture_system
+        if scripture_refs is None:
+            results['scriptures'] = scriptures.extract_and_resolve(content)
+        else:
+            found = {ref: scriptures.find_references(ref, LOOKUP_PATTERN) for ref in scripture_refs}
+            resolved = scriptures.resolve_references([r for refs in found.values() for r in refs])
+            for ref, refs in found.items():
+                if not refs:
+                    results['scriptures'][ref] = "Invalid reference format"
+                    continue
+                errors = [resolved[r['label']] for r in refs if isinstance(resolved[r['label']], str)]
+                results['scriptures'][ref] = errors[0] if errors else [
+                    verse for r in refs for verse in resolved[r['label']]]
         
         return results
     
+    def draft_scorer(self, text=''):
+        """Incremental scorer for a draft being edited, sharing this pipeline's analyzers"""
+        return DraftScorer(text, self.voice_matcher, self.theme_categorizer)
+    
+    def process_document(self, document):
+        """
+        process_content for one process_many item: a string, or a dict with
+        'content' and optional 'scripture_refs'/'source'
+        """
+        if isinstance(document, str):
+            return self.process_content(document)
+        results = self.process_content(document.get('content', ''), document.get('scripture_refs'))
+        if 'source' in document:
+            results = {'source': document['source'], **results}
+        return results
+    
+    def process_document_or_error(self, document):
+        """process_document, with a failure returned as an {'error': ...} record instead of raised"""
+        try:
+            return self.process_document(document)
+        except Exception as e:
+            record = {'error': f"{type(e).__name__}: {e}"}
+            if isinstance(document, dict) and 'source' in document:
+                record = {'source': document['source'], **record}
+            return record
+    
+    def process_many(self, documents, workers=1):
+        """
+        Process a stream of documents, yielding results in input order
+        
+        Args:
+            documents (iterable): Strings or dicts (see process_document),
+                e.g. from load_documents()
+            workers (int): Processes to fan out to; each loads the pipeline
+                once. 1 processes in this process.
+            
+        Yields:
+            dict: process_content results, one per document, in order, or
+            {'source', 'error'} for a document that failed (the rest of the
+            batch still runs). At most workers * IN_FLIGHT_PER_WORKER
+            documents are held at once.
+        """
+        if workers <= 1:
+            for document in documents:
+                yield self.process_document_or_error(document)
+            return
+        
+        window = workers * IN_FLIGHT_PER_WORKER
+        pending = deque()
+        with ProcessPoolExecutor(workers, initializer=_init_pipeline_worker,
+                                 initargs=(self.voice_matcher.tokenizer_backend,)) as pool:
+            for document in documents:
+                pending.append(pool.submit(_process_document, document))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
     def validate_content(self, content, min_voice_score=0.7, min_theme_count=2):
         """
         Validate content against pipeline requirements
@@ -45,18 +175,86 @@ class ContentPipeline:
             tuple: (bool, list of issues)
         """
         issues = []
-        voice_analysis = self.voice_matcher.analyze_text(content)
-        theme_analysis = self.theme_categorizer.categorize_content(content)
+        context = self.context(content)
+        voice_analysis = context.voice
+        theme_analysis = context.themes
         
         if voice_analysis['match_score'] < min_voice_score:
-            issues.extend(self.voice_matcher.get_voice_suggestions(content))
+            issues.extend(context.voice_suggestions)
             
         if len(theme_analysis['primary_themes']) < min_theme_count:
             issues.append(f"Content should strongly reflect at least {min_theme_count} core themes")
         
         return (len(issues) == 0, issues)
 
+_worker_pipeline = None
+
+def _init_pipeline_worker(tokenizer=None):
+    """Pool initializer: one pipeline (tokenizers, lexicons) per worker process"""
+    global _worker_pipeline
+    _worker_pipeline = ContentPipeline(tokenizer=tokenizer)
+    # Load the tokenizer now rather than on the worker's first document
+    _worker_pipeline.voice_matcher.tokenizer
+
+def _process_document(document):
+    return _worker_pipeline.process_document_or_error(document)
+
+def load_documents(path):
+    """
+    Stream documents from a JSONL file (one string or {'content': ...} per
+    line) or a directory of saved intel *.json files
+    """
+    if os.path.isdir(path):
+        for filename in sorted(glob.glob(os.path.join(path, '*.json'))):
+            try:
+                with open(filename, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and data.get('content'):
+                yield {'source': filename, 'content': data['content']}
+        return
+    
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if isinstance(data, str):
+                data = {'content': data}
+            yield {'source': f"{path}:{number}", **data}
+
+def run_batch(args):
+    """content_pipeline.py batch <file.jsonl|intel_dir> [--workers N] [--output F] [--tokenizer auto|nltk|regex]"""
+    source = args[0]
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else os.cpu_count()
+    output = args[args.index('--output') + 1] if '--output' in args else None
+    tokenizer = args[args.index('--tokenizer') + 1] if '--tokenizer' in args else None
+    
+    pipeline = ContentPipeline(tokenizer=tokenizer)
+    out = open(output, 'w') if output else sys.stdout
+    count = 0
+    failed = 0
+    try:
+        for results in pipeline.process_many(load_documents(source), workers=workers):
+            out.write(json.dumps(results) + '\n')
+            count += 1
+            if 'error' in results:
+                failed += 1
+                print(f"❌ {results.get('source', count)}: {results['error']}", file=sys.stderr)
+    finally:
+        if output:
+            out.close()
+    print(f"✅ Processed {count} documents with {workers} workers ({failed} failed)", file=sys.stderr)
+
 def main():
+    if len(sys.argv) > 1:
+        if sys.argv[1] != 'batch' or len(sys.argv) < 3:
+            print("Usage: python content_pipeline.py batch <file.jsonl|intel_dir> [--workers N] [--output results.jsonl] [--tokenizer auto|nltk|regex]")
+            return
+        run_batch(sys.argv[2:])
+        return
+    
     # Example usage
     pipeline = ContentPipeline()
     
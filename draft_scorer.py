@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Draft Scorer
+Incremental voice-DNA and theme scoring for live drafting. The draft is
+kept as paragraphs, each with its own additive counts (sentences, words,
+short sentences, metaphors, theme hits); an edit rescores only the
+paragraphs it touched and adjusts the running totals, so latency tracks
+the size of the edit rather than the size of the draft.
+
+Paragraphs (blank-line separated) always end a sentence. For drafts whose
+paragraphs end in sentence punctuation the scores equal
+VoiceDNAMatcher.analyze_text and ThemeCategorizer.analyze_content on the
+whole text.
+"""
+
+import re
+from collections import Counter
+
+from voice_dna_matcher import VoiceDNAMatcher
+from theme_categorizer import ThemeCategorizer
+
+PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+
+
+class ParagraphStats:
+    """Additive counts for one paragraph"""
+    __slots__ = ('text', 'sentences', 'words', 'short_sentences', 'metaphors', 'split_words', 'themes')
+
+    def __init__(self, text, voice_matcher, theme_categorizer):
+        self.text = text
+        if text.strip():
+            tokens = voice_matcher.tokenize(text)
+            lengths = [len(words) for words in tokens['sentence_words']]
+            self.sentences = len(lengths)
+            self.words = sum(lengths)
+            self.short_sentences = sum(1 for length in lengths if length < 8)
+            self.metaphors = voice_matcher.count_metaphors(text, tokens['sentence_words'])
+            self.split_words = len(text.split())
+            self.themes = Counter(theme_categorizer.scanner.analyze(text)['categories'])
+        else:
+            self.sentences = self.words = self.short_sentences = self.metaphors = self.split_words = 0
+            self.themes = Counter()
+
+
+class DraftScorer:
+    def __init__(self, text='', voice_matcher=None, theme_categorizer=None):
+        self.voice_matcher = voice_matcher or VoiceDNAMatcher()
+        self.theme_categorizer = theme_categorizer or ThemeCategorizer()
+        self.text = ''
+        self.paragraphs = []
+        self.totals = self._empty_totals()
+        self.last_rescored = 0
+        if text:
+            self.update(text)
+
+    def _empty_totals(self):
+        return {'sentences': 0, 'words': 0, 'short_sentences': 0, 'metaphors': 0,
+                'split_words': 0, 'themes': Counter()}
+
+    def _apply(self, stats, sign):
+        for key in ('sentences', 'words', 'short_sentences', 'metaphors', 'split_words'):
+            self.totals[key] += sign * getattr(stats, key)
+        if sign > 0:
+            self.totals['themes'].update(stats.themes)
+        else:
+            self.totals['themes'].subtract(stats.themes)
+
+    def update(self, text):
+        """
+        Replace the draft with its new full text, rescoring only the
+        paragraphs that differ from the previous version
+
+        Returns:
+            int: Number of paragraphs rescored
+        """
+        new_paragraphs = PARAGRAPH_BREAK.split(text)
+        old = self.paragraphs
+
+        # Unchanged paragraphs at the start and end of the draft keep their stats
+        prefix = 0
+        limit = min(len(old), len(new_paragraphs))
+        while prefix < limit and old[prefix].text == new_paragraphs[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix
+               and old[len(old) - 1 - suffix].text == new_paragraphs[len(new_paragraphs) - 1 - suffix]):
+            suffix += 1
+
+        for stats in old[prefix:len(old) - suffix]:
+            self._apply(stats, -1)
+        changed = [ParagraphStats(paragraph, self.voice_matcher, self.theme_categorizer)
+                   for paragraph in new_paragraphs[prefix:len(new_paragraphs) - suffix]]
+        for stats in changed:
+            self._apply(stats, 1)
+
+        self.paragraphs = old[:prefix] + changed + old[len(old) - suffix:]
+        self.text = text
+        self.last_rescored = len(changed)
+        return self.last_rescored
+
+    def apply_edit(self, start, end, replacement):
+        """Apply an editor delta: replace text[start:end] with replacement"""
+        return self.update(self.text[:start] + replacement + self.text[end:])
+
+    def voice(self):
+        """VoiceDNAMatcher.analyze_text-style stats for the current draft"""
+        totals = self.totals
+        if not totals['sentences'] or not totals['words']:
+            return {'avg_words_per_sentence': 0, 'short_sentence_ratio': 0,
+                    'combat_metaphors_per_100': 0, 'match_score': 0}
+        return self.voice_matcher.score_counts(totals['sentences'], totals['words'],
+                                               totals['short_sentences'], totals['metaphors'])
+
+    def theme_scores(self):
+        """ThemeCategorizer.analyze_content-style scores for the current draft"""
+        return self.theme_categorizer.scores_from_counts(self.totals['themes'], self.totals['split_words'])
+
+    def scores(self):
+        """Voice stats, suggestions and theme categorization, like ContentPipeline.process_content"""
+        voice = self.voice()
+        theme_scores = self.theme_scores()
+        primary_themes = self.theme_categorizer.get_primary_themes(self.text, scores=theme_scores)
+        return {
+            'voice_dna': voice,
+            'voice_suggestions': self.voice_matcher.get_voice_suggestions(self.text, stats=voice),
+            'themes': {
+                'theme_scores': {theme.value: score for theme, score in theme_scores.items()},
+                'primary_themes': [theme.value for theme in primary_themes],
+                'suggestions': self.theme_categorizer.suggest_theme_enhancements(self.text, scores=theme_scores)
+            },
+            'paragraphs_rescored': self.last_rescored
+        }
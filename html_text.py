@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+HTML to Text
+Single-pass, incremental HTML text extractor built on html.parser.
+Drops script/style, decodes entities, collapses whitespace and stops
+parsing as soon as the character budget is filled, so large pages are
+handled in linear time and bounded memory.
+"""
+
+from html.parser import HTMLParser
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+# Elements allowed in <head>; any other start tag means the body has begun,
+# since </head> (and <body>) are optional
+HEAD_TAGS = {"head", "title", "base", "link", "meta", "script", "style", "noscript", "template"}
+
+# Tags that separate words; inline tags (<b>, <a>, <span>...) do not
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "td", "th", "tr", "ul"
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class TextBuffer:
+    """Whitespace-collapsed text that stops growing at a character limit"""
+
+    def __init__(self, limit=None):
+        self.parts = []
+        self.length = 0
+        self.limit = limit
+        self.pending_space = False
+
+    @property
+    def full(self):
+        return self.limit is not None and self.length >= self.limit
+
+    def add(self, data):
+        if self.full:
+            return
+        words = data.split()
+        if not words:
+            if data:
+                self.pending_space = True
+            return
+        text = " ".join(words)
+        if self.length and (self.pending_space or data[0].isspace()):
+            text = " " + text
+        self.pending_space = data[-1].isspace()
+        if self.limit is not None:
+            text = text[:self.limit - self.length]
+        self.parts.append(text)
+        self.length += len(text)
+
+    def space(self):
+        self.pending_space = True
+
+    def text(self):
+        return "".join(self.parts).strip()
+
+
+class Capture:
+    """Text of the first element matching one (tag, class substring) candidate"""
+
+    def __init__(self, tag, class_contains, limit):
+        self.tag = tag
+        self.class_contains = class_contains
+        self.buffer = TextBuffer(limit)
+        self.depth = 0
+        self.started = False
+        self.closed = False
+
+    def matches(self, tag, attrs):
+        if self.started or tag != self.tag:
+            return False
+        if self.class_contains is None:
+            return True
+        return self.class_contains in (dict(attrs).get("class") or "")
+
+
+class HTMLTextExtractor(HTMLParser):
+    def __init__(self, containers=None, limit=None, min_length=0):
+        """
+        Args:
+            containers (list): (tag, class_substring) candidates in priority
+                order, e.g. [("div", "available-content"), ("article", None)].
+                Only the first element matching each candidate is captured.
+                None captures the text of the whole document.
+            limit (int): Character budget per captured text
+            min_length (int): Shortest text accepted from a candidate before
+                falling through to the next one
+        """
+        super().__init__(convert_charrefs=True)
+        self.min_length = min_length
+        self.skip_depth = 0
+        self.in_head = False
+        self.heading = None
+        self.title = None
+        self._title_buffer = None
+        self._heading_buffer = None
+
+        if containers is None:
+            self.captures = [Capture(None, None, limit)]
+            self.captures[0].started = True
+        else:
+            self.captures = [Capture(tag, class_contains, limit) for tag, class_contains in containers]
+
+    @property
+    def done(self):
+        """True once more input can't change the result"""
+        for capture in self.captures:
+            if capture.buffer.full:
+                return True
+            if not capture.closed:
+                return False
+            if capture.buffer.length >= self.min_length:
+                return True
+        return True
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and self.title is None:
+            self._title_buffer = TextBuffer(300)
+        if tag == "h1" and self.heading is None:
+            self._heading_buffer = TextBuffer(300)
+
+        if tag == "head":
+            self.in_head = True
+            return
+        if tag not in HEAD_TAGS:
+            self.in_head = False
+
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+
+        for capture in self.captures:
+            if capture.started and not capture.closed and tag == capture.tag:
+                capture.depth += 1
+            elif capture.matches(tag, attrs):
+                capture.started = True
+                capture.depth = 1
+            if tag in BLOCK_TAGS and capture.started and not capture.closed:
+                capture.buffer.space()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS and not self.skip_depth:
+            for capture in self.captures:
+                if capture.started and not capture.closed:
+                    capture.buffer.space()
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_buffer is not None:
+            self.title = self._title_buffer.text()
+            self._title_buffer = None
+        if tag == "h1" and self._heading_buffer is not None:
+            self.heading = self._heading_buffer.text()
+            self._heading_buffer = None
+
+        if tag == "head":
+            self.in_head = False
+            return
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+
+        for capture in self.captures:
+            if not capture.started or capture.closed:
+                continue
+            if tag == capture.tag:
+                capture.depth -= 1
+                if capture.depth == 0:
+                    capture.closed = True
+                    continue
+            if tag in BLOCK_TAGS:
+                capture.buffer.space()
+
+    def handle_data(self, data):
+        if self._title_buffer is not None:
+            self._title_buffer.add(data)
+        if self._heading_buffer is not None:
+            self._heading_buffer.add(data)
+        if self.skip_depth or self.in_head:
+            return
+        for capture in self.captures:
+            if capture.started and not capture.closed:
+                capture.buffer.add(data)
+
+    def text(self):
+        """Text of the highest-priority candidate that met min_length"""
+        for capture in self.captures:
+            if capture.started:
+                text = capture.buffer.text()
+                if len(text) >= self.min_length:
+                    return text
+        return ""
+
+
+def extract_text(html, containers=None, limit=None, min_length=0):
+    """
+    Extract readable text from HTML in one streaming pass
+
+    Args:
+        html (str or iterable of str): The page, or chunks of it
+        containers, limit, min_length: See HTMLTextExtractor
+
+    Returns:
+        dict: 'text', plus the page 'title' and first 'heading' (<h1>) if found
+    """
+    parser = HTMLTextExtractor(containers, limit, min_length)
+    chunks = (html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE)) if isinstance(html, str) else html
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    else:
+        parser.close()
+
+    return {"text": parser.text(), "title": parser.title, "heading": parser.heading}
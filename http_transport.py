@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Transport
+One pooled, keep-alive connection layer for all the scrapers, so batches
+against the same API host reuse connections instead of paying a fresh
+TCP+TLS handshake per request
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+
+# Hosts kept in the pool at once (TinyFish, AgentQL, Substack, nitter mirrors...)
+DEFAULT_HOST_POOLS = 20
+
+_adapter = None
+_adapter_pool_size = 0
+_adapter_lock = threading.Lock()
+
+
+def get_adapter(pool_size=None):
+    """
+    Process-wide connection pool adapter
+
+    Args:
+        pool_size (int): Connections kept per host; also the per-host
+            connection limit, since the pool blocks instead of opening
+            extra connections. Asking for a bigger pool than the current
+            one builds a new shared adapter; sessions already mounted on
+            the old one keep it, along with their live connections.
+    """
+    global _adapter, _adapter_pool_size
+    pool_size = pool_size or DEFAULT_POOL_SIZE
+
+    with _adapter_lock:
+        if _adapter is None or pool_size > _adapter_pool_size:
+            _adapter = HTTPAdapter(
+                pool_connections=DEFAULT_HOST_POOLS,
+                pool_maxsize=pool_size,
+                pool_block=True
+            )
+            _adapter_pool_size = pool_size
+        return _adapter
+
+
+def mount_pool(session, pool_size=None):
+    """Mount the shared adapter (at least pool_size per host) on a session"""
+    adapter = get_adapter(pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def create_session(headers=None, pool_size=None):
+    """
+    New session on the shared connection pool
+
+    Sessions keep their own headers and cookies but share connections, so a
+    scraper can set its User-Agent without leaking it to the others.
+    requests already asks for gzip and keeps connections alive by default.
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    return mount_pool(session, pool_size)
+
+
+def pool_stats():
+    """Connection pool occupancy per host, for debugging"""
+    if _adapter is None:
+        return {}
+    stats = {}
+    for key in list(_adapter.poolmanager.pools.keys()):
+        pool = _adapter.poolmanager.pools.get(key)
+        if pool is not None:
+            stats[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests
+            }
+    return stats
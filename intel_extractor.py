@@ -4,21 +4,107 @@ X & Substack Intelligence Extractor
 Extract competitive intelligence and marketing insights from X posts and Substack articles
 """
 
+import os
 import re
 import sys
+import csv
+import glob
 import json
-import requests
+import hashlib
 from datetime import datetime
+from multiprocessing import Pool
 from urllib.parse import urlparse, parse_qs
 from collections import Counter
 import time
 
+from html_text import extract_text
+from http_transport import create_session
+from intel_index import IntelIndex, index_intel, guess_source
+from nitter_pool import NitterMirrorPool
+from response_cache import ResponseCache
+
+# Marketing lexicons used by IntelExtractor.analyze_content
+EMOTIONAL_WORDS = [
+    'afraid', 'angry', 'anxious', 'broken', 'desperate', 'empty', 'failed',
+    'fear', 'frustrated', 'guilty', 'helpless', 'hopeless', 'hurt', 'inadequate',
+    'insecure', 'lonely', 'lost', 'overwhelmed', 'pain', 'rejected', 'shame',
+    'struggle', 'stuck', 'tired', 'weak', 'worried', 'darkness', 'battle',
+    'warrior', 'fight', 'wounded', 'healing'
+]
+
+POWER_WORDS = [
+    'proven', 'secret', 'breakthrough', 'transform', 'revolutionary',
+    'exclusive', 'limited', 'urgent', 'powerful', 'essential', 'critical',
+    'vital', 'ultimate', 'blueprint', 'protocol', 'system', 'framework'
+]
+
+CTA_WORDS = [
+    'click', 'join', 'buy', 'get', 'start', 'download', 'subscribe',
+    'learn', 'discover', 'unlock', 'access', 'grab', 'claim', 'secure',
+    'reserve', 'register', 'enroll'
+]
+
+SPIRITUAL_WORDS = [
+    'God', 'Jesus', 'Christ', 'faith', 'prayer', 'Bible', 'scripture',
+    'church', 'worship', 'grace', 'salvation', 'redemption', 'covenant',
+    'ministry', 'spiritual', 'holy', 'blessed', 'anointed'
+]
+
+POSITIVE_WORDS = ['amazing', 'incredible', 'powerful', 'transformed', 'breakthrough', 'success']
+NEGATIVE_WORDS = ['failed', 'struggle', 'pain', 'broken', 'lost', 'weak']
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'up', 'about', 'into', 'through', 'during',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'should', 'could', 'may', 'might'
+})
+
+# Category name -> bit; LEXICON_INDEX maps each lowercase token to the OR of its categories
+LEXICON_CATEGORIES = {
+    'emotional': 1 << 0,
+    'power': 1 << 1,
+    'cta': 1 << 2,
+    'spiritual': 1 << 3,
+    'positive': 1 << 4,
+    'negative': 1 << 5,
+}
+
+def build_lexicon_index(lexicons):
+    """Compile {category: [words]} into a token -> category bitmask dict"""
+    index = {}
+    for category, words in lexicons.items():
+        bit = LEXICON_CATEGORIES[category]
+        for word in words:
+            word = word.lower()
+            index[word] = index.get(word, 0) | bit
+    return index
+
+LEXICON_INDEX = build_lexicon_index({
+    'emotional': EMOTIONAL_WORDS,
+    'power': POWER_WORDS,
+    'cta': CTA_WORDS,
+    'spiritual': SPIRITUAL_WORDS,
+    'positive': POSITIVE_WORDS,
+    'negative': NEGATIVE_WORDS,
+})
+
+# Bump whenever analyze_content output changes, so saved analyses get redone
+ANALYZER_VERSION = 2
+
+def content_hash(content):
+    """Stable fingerprint of the analysed text"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
 class IntelExtractor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, use_cache=True, refresh=False, race_mirrors=2):
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        self.cache = ResponseCache() if use_cache else None
+        self.refresh = refresh
+        self.nitter_pool = NitterMirrorPool()
+        self.race_mirrors = race_mirrors
         
     def extract_x_post(self, url):
         """Extract content from X post using various methods"""
@@ -31,37 +117,31 @@ class IntelExtractor:
             
         post_id = post_id_match.group(1)
         
-        # Try nitter instances
-        nitter_instances = [
-            'nitter.privacydev.net',
-            'nitter.poast.org',
-            'nitter.adminforge.de',
-        ]
+        username_match = re.search(r'x\.com/([^/]+)/status', url) or re.search(r'twitter\.com/([^/]+)/status', url)
+        if not username_match:
+            return {'error': 'Could not extract username'}
+            
+        username = username_match.group(1)
         
-        for instance in nitter_instances:
-            try:
-                username_match = re.search(r'x\.com/([^/]+)/status', url) or re.search(r'twitter\.com/([^/]+)/status', url)
-                if not username_match:
-                    continue
-                    
-                username = username_match.group(1)
-                nitter_url = f'https://{instance}/{username}/status/{post_id}'
-                
-                response = self.session.get(nitter_url, timeout=10)
-                if response.status_code == 200:
-                    content = self.parse_nitter_content(response.text)
-                    if content:
-                        return {
-                            'platform': 'X/Twitter',
-                            'url': url,
-                            'post_id': post_id,
-                            'username': username,
-                            'content': content,
-                            'extracted_at': datetime.now().isoformat()
-                        }
-            except Exception as e:
-                print(f"Failed with {instance}: {e}")
-                continue
+        def fetch_from(instance):
+            nitter_url = f'https://{instance}/{username}/status/{post_id}'
+            response = self.session.get(nitter_url, timeout=10)
+            if response.status_code == 200:
+                return self.parse_nitter_content(response.text)
+            return None
+            
+        # Healthiest nitter instances first, racing the top ones
+        content, instance = self.nitter_pool.fetch(fetch_from, race=self.race_mirrors)
+        if content:
+            return {
+                'platform': 'X/Twitter',
+                'url': url,
+                'post_id': post_id,
+                'username': username,
+                'content': content,
+                'mirror': instance,
+                'extracted_at': datetime.now().isoformat()
+            }
                 
         return {'error': 'Failed to extract from all sources'}
         
@@ -82,11 +162,9 @@ class IntelExtractor:
         print(f"📝 Extracting Substack article: {url}")
         
         try:
-            response = self.session.get(url, timeout=15)
-            if response.status_code != 200:
-                return {'error': f'HTTP {response.status_code}'}
-                
-            html = response.text
+            html = self.fetch_cached(url, timeout=15)
+            if isinstance(html, dict):
+                return html
             
             # Extract metadata
             title_match = re.search(r'<title>([^<]+)</title>', html)
@@ -122,30 +200,49 @@ class IntelExtractor:
         except Exception as e:
             return {'error': str(e)}
             
-    def extract_article_content(self, html):
-        """Extract article content from HTML"""
-        # Try to find the main content area
-        content_patterns = [
-            r'<div[^>]*class="[^"]*available-content[^"]*"[^>]*>(.*?)</div>',
-            r'<div[^>]*class="[^"]*body[^"]*"[^>]*>(.*?)</div>',
-            r'<article[^>]*>(.*?)</article>'
-        ]
+    def fetch_cached(self, url, timeout=15):
+        """
+        GET a page through the response cache
         
-        for pattern in content_patterns:
-            match = re.search(pattern, html, re.DOTALL)
-            if match:
-                content = match.group(1)
-                # Clean HTML
-                content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL)
-                content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL)
-                content = re.sub(r'<[^>]+>', ' ', content)
-                content = re.sub(r'&[^;]+;', ' ', content)
-                content = re.sub(r'\s+', ' ', content).strip()
-                
-                if len(content) > 100:  # Ensure we got actual content
-                    return content[:5000]  # Limit to first 5000 chars
+        Fresh entries are served without a request; stale ones are
+        revalidated with ETag/Last-Modified when the origin sent them.
+        
+        Returns:
+            str: Page HTML, or an {'error': ...} dict
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached['fresh'] and not self.refresh:
+            print(f"📦 Cache hit: {url}")
+            return cached['body']
+            
+        headers = self.cache.conditional_headers(cached) if cached and not self.refresh else {}
+        response = self.session.get(url, headers=headers, timeout=timeout)
         
-        return "Could not extract main content"
+        if response.status_code == 304 and cached:
+            print(f"📦 Not modified: {url}")
+            self.cache.revalidated(url)
+            return cached['body']
+        if response.status_code != 200:
+            return {'error': f'HTTP {response.status_code}'}
+            
+        if self.cache:
+            self.cache.put(
+                url, response.text,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        return response.text
+        
+    def extract_article_content(self, html):
+        """Extract article content from HTML"""
+        # Main content area candidates, in priority order
+        result = extract_text(
+            html,
+            containers=[('div', 'available-content'), ('div', 'body'), ('article', None)],
+            limit=5000,  # Limit to first 5000 chars
+            min_length=101  # Ensure we got actual content
+        )
+        return result['text'] or "Could not extract main content"
         
     def analyze_content(self, data):
         """Analyze content for marketing intelligence"""
@@ -153,70 +250,45 @@ class IntelExtractor:
             return data
             
         content = data.get('content', '')
-        
-        # Emotional triggers
-        emotional_words = [
-            'afraid', 'angry', 'anxious', 'broken', 'desperate', 'empty', 'failed',
-            'fear', 'frustrated', 'guilty', 'helpless', 'hopeless', 'hurt', 'inadequate',
-            'insecure', 'lonely', 'lost', 'overwhelmed', 'pain', 'rejected', 'shame',
-            'struggle', 'stuck', 'tired', 'weak', 'worried', 'darkness', 'battle',
-            'warrior', 'fight', 'wounded', 'healing'
-        ]
-        
-        # Power words
-        power_words = [
-            'proven', 'secret', 'breakthrough', 'transform', 'revolutionary', 
-            'exclusive', 'limited', 'urgent', 'powerful', 'essential', 'critical',
-            'vital', 'ultimate', 'blueprint', 'protocol', 'system', 'framework'
-        ]
-        
-        # Call to action words
-        cta_words = [
-            'click', 'join', 'buy', 'get', 'start', 'download', 'subscribe',
-            'learn', 'discover', 'unlock', 'access', 'grab', 'claim', 'secure',
-            'reserve', 'register', 'enroll'
-        ]
-        
-        # Biblical/spiritual terms
-        spiritual_words = [
-            'God', 'Jesus', 'Christ', 'faith', 'prayer', 'Bible', 'scripture',
-            'church', 'worship', 'grace', 'salvation', 'redemption', 'covenant',
-            'ministry', 'spiritual', 'holy', 'blessed', 'anointed'
-        ]
-        
         content_lower = content.lower()
         words = re.findall(r'\b\w+\b', content_lower)
         
-        # Count occurrences
-        emotional_count = sum(1 for word in words if word in emotional_words)
-        power_count = sum(1 for word in words if word in power_words)
-        cta_count = sum(1 for word in words if word in cta_words)
-        spiritual_count = sum(1 for word in words if word in spiritual_words)
+        # Single pass: per-token counts, then one index lookup per distinct token
+        token_counts = Counter(words)
+        category_counts = dict.fromkeys(LEXICON_CATEGORIES, 0)
+        category_used = {category: [] for category in LEXICON_CATEGORIES}
+        filtered_counts = Counter()
+        total_length = 0
         
-        # Find most common words (excluding common stop words)
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                      'of', 'with', 'by', 'from', 'up', 'about', 'into', 'through', 'during',
-                      'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had',
-                      'do', 'does', 'did', 'will', 'would', 'should', 'could', 'may', 'might'}
+        for word, count in token_counts.items():
+            total_length += len(word) * count
+            if word not in STOP_WORDS and len(word) > 3:
+                filtered_counts[word] = count
+            mask = LEXICON_INDEX.get(word)
+            if mask:
+                for category, bit in LEXICON_CATEGORIES.items():
+                    if mask & bit:
+                        category_counts[category] += count
+                        category_used[category].append(word)
         
-        filtered_words = [w for w in words if w not in stop_words and len(w) > 3]
-        word_freq = Counter(filtered_words).most_common(20)
+        emotional_count = category_counts['emotional']
+        power_count = category_counts['power']
+        cta_count = category_counts['cta']
+        spiritual_count = category_counts['spiritual']
+        positive_count = category_counts['positive']
+        negative_count = category_counts['negative']
+        
+        # Find most common words (excluding common stop words)
+        word_freq = filtered_counts.most_common(20)
         
         # Extract hooks (first compelling statement)
         sentences = re.split(r'[.!?]+', content)
         hooks = [s.strip() for s in sentences[:3] if len(s.strip()) > 20]
         
-        # Sentiment indicators
-        positive_words = ['amazing', 'incredible', 'powerful', 'transformed', 'breakthrough', 'success']
-        negative_words = ['failed', 'struggle', 'pain', 'broken', 'lost', 'weak']
-        
-        positive_count = sum(1 for word in words if word in positive_words)
-        negative_count = sum(1 for word in words if word in negative_words)
-        
         analysis = {
             'metrics': {
                 'word_count': len(words),
-                'avg_word_length': sum(len(w) for w in words) / len(words) if words else 0,
+                'avg_word_length': total_length / len(words) if words else 0,
                 'sentence_count': len(sentences),
                 'emotional_density': emotional_count / len(words) * 100 if words else 0,
                 'power_word_density': power_count / len(words) * 100 if words else 0,
@@ -226,10 +298,12 @@ class IntelExtractor:
             },
             'hooks': hooks,
             'top_words': word_freq,
-            'emotional_triggers': [w for w in set(words) if w in emotional_words],
-            'power_words_used': [w for w in set(words) if w in power_words],
-            'ctas_found': [w for w in set(words) if w in cta_words],
-            'marketing_formula': self.detect_formula(content)
+            'emotional_triggers': category_used['emotional'],
+            'power_words_used': category_used['power'],
+            'ctas_found': category_used['cta'],
+            'marketing_formula': self.detect_formula(content),
+            'analyzer_version': ANALYZER_VERSION,
+            'content_hash': content_hash(content)
         }
         
         return {**data, 'analysis': analysis}
@@ -269,22 +343,142 @@ class IntelExtractor:
             
         with open(filename, 'w') as f:
             json.dump(data, f, indent=2)
+        index_intel(data, filename, source='intel_extractor')
             
         print(f"💾 Saved to: {filename}")
         return filename
 
+def analysis_key(data):
+    """Key to store our analysis under without clobbering another scraper's"""
+    existing = data.get('analysis')
+    if existing is None or 'marketing_formula' in existing:
+        return 'analysis'
+    return 'intel_analysis'
+
+def analysis_is_current(data, key):
+    """Saved analysis matches this analyzer version and the file's content"""
+    analysis = data.get(key) or {}
+    return (analysis.get('analyzer_version') == ANALYZER_VERSION and
+            analysis.get('content_hash') == content_hash(data.get('content', '')))
+
+_worker_extractor = None
+
+def _init_analyze_worker():
+    """Pool initializer: one extractor per worker process"""
+    global _worker_extractor
+    _worker_extractor = IntelExtractor(use_cache=False)
+
+# CSV report columns, known up front so rows can be written as they arrive
+REPORT_FIELDS = ['file', 'status', 'platform', 'url', 'word_count', 'avg_word_length', 'sentence_count',
+                 'emotional_density', 'power_word_density', 'cta_density', 'spiritual_density',
+                 'sentiment_score', 'formulas', 'error']
+
+def analyze_file(path):
+    """
+    Re-analyze one saved intel file in place if stale
+
+    Returns:
+        tuple: (report row, the file's data minus content if it needs re-indexing, else None)
+    """
+    row = {'file': path}
+    index_data = None
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not data.get('content'):
+            return {**row, 'status': 'skipped'}, None
+            
+        key = analysis_key(data)
+        if analysis_is_current(data, key):
+            row['status'] = 'current'
+        else:
+            data[key] = _worker_extractor.analyze_content({'content': data['content']})['analysis']
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+            # Indexed by the parent: SQLite handles one writer, not a pool of them
+            index_data = {k: v for k, v in data.items() if k != 'content'}
+            row['status'] = 'analyzed'
+            
+        analysis = data[key]
+        row.update({
+            'platform': data.get('platform'),
+            'url': data.get('url'),
+            **analysis.get('metrics', {}),
+            'formulas': '; '.join(analysis.get('marketing_formula', []))
+        })
+        return row, index_data
+    except Exception as e:
+        return {**row, 'status': 'error', 'error': str(e)}, None
+
+def analyze_directory(directory, workers=None, report=None):
+    """Stream every *.json in a directory through a process pool"""
+    paths = sorted(glob.glob(os.path.join(directory, '*.json')))
+    workers = workers or os.cpu_count()
+    if report is None:
+        os.makedirs(os.path.join(directory, 'batches'), exist_ok=True)
+        report = os.path.join(directory, 'batches', f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        
+    print(f"📂 Analyzing {len(paths)} files with {workers} workers...")
+    started = time.perf_counter()
+    statuses = Counter()
+    
+    index = IntelIndex()
+    with Pool(workers, initializer=_init_analyze_worker) as pool, open(report, 'w', newline='') as f:
+        if report.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            write_row = writer.writerow
+        else:
+            write_row = lambda row: f.write(json.dumps(row) + '\n')
+            
+        for row, index_data in pool.imap(analyze_file, paths, chunksize=16):
+            write_row(row)
+            statuses[row['status']] += 1
+            if index_data is not None:
+                try:
+                    index.add(index_data, row['file'], guess_source(row['file']), commit=False)
+                except Exception as e:
+                    print(f"⚠️  Could not index {row['file']}: {e}")
+    index.commit()
+    index.close()
+                    
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Done in {elapsed:.1f}s")
+    for status in ('analyzed', 'current', 'skipped', 'error'):
+        print(f"  {status}: {statuses[status]}")
+    print(f"📄 Report: {report}")
+    return report
+
 def main():
     if len(sys.argv) < 2:
         print("X & Substack Intelligence Extractor")
         print("\nUsage:")
         print("  python intel_extractor.py <URL>")
         print("  python intel_extractor.py analyze <file.json>")
+        print("  python intel_extractor.py analyze --dir intel/ [--workers N] [--report out.jsonl|out.csv]")
+        print("\nFlags:")
+        print("  --no-cache   Don't read or write the response cache")
+        print("  --refresh    Re-fetch even if a fresh cached copy exists")
         print("\nExamples:")
         print("  python intel_extractor.py https://x.com/user/status/123")
         print("  python intel_extractor.py https://substack.com/@user/p/title")
         return
         
-    extractor = IntelExtractor()
+    use_cache = '--no-cache' not in sys.argv
+    refresh = '--refresh' in sys.argv
+    sys.argv = [arg for arg in sys.argv if arg not in ('--no-cache', '--refresh')]
+    
+    if sys.argv[1] == 'analyze' and '--dir' in sys.argv:
+        # Re-score a whole archive of saved intel files
+        args = sys.argv[2:]
+        workers = int(args[args.index('--workers') + 1]) if '--workers' in args else None
+        report = args[args.index('--report') + 1] if '--report' in args else None
+        analyze_directory(args[args.index('--dir') + 1], workers, report)
+        return
+        
+    extractor = IntelExtractor(use_cache=use_cache, refresh=refresh)
     
     if sys.argv[1] == 'analyze' and len(sys.argv) > 2:
         # Analyze existing file
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Intel Corpus Index
+SQLite index over saved intel files. Every scraper's save_intel (and every
+re-analysis by intel_extractor.py analyze --dir) writes the file's row: url,
+platform, timestamps, word count, per-category densities and trigger lists,
+so the archive can be filtered and aggregated without opening the raw JSON.
+
+Usage:
+  python intel_index.py query [--category NAME --min-density N] [--trigger NAME]
+                              [--platform NAME] [--since 30d|YYYY-MM-DD] [--until DATE] [--limit N]
+  python intel_index.py stats [--since 30d|YYYY-MM-DD] [--platform NAME]
+  python intel_index.py rebuild [intel/]
+
+Example:
+  python intel_index.py query --category father_wound --min-density 3 --since 30d
+"""
+
+import os
+import sys
+import glob
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+DEFAULT_INDEX_PATH = os.path.join("intel", "index.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    source TEXT,
+    url TEXT,
+    platform TEXT,
+    title TEXT,
+    extracted_at TEXT,
+    indexed_at TEXT NOT NULL,
+    word_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS densities (
+    doc_id INTEGER NOT NULL REFERENCES documents(id),
+    category TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS triggers (
+    doc_id INTEGER NOT NULL REFERENCES documents(id),
+    name TEXT NOT NULL,
+    count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_documents_extracted ON documents (extracted_at);
+CREATE INDEX IF NOT EXISTS idx_densities_category ON densities (category, value);
+CREATE INDEX IF NOT EXISTS idx_triggers_name ON triggers (name);
+CREATE INDEX IF NOT EXISTS idx_densities_doc ON densities (doc_id);
+CREATE INDEX IF NOT EXISTS idx_triggers_doc ON triggers (doc_id);
+"""
+
+# Metric names from the different scrapers that mean the same thing
+CATEGORY_ALIASES = {
+    "power_word": "power"
+}
+
+
+def normalize_analysis(data):
+    """
+    Flatten the analysis formats of all three scrapers
+
+    Returns:
+        tuple: ({category: density}, [(trigger name, count or None)], word_count)
+    """
+    densities = {}
+    triggers = []
+    word_count = data.get("word_count")
+
+    for key in ("analysis", "intel_analysis"):
+        analysis = data.get(key)
+        if not isinstance(analysis, dict):
+            continue
+
+        # IntelExtractor / TinyFish: {'metrics': {'<name>_density': x}}; AgentQL: top level
+        metrics = {**analysis, **analysis.get("metrics", {})}
+        for name, value in metrics.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if not name.endswith("_density"):
+                continue
+            category = name[:-len("_density")]
+            densities.setdefault(CATEGORY_ALIASES.get(category, category), value)
+
+        if word_count is None:
+            word_count = metrics.get("word_count")
+
+        # AgentQL: typed triggers with their own densities
+        for trigger in analysis.get("triggers", []) or []:
+            if isinstance(trigger, dict) and trigger.get("type"):
+                densities.setdefault(trigger["type"], trigger.get("density", 0))
+                triggers.append((trigger["type"], trigger.get("count")))
+
+        # TinyFish / IntelExtractor: plain trigger word lists
+        for list_key in ("jake_triggers", "emotional_triggers"):
+            for word in analysis.get(list_key, []) or []:
+                triggers.append((word, None))
+
+    return densities, triggers, word_count
+
+
+def guess_source(path):
+    """Scraper that saved an intel file, from its file name"""
+    name = os.path.basename(path)
+    return "intel_extractor" if "_intel_" in name else name.split("_")[0]
+
+
+class IntelIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def add(self, data, path, source=None, commit=True):
+        """
+        Index one saved intel file, replacing its row if the path was indexed before; returns True if new
+
+        Pass commit=False to batch many adds into one transaction, then call commit()
+        """
+        densities, triggers, word_count = normalize_analysis(data)
+        path = os.path.normpath(path)
+        existing = self.db.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+        cursor = self.db.execute(
+            "INSERT INTO documents (path, source, url, platform, title, extracted_at, indexed_at, word_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET source = COALESCE(excluded.source, source), url = excluded.url, "
+            "platform = excluded.platform, title = excluded.title, extracted_at = excluded.extracted_at, "
+            "indexed_at = excluded.indexed_at, word_count = excluded.word_count",
+            (path, source, data.get("url"), data.get("platform"), data.get("title"),
+             data.get("extracted_at"), datetime.now().isoformat(), word_count)
+        )
+
+        if existing:
+            doc_id = existing[0]
+            self.db.execute("DELETE FROM densities WHERE doc_id = ?", (doc_id,))
+            self.db.execute("DELETE FROM triggers WHERE doc_id = ?", (doc_id,))
+        else:
+            doc_id = cursor.lastrowid
+        self.db.executemany("INSERT INTO densities VALUES (?, ?, ?)",
+                            [(doc_id, category, value) for category, value in densities.items()])
+        self.db.executemany("INSERT INTO triggers VALUES (?, ?, ?)",
+                            [(doc_id, name, count) for name, count in triggers])
+        if commit:
+            self.db.commit()
+        return existing is None
+
+    def commit(self):
+        self.db.commit()
+
+    def rebuild(self, directory="intel"):
+        """Backfill the index from intel files, re-indexing ones already in it; returns the count of new files"""
+        added = 0
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and self.add(data, path, guess_source(path)):
+                added += 1
+        return added
+
+    def _filters(self, platform=None, since=None, until=None):
+        clauses, params = [], []
+        if platform:
+            clauses.append("d.platform LIKE ?")
+            params.append(f"%{platform}%")
+        if since:
+            clauses.append("d.extracted_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("d.extracted_at < ?")
+            params.append(until)
+        return clauses, params
+
+    def query(self, category=None, min_density=None, trigger=None, platform=None,
+              since=None, until=None, limit=50):
+        """Documents matching the filters, highest density first"""
+        clauses, params = self._filters(platform, since, until)
+        density_select = "NULL"
+        joins = ""
+
+        if category:
+            joins += " JOIN densities c ON c.doc_id = d.id AND c.category = ?"
+            params.insert(0, category)
+            density_select = "c.value"
+            if min_density is not None:
+                clauses.append("c.value >= ?")
+                params.append(min_density)
+        if trigger:
+            clauses.append("EXISTS (SELECT 1 FROM triggers t WHERE t.doc_id = d.id AND t.name = ?)")
+            params.append(trigger)
+
+        sql = (f"SELECT d.path, d.url, d.platform, d.extracted_at, d.word_count, {density_select} "
+               f"FROM documents d{joins}")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {density_select if category else 'd.extracted_at'} DESC LIMIT ?"
+        params.append(limit)
+        return self.db.execute(sql, params).fetchall()
+
+    def stats(self, platform=None, since=None, until=None):
+        """Document counts, average densities and top triggers"""
+        clauses, params = self._filters(platform, since, until)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+        platforms = self.db.execute(
+            f"SELECT d.platform, COUNT(*), SUM(d.word_count) FROM documents d{where} GROUP BY d.platform ORDER BY 2 DESC",
+            params
+        ).fetchall()
+        densities = self.db.execute(
+            f"SELECT c.category, COUNT(*), AVG(c.value), MAX(c.value) FROM documents d "
+            f"JOIN densities c ON c.doc_id = d.id{where} GROUP BY c.category ORDER BY 3 DESC",
+            params
+        ).fetchall()
+        triggers = self.db.execute(
+            f"SELECT t.name, COUNT(DISTINCT d.id), SUM(t.count) FROM documents d "
+            f"JOIN triggers t ON t.doc_id = d.id{where} GROUP BY t.name ORDER BY 2 DESC LIMIT 15",
+            params
+        ).fetchall()
+        return {"platforms": platforms, "densities": densities, "triggers": triggers}
+
+    def close(self):
+        self.db.close()
+
+
+def index_intel(data, path, source=None):
+    """save_intel hook: index a freshly saved file, never failing the save"""
+    try:
+        index = IntelIndex()
+        index.add(data, path, source)
+        index.close()
+    except Exception as e:
+        print(f"⚠️  Could not update intel index: {e}")
+
+
+def parse_date(value):
+    """'30d' (days ago) or an ISO date"""
+    if value is None:
+        return None
+    if value.endswith("d") and value[:-1].isdigit():
+        return (datetime.now() - timedelta(days=int(value[:-1]))).isoformat()
+    return datetime.fromisoformat(value).isoformat()
+
+
+def option(args, name, default=None, cast=str):
+    if name in args:
+        return cast(args[args.index(name) + 1])
+    return default
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("query", "stats", "rebuild"):
+        print(__doc__.strip())
+        return
+
+    args = sys.argv[2:]
+    index = IntelIndex()
+
+    if sys.argv[1] == "rebuild":
+        directory = args[0] if args else "intel"
+        print(f"📇 Indexed {index.rebuild(directory)} new files from {directory}/")
+        return
+
+    filters = {
+        "platform": option(args, "--platform"),
+        "since": parse_date(option(args, "--since")),
+        "until": parse_date(option(args, "--until"))
+    }
+
+    if sys.argv[1] == "query":
+        category = option(args, "--category")
+        rows = index.query(
+            category=category,
+            min_density=option(args, "--min-density", cast=float),
+            trigger=option(args, "--trigger"),
+            limit=option(args, "--limit", 50, int),
+            **filters
+        )
+        print(f"🔎 {len(rows)} matching documents")
+        for path, url, platform, extracted_at, word_count, density in rows:
+            density_text = f"{density:5.1f}%  " if density is not None else ""
+            print(f"  {density_text}{(extracted_at or '')[:10]}  {platform or '?':<10} {word_count or 0:>6}w  {url or path}")
+    else:
+        stats = index.stats(**filters)
+        print("📊 Intel corpus")
+        for platform, count, words in stats["platforms"]:
+            print(f"  {platform or 'unknown':<12} {count:>6} docs  {words or 0:>9} words")
+        print("\n📈 Densities (avg / max %)")
+        for category, count, average, maximum in stats["densities"]:
+            print(f"  {category:<16} {average:6.2f} / {maximum:6.2f}  ({count} docs)")
+        print("\n💔 Top triggers (docs)")
+        for name, docs, total in stats["triggers"]:
+            print(f"  {name:<16} {docs:>6}" + (f"  ({total} hits)" if total else ""))
+
+
+if __name__ == "__main__":
+    main()
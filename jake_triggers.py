@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Jake Trigger Lexicon
+Trigger families and emotional words used to score content for Jake,
+compiled once into a shared PhraseScanner
+"""
+
+from phrase_scanner import PhraseScanner
+
+JAKE_TRIGGERS = {
+    "father_wound": ["father", "dad", "absent", "disappointed", "failed him", "never there", "old man"],
+    "marriage_death": ["marriage", "divorce", "wife", "alone", "empty bed", "she left", "lonely"],
+    "porn_struggle": ["porn", "lust", "addiction", "struggle", "temptation", "relapse", "shame"],
+    "church_hurt": ["church", "pastor", "ministry", "fake", "hypocrite", "burned out", "lost faith"],
+    "masculinity": ["man", "masculine", "weak", "strong", "warrior", "leader", "passive"],
+    "grace": ["grace", "forgiven", "mercy", "second chance", "redemption", "worthy"]
+}
+
+EMOTIONAL_WORDS = ["pain", "hurt", "broken", "lost", "angry", "alone", "empty",
+                   "shame", "guilt", "fear", "hate", "love", "hope", "peace"]
+
+TRIGGER_SCANNER = PhraseScanner({**JAKE_TRIGGERS, "emotional": EMOTIONAL_WORDS})
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+KJV Search Index
+Prebuilt SQLite inverted index over the KJV verse store: stemmed term ->
+packed (verse id, term frequency) postings for BM25 ranking, top verses
+per CoreTheme precomputed at build time, and a cross-reference adjacency
+table. Queries read a few posting lists, never the Bible text.
+
+Cross-references are loaded from a tab-separated file in the OpenBible
+format (From Verse, To Verse, Votes; e.g. "Gen.1.1  John.1.1-John.1.3  62").
+
+Usage:
+  python kjv_index.py build [--crossrefs cross_references.txt]
+  python kjv_index.py search "covenant blood" [--k 10]
+  python kjv_index.py theme COVENANT [--k 10]
+  python kjv_index.py xref "John 3:16" [--k 20]
+"""
+
+import os
+import re
+import sys
+import math
+import heapq
+import sqlite3
+from array import array
+from collections import Counter
+
+from kjv_store import DEFAULT_STORE_PATH, KJVStore
+
+DEFAULT_INDEX_PATH = os.environ.get("KJV_INDEX", os.path.join("data", "kjv-index.db"))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Verses kept per theme in the precomputed theme table
+THEME_DEPTH = 200
+
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from had has have he her him his i in is it its me my not of on or our
+shall she so that the their them they this thou thee thy thine to unto upon was we were which who will
+with ye you your all also did do hath hast there then when what said saith
+""".split())
+
+# Longest first; KJV verb endings (-eth, -est) before modern ones
+SUFFIXES = [("ies", "y"), ("eth", ""), ("est", ""), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL);
+CREATE TABLE IF NOT EXISTS verses (id INTEGER PRIMARY KEY, book TEXT, chapter INTEGER, verse INTEGER, length INTEGER);
+CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER, ids BLOB, tfs BLOB);
+CREATE TABLE IF NOT EXISTS theme_verses (theme TEXT, rank INTEGER, verse_id INTEGER, score REAL);
+CREATE TABLE IF NOT EXISTS crossrefs (from_id INTEGER, to_start INTEGER, to_end INTEGER, votes INTEGER);
+CREATE INDEX IF NOT EXISTS idx_theme_verses ON theme_verses (theme, rank);
+CREATE INDEX IF NOT EXISTS idx_crossrefs_from ON crossrefs (from_id, votes);
+"""
+
+
+def stem(word):
+    """Light suffix stripping so 'sealed', 'sealeth' and 'seals' share a term"""
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def terms_of(text):
+    """Index terms of a verse or query"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def parse_osis(reference, store):
+    """'Gen.1.1' or 'Gen.1.1-Gen.1.3' -> (first verse id, last verse id), or None"""
+    from kjv_reference_system import BOOK_LOOKUP
+    ids = []
+    for part in reference.split("-")[:2]:
+        pieces = part.strip().split(".")
+        if len(pieces) != 3:
+            return None
+        book = BOOK_LOOKUP.get(pieces[0].lower())
+        if book is None or not pieces[1].isdigit() or not pieces[2].isdigit():
+            return None
+        verse_id = store.verse_id(book, int(pieces[1]), int(pieces[2]))
+        if verse_id is None:
+            return None
+        ids.append(verse_id)
+    return (ids[0], ids[-1]) if ids else None
+
+
+class KJVIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        self.verse_count = int(meta.get("verses", 0))
+        self.average_length = meta.get("average_length", 0.0)
+        self._lengths = None
+
+    def build(self, store, crossrefs_path=None):
+        """(Re)build every table from a KJVStore; returns row counts"""
+        postings = {}
+        lengths = []
+        verse_rows = []
+        for verse_id, book, chapter, verse, text in store.iter_verses():
+            terms = terms_of(text)
+            verse_rows.append((verse_id, book, chapter, verse, len(terms)))
+            lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                ids, tfs = postings.setdefault(term, (array("I"), array("H")))
+                ids.append(verse_id)
+                tfs.append(min(count, 65535))
+
+        with self.db:
+            for table in ("meta", "verses", "terms", "theme_verses", "crossrefs"):
+                self.db.execute(f"DELETE FROM {table}")
+            self.db.executemany("INSERT INTO verses VALUES (?, ?, ?, ?, ?)", verse_rows)
+            self.db.executemany(
+                "INSERT INTO terms VALUES (?, ?, ?, ?)",
+                ((term, len(ids), ids.tobytes(), tfs.tobytes()) for term, (ids, tfs) in postings.items())
+            )
+            self.verse_count = len(lengths)
+            self.average_length = sum(lengths) / len(lengths) if lengths else 0.0
+            self.db.executemany("INSERT INTO meta VALUES (?, ?)",
+                                [("verses", self.verse_count), ("average_length", self.average_length)])
+        self._lengths = None
+
+        theme_rows = self._build_themes()
+        crossref_rows = self._load_crossrefs(crossrefs_path, store) if crossrefs_path else 0
+        return {"verses": self.verse_count, "terms": len(postings), "themes": theme_rows, "crossrefs": crossref_rows}
+
+    def _build_themes(self):
+        from theme_categorizer import ThemeCategorizer
+        rows = []
+        for theme, keywords in ThemeCategorizer().theme_keywords.items():
+            for rank, (verse_id, score) in enumerate(self.search_ids(" ".join(keywords), THEME_DEPTH)):
+                rows.append((theme.name, rank, verse_id, score))
+        with self.db:
+            self.db.executemany("INSERT INTO theme_verses VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def _load_crossrefs(self, path, store):
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 2 or fields[0].startswith("From"):
+                    continue
+                source = parse_osis(fields[0], store)
+                target = parse_osis(fields[1], store)
+                if source is None or target is None:
+                    continue
+                votes = int(fields[2]) if len(fields) > 2 and fields[2].lstrip("-").isdigit() else 0
+                rows.append((source[0], target[0], target[1], votes))
+        with self.db:
+            self.db.executemany("INSERT INTO crossrefs VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    @property
+    def lengths(self):
+        """Verse lengths in terms, indexed by verse id (loaded once, ~120 KB)"""
+        if self._lengths is None:
+            self._lengths = array("H", [0]) * self.verse_count
+            for verse_id, length in self.db.execute("SELECT id, length FROM verses"):
+                self._lengths[verse_id] = length
+        return self._lengths
+
+    def search_ids(self, query, k=10):
+        """BM25 top-k as [(verse_id, score)]"""
+        if not self.verse_count:
+            return []
+        lengths = self.lengths
+        norm = K1 * (1 - B)
+        slope = K1 * B / (self.average_length or 1)
+        scores = {}
+        for term in set(terms_of(query)):
+            row = self.db.execute("SELECT df, ids, tfs FROM terms WHERE term = ?", (term,)).fetchone()
+            if row is None:
+                continue
+            df, id_blob, tf_blob = row
+            idf = math.log(1 + (self.verse_count - df + 0.5) / (df + 0.5))
+            ids = array("I")
+            ids.frombytes(id_blob)
+            tfs = array("H")
+            tfs.frombytes(tf_blob)
+            for verse_id, tf in zip(ids, tfs):
+                scores[verse_id] = scores.get(verse_id, 0.0) + idf * tf * (K1 + 1) / (
+                    tf + norm + slope * lengths[verse_id])
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def locate(self, verse_id):
+        """(book, chapter, verse) of a verse id"""
+        return self.db.execute("SELECT book, chapter, verse FROM verses WHERE id = ?", (verse_id,)).fetchone()
+
+    def _labelled(self, rows):
+        results = []
+        for verse_id, score in rows:
+            book, chapter, verse = self.locate(verse_id)
+            results.append({"reference": f"{book} {chapter}:{verse}", "verse_id": verse_id, "score": score})
+        return results
+
+    def search(self, query, k=10):
+        """Ranked verses for a free-text query"""
+        return self._labelled(self.search_ids(query, k))
+
+    def theme(self, theme_name, k=10):
+        """Precomputed top verses for a CoreTheme (by enum name, e.g. 'COVENANT')"""
+        rows = self.db.execute(
+            "SELECT verse_id, score FROM theme_verses WHERE theme = ? ORDER BY rank LIMIT ?", (theme_name, k)
+        ).fetchall()
+        return self._labelled(rows)
+
+    def cross_references(self, verse_id, k=20):
+        """Cross-references of a verse, most voted first"""
+        rows = self.db.execute(
+            "SELECT to_start, to_end, votes FROM crossrefs WHERE from_id = ? ORDER BY votes DESC LIMIT ?",
+            (verse_id, k)
+        ).fetchall()
+        results = []
+        for start, end, votes in rows:
+            book, chapter, verse = self.locate(start)
+            label = f"{book} {chapter}:{verse}"
+            if end != start:
+                end_book, end_chapter, end_verse = self.locate(end)
+                label += f"-{end_verse}" if end_chapter == chapter else f"-{end_chapter}:{end_verse}"
+            results.append({"reference": label, "votes": votes})
+        return results
+
+    def close(self):
+        self.db.close()
+
+
+def option(args, name, default=None, cast=str):
+    if name in args:
+        return cast(args[args.index(name) + 1])
+    return default
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("build", "search", "theme", "xref"):
+        print(__doc__.strip())
+        return
+
+    args = sys.argv[2:]
+    index = KJVIndex()
+    k = option(args, "--k", 10, int)
+    positional = " ".join(a for i, a in enumerate(args) if not a.startswith("--") and (i == 0 or not args[i - 1].startswith("--")))
+
+    if sys.argv[1] == "build":
+        info = index.build(KJVStore(option(args, "--store", DEFAULT_STORE_PATH)), option(args, "--crossrefs"))
+        print(f"🗂️  Indexed {info['verses']} verses, {info['terms']} terms, "
+              f"{info['themes']} theme rows, {info['crossrefs']} cross-references -> {index.path}")
+    elif sys.argv[1] == "search":
+        for hit in index.search(positional, k):
+            print(f"  {hit['score']:6.2f}  {hit['reference']}")
+    elif sys.argv[1] == "theme":
+        for hit in index.theme(positional.upper(), k):
+            print(f"  {hit['score']:6.2f}  {hit['reference']}")
+    else:
+        from kjv_reference_system import KJVReferenceSystem
+        for ref in KJVReferenceSystem().get_cross_references(positional, k):
+            print(f"  {ref['votes']:>4}  {ref['reference']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,408 @@
 import json
+import os
 import re
+from collections import Counter, OrderedDict
 
-class KJVReferenceSystem:
-    def __init__(self):
-        # Book name standardization
-        self.book_mapping = {
-            'gen': 'Genesis', 'exo': 'Exodus', 'lev': 'Leviticus',
-            'num': 'Numbers', 'deu': 'Deuteronomy', 'jos': 'Joshua',
-            'jdg': 'Judges', 'rut': 'Ruth', '1sa': '1 Samuel',
-            '2sa': '2 Samuel', '1ki': '1 Kings', '2ki': '2 Kings',
-            # ... (add all books)
+from kjv_store import BOOKS, DEFAULT_STORE_PATH, KJVStore
+from kjv_index import DEFAULT_INDEX_PATH, KJVIndex
+from theme_categorizer import CoreTheme
+
+# Chapters kept in memory (a chapter averages ~4 KB of text)
+DEFAULT_CHAPTER_CACHE_SIZE = 256
+
+# Preloaded with preload=True: chapters our content cites most
+POPULAR_CHAPTERS = [
+    ('John', 3), ('Psalms', 23), ('Romans', 8), ('Ephesians', 6), ('Proverbs', 3),
+    ('Isaiah', 40), ('Joshua', 1), ('Philippians', 4), ('1 Corinthians', 13), ('Hebrews', 11),
+    ('Matthew', 5), ('Genesis', 1), ('2 Timothy', 3), ('James', 1), ('Galatians', 5),
+    ('Psalms', 91), ('Romans', 12), ('1 Peter', 5), ('Deuteronomy', 31), ('Jeremiah', 29),
+]
+
+# Abbreviations and spellings found in prose, besides the full name and book_mapping key.
+# Numbered books list the name without its number; 1/2/3, 1st/2nd/3rd, I/II/III,
+# First/Second/Third prefixes are added automatically.
+BOOK_ALIASES = {
+    'Genesis': ['Gen', 'Gn'], 'Exodus': ['Exod', 'Exo'], 'Leviticus': ['Lev', 'Lv'],
+    'Numbers': ['Num', 'Nm', 'Numb'], 'Deuteronomy': ['Deut', 'Dt'], 'Joshua': ['Josh'],
+    'Judges': ['Judg', 'Jdg'], 'Ruth': ['Rth'], '1 Samuel': ['Sam', 'Sm'], '2 Samuel': ['Sam', 'Sm'],
+    '1 Kings': ['Kgs', 'Kings', 'Ki'], '2 Kings': ['Kgs', 'Kings', 'Ki'],
+    '1 Chronicles': ['Chr', 'Chron'], '2 Chronicles': ['Chr', 'Chron'], 'Ezra': ['Ezr'],
+    'Nehemiah': ['Neh'], 'Esther': ['Esth', 'Est'], 'Job': [], 'Psalms': ['Psalm', 'Ps', 'Psa', 'Pss'],
+    'Proverbs': ['Prov', 'Prv', 'Pro'], 'Ecclesiastes': ['Eccl', 'Eccles', 'Ecc', 'Qoh'],
+    'Song of Solomon': ['Song of Songs', 'Song', 'SoS', 'Canticles'], 'Isaiah': ['Isa'],
+    'Jeremiah': ['Jer'], 'Lamentations': ['Lam'], 'Ezekiel': ['Ezek', 'Ezk'], 'Daniel': ['Dan', 'Dn'],
+    'Hosea': ['Hos'], 'Joel': [], 'Amos': ['Am'], 'Obadiah': ['Obad', 'Ob'], 'Jonah': ['Jon'],
+    'Micah': ['Mic'], 'Nahum': ['Nah'], 'Habakkuk': ['Hab'], 'Zephaniah': ['Zeph', 'Zep'],
+    'Haggai': ['Hag'], 'Zechariah': ['Zech', 'Zec'], 'Malachi': ['Mal'],
+    'Matthew': ['Matt', 'Mt'], 'Mark': ['Mk', 'Mrk'], 'Luke': ['Lk', 'Luk'], 'John': ['Jn', 'Jhn'],
+    'Acts': ['Act'], 'Romans': ['Rom'], '1 Corinthians': ['Cor'], '2 Corinthians': ['Cor'],
+    'Galatians': ['Gal'], 'Ephesians': ['Eph'], 'Philippians': ['Phil', 'Php'], 'Colossians': ['Col'],
+    '1 Thessalonians': ['Thess', 'Thes', 'Th'], '2 Thessalonians': ['Thess', 'Thes', 'Th'],
+    '1 Timothy': ['Tim', 'Ti'], '2 Timothy': ['Tim', 'Ti'], 'Titus': ['Tit', 'Ti'], 'Philemon': ['Philem', 'Phlm'],
+    'Hebrews': ['Heb'], 'James': ['Jas', 'Jms'], '1 Peter': ['Pet', 'Pt'], '2 Peter': ['Pet', 'Pt'],
+    '1 John': ['Jn', 'Jhn'], '2 John': ['Jn', 'Jhn'], '3 John': ['Jn', 'Jhn'], 'Jude': [],
+    'Revelation': ['Rev', 'Revelations', 'Revelation of John'],
+}
+# 'Jude 3' cites a verse: these books have a single chapter
+SINGLE_CHAPTER_BOOKS = {'Obadiah', 'Philemon', '2 John', '3 John', 'Jude'}
+
+NUMBER_PREFIXES = {
+    '1': ['1', '1st', 'I', 'First'], '2': ['2', '2nd', 'II', 'Second'], '3': ['3', '3rd', 'III', 'Third']
+}
+
+def _book_lookup():
+    """Every spelling (lowercased, no spaces or periods) -> canonical book name"""
+    lookup = {}
+    for name, abbreviation in BOOKS:
+        number, _, base = name.partition(' ') if name[0].isdigit() else ('', '', name)
+        bases = [base] + BOOK_ALIASES.get(name, [])
+        prefixes = NUMBER_PREFIXES[number] if number else ['']
+        for prefix in prefixes:
+            for spelling in bases:
+                lookup[(prefix + spelling).lower().replace(' ', '')] = name
+        lookup[abbreviation] = name
+    return lookup
+
+BOOK_LOOKUP = _book_lookup()
+
+def _reference_pattern(flags=0):
+    """
+    One compiled alternation over every book spelling, longest first; with
+    re.IGNORECASE the short keys ('gen', '1sa', ...) are spellings too
+    """
+    spellings = set()
+    for name, abbreviation in BOOKS:
+        number, _, base = name.partition(' ') if name[0].isdigit() else ('', '', name)
+        for prefix in (NUMBER_PREFIXES[number] if number else ['']):
+            for spelling in [base] + BOOK_ALIASES.get(name, []):
+                words = [re.escape(word) for word in spelling.split()]
+                body = r'\s+'.join(words)
+                spellings.add(rf'{re.escape(prefix)}\s*{body}' if prefix else body)
+        if flags & re.IGNORECASE:
+            spellings.add(re.escape(abbreviation))
+    books = '|'.join(sorted(spellings, key=len, reverse=True))
+    return re.compile(
+        rf'(?<![\w:])(?P<book>{books})\.?\s*'
+        r'(?P<chapter>\d{1,3})'
+        r'(?:(?::|\.)(?P<verse>\d{1,3})(?:\s*[-\u2013\u2014]\s*(?:(?P<end_chapter>\d{1,3}):)?(?P<end_verse>\d{1,3}))?'
+        r'|\s*[-\u2013\u2014]\s*(?P<chapter_end>\d{1,3})(?![:\d]))?'
+        r'(?![\w:])',
+        flags
+    )
+
+# 'John 3:16', 'Jn 3:16-18', 'Rom 8:38-9:2', 'Ps 23', 'Psalms 1-2', '1 Cor. 13:4'
+REFERENCE_PATTERN = _reference_pattern()
+
+# A single reference typed by hand ('john 3:16', 'gen 1:1'): any case, short keys allowed
+LOOKUP_PATTERN = _reference_pattern(re.IGNORECASE)
+
+# Same-book continuations after a reference: ', 18' / ', 20-22' (verses), '; 12:1-2' (chapter:verse).
+# A number followed by a capitalized word starts a new book ('..., 1 John 4:8') instead.
+CONTINUATION_PATTERN = re.compile(
+    r'\s*(?:,\s*(?P<verse>\d{1,3})(?:\s*[-\u2013]\s*(?P<end_verse>\d{1,3}))?'
+    r'|;\s*(?P<chapter>\d{1,3}):(?P<chapter_verse>\d{1,3})(?:\s*[-\u2013]\s*(?P<chapter_end_verse>\d{1,3}))?)'
+    r'(?![\w:])(?!\s*[A-Z])'
+)
+
+def format_reference(ref):
+    """Canonical label: 'John 3', 'John 3-4', 'John 3:16', 'John 3:16-18', 'John 3:16-4:2'"""
+    book, (chapter, verse), (end_chapter, end_verse) = ref['book'], ref['start'], ref['end']
+    if verse is None:
+        return f"{book} {chapter}" if chapter == end_chapter else f"{book} {chapter}-{end_chapter}"
+    if (chapter, verse) == (end_chapter, end_verse):
+        return f"{book} {chapter}:{verse}"
+    if chapter == end_chapter:
+        return f"{book} {chapter}:{verse}-{end_verse}"
+    return f"{book} {chapter}:{verse}-{end_chapter}:{end_verse}"
+
+class ChapterCache:
+    """Size-bounded LRU of chapters (verse lists) with hit/miss/eviction counters"""
+    def __init__(self, capacity=DEFAULT_CHAPTER_CACHE_SIZE):
+        self.capacity = capacity
+        self.chapters = OrderedDict()
+        self.references = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key, load):
+        """Cached chapter for key, calling load() and caching the result on a miss"""
+        self.references[key] += 1
+        chapter = self.chapters.get(key)
+        if chapter is not None:
+            self.hits += 1
+            self.chapters.move_to_end(key)
+            return chapter
+        self.misses += 1
+        chapter = load()
+        self.put(key, chapter)
+        return chapter
+    
+    def put(self, key, chapter):
+        self.chapters[key] = chapter
+        self.chapters.move_to_end(key)
+        while len(self.chapters) > self.capacity:
+            self.chapters.popitem(last=False)
+            self.evictions += 1
+    
+    def __contains__(self, key):
+        return key in self.chapters
+    
+    def __len__(self):
+        return len(self.chapters)
+    
+    def most_referenced(self, n=20):
+        """Most requested chapters so far, e.g. to preload in the next process"""
+        return [key for key, _ in self.references.most_common(n)]
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'size': len(self.chapters),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
         }
+
+class KJVReferenceSystem:
+    def __init__(self, store_path=DEFAULT_STORE_PATH, cache_size=DEFAULT_CHAPTER_CACHE_SIZE, preload=None,
+                 index_path=DEFAULT_INDEX_PATH):
+        """
+        Args:
+            store_path (str): Binary verse store built by kjv_store.py
+            cache_size (int): Chapters kept in the LRU chapter cache
+            preload: True for POPULAR_CHAPTERS, or a list of (book, chapter)
+                to load up front (only if the store exists)
+            index_path (str): Search index built by kjv_index.py
+        """
+        # Book name standardization: all 66 books by short key ('gen', '1sa', 'rev', ...)
+        self.book_mapping = {abbreviation: name for name, abbreviation in BOOKS}
         
-        # Cache for loaded verses
-        self.verse_cache = {}
+        # Cache for loaded verses, keyed (book, chapter)
+        self.verse_cache = ChapterCache(cache_size)
+        
+        # Binary verse store, opened on first lookup
+        self.store_path = store_path
+        self._store = None
+        self.index_path = index_path
+        self._index = None
+        
+        if preload:
+            self.preload(POPULAR_CHAPTERS if preload is True else preload)
+    
+    def preload(self, chapters):
+        """Load chapters into the cache ahead of use; returns how many were loaded"""
+        try:
+            store = self.store
+        except ValueError:
+            return 0
+        loaded = 0
+        for book, chapter in list(chapters)[:self.verse_cache.capacity]:
+            if (book, chapter) not in self.verse_cache:
+                self.verse_cache.put((book, chapter), store.chapter(book, chapter))
+                loaded += 1
+        return loaded
+    
+    def cache_stats(self):
+        """Chapter cache capacity, size and hit/miss/eviction counters"""
+        return self.verse_cache.stats()
+    
+    @property
+    def store(self):
+        if self._store is None:
+            try:
+                self._store = KJVStore(self.store_path)
+            except FileNotFoundError:
+                raise ValueError(f"KJV verse store not found at {self.store_path} "
+                                 f"(build it with: python kjv_store.py build <kjv.txt>)")
+        return self._store
     
     def parse_reference(self, reference):
         """Parse a scripture reference (e.g., 'John 3:16' or 'Psalm 23:1-6')"""
-        pattern = r'^(\d?\s*\w+)\s*(\d+):(\d+)(?:-(\d+))?$'
-        match = re.match(pattern, reference)
-        
-        if not match:
+        refs = self.find_references(reference, LOOKUP_PATTERN)
+        if len(refs) != 1 or refs[0]['start'][1] is None or refs[0]['start'][0] != refs[0]['end'][0]:
             raise ValueError("Invalid reference format")
-            
-        book, chapter, start_verse, end_verse = match.groups()
-        book = self.standardize_book_name(book)
-        
+        ref = refs[0]
         return {
-            'book': book,
-            'chapter': int(chapter),
-            'start_verse': int(start_verse),
-            'end_verse': int(end_verse) if end_verse else int(start_verse)
+            'book': ref['book'],
+            'chapter': ref['start'][0],
+            'start_verse': ref['start'][1],
+            'end_verse': ref['end'][1]
         }
     
     def standardize_book_name(self, book):
         """Convert various book name formats to standard KJV names"""
-        book = book.lower().strip()
-        book = re.sub(r'\s+', '', book)
+        name = BOOK_LOOKUP.get(re.sub(r'[\s.]+', '', book.lower()))
+        if name is None:
+            raise ValueError(f"Unknown book: {book}")
+        return name
+    
+    def get_verses(self, reference):
+        """
+        Retrieve verses for one reference from the KJV store, one chapter load
+        per cached chapter; book names resolve exactly as in find_references
+        """
+        refs = self.find_references(reference, LOOKUP_PATTERN)
+        if len(refs) != 1:
+            raise ValueError(f"Invalid reference: {reference}")
+        verses = self.resolve_references(refs)[refs[0]['label']]
+        if isinstance(verses, str):
+            raise ValueError(verses)
+        return verses
+    
+    def find_references(self, text, pattern=REFERENCE_PATTERN):
+        """
+        Every scripture reference in a text, in one pass of the book-name automaton
         
-        if book in self.book_mapping:
-            return self.book_mapping[book]
+        Args:
+            text (str): Prose to scan
+            pattern: REFERENCE_PATTERN (case-sensitive, for prose) or LOOKUP_PATTERN
         
-        # Handle common variations
-        for key, value in self.book_mapping.items():
-            if book in value.lower().replace(' ', ''):
-                return value
-                
-        raise ValueError(f"Unknown book: {book}")
+        Returns:
+            list: dicts with 'label' (canonical), 'book', 'start' (chapter,
+            verse) and 'end' (chapter, verse), verse None for whole chapters,
+            and 'span' (character offsets of the citation)
+        """
+        references = []
+        position = 0
+        while True:
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            book = BOOK_LOOKUP[re.sub(r'[\s.]+', '', match.group('book').lower())]
+            chapter = int(match.group('chapter'))
+            verse = match.group('verse')
+            if verse is not None:
+                verse = int(verse)
+                end_chapter = int(match.group('end_chapter') or chapter)
+                end_verse = int(match.group('end_verse') or verse)
+            elif book in SINGLE_CHAPTER_BOOKS:
+                verse = chapter
+                end_verse = int(match.group('chapter_end') or verse)
+                chapter = end_chapter = 1
+            else:
+                end_chapter = int(match.group('chapter_end') or chapter)
+                end_verse = None
+            found = [(chapter, verse, end_chapter, end_verse, match.start(), match.end())]
+            
+            # '..., 18' and '...; 12:1' continue the same book
+            position = match.end()
+            while True:
+                more = CONTINUATION_PATTERN.match(text, position)
+                if more is None:
+                    break
+                if more.group('chapter'):
+                    chapter = int(more.group('chapter'))
+                    start = int(more.group('chapter_verse'))
+                    end = int(more.group('chapter_end_verse') or start)
+                    begins = more.start('chapter')
+                elif found[-1][3] is not None:
+                    chapter = found[-1][2]
+                    start = int(more.group('verse'))
+                    end = int(more.group('end_verse') or start)
+                    begins = more.start('verse')
+                else:
+                    break
+                found.append((chapter, start, chapter, end, begins, more.end()))
+                position = more.end()
+            
+            for chapter, verse, end_chapter, end_verse, start, end in found:
+                if (end_chapter, end_verse or 0) < (chapter, verse or 0):
+                    continue
+                ref = {'book': book, 'start': (chapter, verse), 'end': (end_chapter, end_verse), 'span': (start, end)}
+                ref['label'] = format_reference(ref)
+                references.append(ref)
+        return references
     
-    def get_verses(self, reference):
-        """Retrieve verses from KJV text (implement caching for efficiency)"""
-        ref_obj = self.parse_reference(reference)
-        cache_key = f"{ref_obj['book']}_{ref_obj['chapter']}"
+    def resolve_references(self, references):
+        """
+        Verses for many references, loading each chapter once
         
-        if cache_key not in self.verse_cache:
-            # Load verses from KJV source (implement actual loading logic)
-            # self.verse_cache[cache_key] = load_chapter(ref_obj['book'], ref_obj['chapter'])
-            pass
+        Args:
+            references (list): find_references() results
             
-        verses = self.verse_cache[cache_key]
-        return verses[ref_obj['start_verse']-1:ref_obj['end_verse']]
-    
-    def find_thematic_verses(self, theme):
-        """Find verses related to a specific theme"""
-        # Implement thematic search using pre-built index
-        pass
-    
-    def get_cross_references(self, reference):
-        """Get related cross-references for a verse"""
-        # Implement cross-reference lookup
-        pass
\ No newline at end of file
+        Returns:
+            dict: {label: [verses]} or {label: error message}
+        """
+        # Group by chapter so every chapter is fetched from the cache/store once
+        chapters = {}
+        for ref in references:
+            for chapter in range(ref['start'][0], ref['end'][0] + 1):
+                chapters.setdefault((ref['book'], chapter), None)
+        
+        for key in chapters:
+            try:
+                chapters[key] = self.verse_cache.get(key, lambda: self.store.chapter(*key))
+            except ValueError as e:
+                chapters[key] = e
+        
+        resolved = {}
+        for ref in references:
+            if ref['label'] in resolved:
+                continue
+            book = ref['book']
+            (chapter, verse), (end_chapter, end_verse) = ref['start'], ref['end']
+            verses = []
+            try:
+                for number in range(chapter, end_chapter + 1):
+                    text = chapters[(book, number)]
+                    if isinstance(text, Exception):
+                        raise text
+                    if not text:
+                        raise ValueError(f"{book} has no chapter {number}")
+                    first = verse if number == chapter and verse is not None else 1
+                    last = end_verse if number == end_chapter and end_verse is not None else len(text)
+                    if first < 1 or first > len(text):
+                        raise ValueError(f"{book} {number} has no verse {first}")
+                    verses.extend(text[first - 1:last])
+                resolved[ref['label']] = verses
+            except ValueError as e:
+                resolved[ref['label']] = str(e)
+        return resolved
+    
+    def extract_and_resolve(self, text):
+        """Find every reference in a document and resolve them in one batch"""
+        return self.resolve_references(self.find_references(text))
+    
+    @property
+    def index(self):
+        """Search index built by kjv_index.py, opened on first query"""
+        if self._index is None:
+            if not os.path.exists(self.index_path):
+                raise ValueError(f"KJV search index not found at {self.index_path} "
+                                 f"(build it with: python kjv_index.py build)")
+            self._index = KJVIndex(self.index_path)
+        return self._index
+    
+    def find_thematic_verses(self, theme, k=10):
+        """
+        Find verses related to a specific theme
+        
+        Args:
+            theme: A CoreTheme (precomputed ranking) or a free-text query
+                such as "covenant blood" (BM25 over the inverted index)
+            k (int): Number of verses
+            
+        Returns:
+            list: dicts with 'reference', 'verse_id', 'score' and 'text', best first
+        """
+        if isinstance(theme, CoreTheme):
+            hits = self.index.theme(theme.name, k)
+        else:
+            hits = self.index.search(theme, k)
+        for hit in hits:
+            hit['text'] = self.get_verses(hit['reference'])[0]
+        return hits
+    
+    def get_cross_references(self, reference, k=20):
+        """Get related cross-references for one verse, most voted first"""
+        refs = self.find_references(reference, LOOKUP_PATTERN)
+        if len(refs) != 1 or refs[0]['start'][1] is None:
+            raise ValueError(f"Not a verse reference: {reference}")
+        book, (chapter, verse) = refs[0]['book'], refs[0]['start']
+        verse_id = self.store.verse_id(book, chapter, verse)
+        if verse_id is None:
+            raise ValueError(f"{book} {chapter} has no verse {verse}")
+        return self.index.cross_references(verse_id, k)
\ No newline at end of file
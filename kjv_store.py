@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+KJV Verse Store
+Compact binary King James text with a (book, chapter, verse) -> offset
+index, read through mmap so a lookup is a few struct reads and one slice:
+no parsing at load time and only the touched pages become resident.
+
+Build it once from a plain-text KJV with one verse per line, either
+  Genesis 1:1 In the beginning God created the heaven and the earth.
+or
+  Gen|1|1|In the beginning God created the heaven and the earth.
+
+Usage:
+  python kjv_store.py build <kjv.txt> [--output data/kjv.bin]
+  python kjv_store.py get "John 3:16"
+  python kjv_store.py stats
+"""
+
+import os
+import re
+import sys
+import mmap
+import struct
+
+DEFAULT_STORE_PATH = os.environ.get("KJV_STORE", os.path.join("data", "kjv.bin"))
+
+# Canonical order; the abbreviation is each book's short key in book_mapping
+BOOKS = [
+    ("Genesis", "gen"), ("Exodus", "exo"), ("Leviticus", "lev"), ("Numbers", "num"),
+    ("Deuteronomy", "deu"), ("Joshua", "jos"), ("Judges", "jdg"), ("Ruth", "rut"),
+    ("1 Samuel", "1sa"), ("2 Samuel", "2sa"), ("1 Kings", "1ki"), ("2 Kings", "2ki"),
+    ("1 Chronicles", "1ch"), ("2 Chronicles", "2ch"), ("Ezra", "ezr"), ("Nehemiah", "neh"),
+    ("Esther", "est"), ("Job", "job"), ("Psalms", "psa"), ("Proverbs", "pro"),
+    ("Ecclesiastes", "ecc"), ("Song of Solomon", "sng"), ("Isaiah", "isa"), ("Jeremiah", "jer"),
+    ("Lamentations", "lam"), ("Ezekiel", "ezk"), ("Daniel", "dan"), ("Hosea", "hos"),
+    ("Joel", "jol"), ("Amos", "amo"), ("Obadiah", "oba"), ("Jonah", "jon"),
+    ("Micah", "mic"), ("Nahum", "nah"), ("Habakkuk", "hab"), ("Zephaniah", "zep"),
+    ("Haggai", "hag"), ("Zechariah", "zec"), ("Malachi", "mal"),
+    ("Matthew", "mat"), ("Mark", "mrk"), ("Luke", "luk"), ("John", "jhn"),
+    ("Acts", "act"), ("Romans", "rom"), ("1 Corinthians", "1co"), ("2 Corinthians", "2co"),
+    ("Galatians", "gal"), ("Ephesians", "eph"), ("Philippians", "php"), ("Colossians", "col"),
+    ("1 Thessalonians", "1th"), ("2 Thessalonians", "2th"), ("1 Timothy", "1ti"), ("2 Timothy", "2ti"),
+    ("Titus", "tit"), ("Philemon", "phm"), ("Hebrews", "heb"), ("James", "jas"),
+    ("1 Peter", "1pe"), ("2 Peter", "2pe"), ("1 John", "1jn"), ("2 John", "2jn"),
+    ("3 John", "3jn"), ("Jude", "jud"), ("Revelation", "rev"),
+]
+BOOK_NAMES = [name for name, _ in BOOKS]
+BOOK_IDS = {name: i for i, name in enumerate(BOOK_NAMES)}
+
+# Spellings found in KJV text files besides the name and abbreviation
+SOURCE_ALIASES = {"psalm": "Psalms", "songofsongs": "Song of Solomon", "canticles": "Song of Solomon",
+                  "revelationofjohn": "Revelation", "ge": "Genesis", "ps": "Psalms"}
+
+MAGIC = b"KJVS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")     # magic, version, books, chapters, verses
+BOOK_ENTRY = struct.Struct("<IH")     # first chapter index, chapter count
+CHAPTER_ENTRY = struct.Struct("<IH")  # first verse index, verse count
+OFFSET = struct.Struct("<I")          # byte offset of a verse in the text blob
+
+LINE_PATTERNS = [
+    re.compile(r"^\s*(.+?)\s+(\d+):(\d+)\s+(.+?)\s*$"),
+    re.compile(r"^\s*([^|]+)\|(\d+)\|(\d+)\|(.+?)\s*$"),
+]
+
+
+def source_book(name):
+    """Canonical book name for a book label in a KJV text file, or None"""
+    key = re.sub(r"[\s.]+", "", name.lower())
+    for book, abbreviation in BOOKS:
+        if key in (book.lower().replace(" ", ""), abbreviation):
+            return book
+    return SOURCE_ALIASES.get(key)
+
+
+def build_store(source_path, output_path=DEFAULT_STORE_PATH):
+    """
+    Parse a plain-text KJV and write the binary store
+
+    Returns:
+        dict: books, chapters, verses and bytes written
+    """
+    books = {}
+    with open(source_path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            for pattern in LINE_PATTERNS:
+                match = pattern.match(line)
+                if match:
+                    break
+            else:
+                continue
+            book = source_book(match.group(1))
+            if book is None:
+                continue
+            chapter, verse = int(match.group(2)), int(match.group(3))
+            books.setdefault(BOOK_IDS[book], {}).setdefault(chapter, {})[verse] = match.group(4)
+
+    verse_total = sum(len(texts) for chapters in books.values() for texts in chapters.values())
+    if not verse_total:
+        raise ValueError(f"No verses found in {source_path}")
+
+    book_entries, chapter_entries, offsets = [], [], []
+    blob = bytearray()
+    for book_id in range(len(BOOKS)):
+        chapters = books.get(book_id, {})
+        chapter_total = max(chapters, default=0)
+        book_entries.append((len(chapter_entries), chapter_total))
+        for chapter in range(1, chapter_total + 1):
+            texts = chapters.get(chapter, {})
+            last_verse = max(texts, default=0)
+            chapter_entries.append((len(offsets), last_verse))
+            # Missing verse numbers are stored empty so indexes stay positional
+            for verse in range(1, last_verse + 1):
+                offsets.append(len(blob))
+                blob += texts.get(verse, "").encode("utf-8")
+    offsets.append(len(blob))
+
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(book_entries), len(chapter_entries), len(offsets) - 1))
+        for entry in book_entries:
+            f.write(BOOK_ENTRY.pack(*entry))
+        for entry in chapter_entries:
+            f.write(CHAPTER_ENTRY.pack(*entry))
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        f.write(blob)
+    os.replace(tmp_path, output_path)
+
+    return {
+        "books": sum(1 for _, count in book_entries if count),
+        "chapters": len(chapter_entries),
+        "verses": verse_total,
+        "bytes": os.path.getsize(output_path)
+    }
+
+
+class KJVStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.book_count, self.chapter_count, self.verse_count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a KJV store (version {VERSION})")
+        self.books_at = HEADER.size
+        self.chapters_at = self.books_at + self.book_count * BOOK_ENTRY.size
+        self.offsets_at = self.chapters_at + self.chapter_count * CHAPTER_ENTRY.size
+        self.text_at = self.offsets_at + (self.verse_count + 1) * OFFSET.size
+
+    def chapter_count_of(self, book):
+        return BOOK_ENTRY.unpack_from(self.data, self.books_at + BOOK_IDS[book] * BOOK_ENTRY.size)[1]
+
+    def _chapter(self, book, chapter):
+        """(first verse index, verse count), or None if the chapter doesn't exist"""
+        first_chapter, chapters = BOOK_ENTRY.unpack_from(self.data, self.books_at + BOOK_IDS[book] * BOOK_ENTRY.size)
+        if not 1 <= chapter <= chapters:
+            return None
+        return CHAPTER_ENTRY.unpack_from(self.data, self.chapters_at + (first_chapter + chapter - 1) * CHAPTER_ENTRY.size)
+
+    def _text(self, index, count=1):
+        start = OFFSET.unpack_from(self.data, self.offsets_at + index * OFFSET.size)[0]
+        end = OFFSET.unpack_from(self.data, self.offsets_at + (index + count) * OFFSET.size)[0]
+        return self.data[self.text_at + start:self.text_at + end]
+
+    def verse_count_of(self, book, chapter):
+        entry = self._chapter(book, chapter)
+        return entry[1] if entry else 0
+
+    def verse(self, book, chapter, verse):
+        """Text of one verse, or None if it doesn't exist"""
+        entry = self._chapter(book, chapter)
+        if entry is None or not 1 <= verse <= entry[1]:
+            return None
+        return self._text(entry[0] + verse - 1).decode("utf-8")
+
+    def chapter(self, book, chapter):
+        """All verses of a chapter as a list (verse 1 at index 0); empty if it doesn't exist"""
+        entry = self._chapter(book, chapter)
+        if entry is None:
+            return []
+        first, count = entry
+        offsets = struct.unpack_from(f"<{count + 1}I", self.data, self.offsets_at + first * OFFSET.size)
+        text = self.data[self.text_at + offsets[0]:self.text_at + offsets[-1]]
+        base = offsets[0]
+        return [text[start - base:end - base].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def verse_id(self, book, chapter, verse):
+        """Position of a verse in canonical order (stable across builds of the same text), or None"""
+        entry = self._chapter(book, chapter)
+        if entry is None or not 1 <= verse <= entry[1]:
+            return None
+        return entry[0] + verse - 1
+
+    def iter_verses(self):
+        """Yield (verse_id, book, chapter, verse, text) for every verse, in order"""
+        for book in BOOK_NAMES:
+            for chapter in range(1, self.chapter_count_of(book) + 1):
+                first = self._chapter(book, chapter)[0]
+                for number, text in enumerate(self.chapter(book, chapter), 1):
+                    yield first + number - 1, book, chapter, number, text
+
+    def close(self):
+        self.data.close()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("build", "get", "stats"):
+        print(__doc__.strip())
+        return
+
+    args = sys.argv[2:]
+    output = args[args.index("--output") + 1] if "--output" in args else DEFAULT_STORE_PATH
+
+    if sys.argv[1] == "build":
+        if not args or args[0].startswith("--"):
+            print("Usage: python kjv_store.py build <kjv.txt> [--output data/kjv.bin]")
+            return
+        info = build_store(args[0], output)
+        print(f"📖 Built {output}: {info['books']} books, {info['chapters']} chapters, "
+              f"{info['verses']} verses, {info['bytes'] / 1024:.0f} KB")
+        if info["books"] < len(BOOKS):
+            print(f"⚠️  Only {info['books']} of {len(BOOKS)} books found in the source")
+    elif sys.argv[1] == "get":
+        from kjv_reference_system import KJVReferenceSystem
+        for verse in KJVReferenceSystem().get_verses(" ".join(args)):
+            print(verse)
+    else:
+        store = KJVStore(output)
+        books = sum(1 for book in BOOK_NAMES if store.chapter_count_of(book))
+        print(f"📖 {store.path}: {books} books, {store.chapter_count} chapters, "
+              f"{store.verse_count} verses, {os.path.getsize(store.path) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
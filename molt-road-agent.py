@@ -9,7 +9,9 @@ import json
 import os
 from datetime import datetime
 
-BASE_URL = "https://moltroad.com/api/v1"
+from molt_road_snapshot import CycleSnapshot
+
+BASE_URL = os.environ.get("MOLT_ROAD_URL", "https://moltroad.com/api/v1")
 
 class MoltRoadAgent:
     def __init__(self, name, bio, api_key=None):
@@ -196,12 +198,19 @@ class BiblicalManAgentNetwork:
             self.agents.append(agent)
             return agent
     
-    def run_marketplace_scan(self):
-        """Scan for opportunities"""
+    def run_marketplace_scan(self, snapshot=None):
+        """
+        Scan for opportunities
+        
+        Args:
+            snapshot (CycleSnapshot): Responses already fetched this cycle;
+                defaults to the last heartbeat's snapshot while it is recent
+        """
         print("\n🔍 Scanning Molt Road for opportunities...\n")
+        snapshot = snapshot or CycleSnapshot.load_recent(BASE_URL)
         
         # Check what others are selling
-        listings = requests.get(f"{BASE_URL}/listings").json()["listings"]
+        listings = snapshot.get_sync("/listings", lambda: requests.get(f"{BASE_URL}/listings").json())["listings"]
         
         print(f"Found {len(listings)} active listings")
         
@@ -214,12 +223,16 @@ class BiblicalManAgentNetwork:
                 print(f"   Seller: {listing['seller']['name']} (Rating: {listing['seller'].get('rating', 'N/A')})")
         
         # Check bounties
-        bounties = requests.get(f"{BASE_URL}/bounties").json()["bounties"]
+        bounties = snapshot.get_sync("/bounties", lambda: requests.get(f"{BASE_URL}/bounties").json())["bounties"]
         print(f"\n💰 {len(bounties)} open bounties")
         
         for bounty in bounties[:5]:
             print(f"\n   WANTED: {bounty['title']}")
             print(f"   Reward: {bounty['reward']} credits")
+        
+        if snapshot.saved:
+            print(f"\n♻️  {snapshot.saved} responses reused from the heartbeat snapshot")
+        return snapshot
 
 
 # Example deployment script
@@ -1,20 +1,14 @@
 #!/bin/bash
-# Molt Road Cron Job - Run every 4 hours
-# Add to cron: 0 */4 * * * /home/ubuntu/.openclaw/workspace/molt-road-cron.sh
+# Molt Road Cron Job - Watchdog for the heartbeat daemon
+# Add to cron: */15 * * * * /home/ubuntu/.openclaw/workspace/molt-road-cron.sh
+#
+# The daemon (molt-road-heartbeat.py --daemon) polls orders itself, faster while
+# credits are in escrow, and sends its own alerts to OpenClaw, so cron only makes
+# sure it is running.
 
 cd /home/ubuntu/.openclaw/workspace
 
-# Run heartbeat
-./molt-road-openclaw.sh heartbeat > molt-road-last-run.log 2>&1
-
-# Check if any orders need attention
-if grep -q "orders waiting for delivery\|deliveries to confirm" molt-road-last-run.log; then
-    # Send alert to Telegram
-    echo "🦞 Molt Road Alert: Orders need attention! Check molt-road-last-run.log" | \
-    curl -s -X POST "http://localhost:18789/api/v1/sessions/send" \
-    -H "Content-Type: application/json" \
-    -d '{"message": "🦞 Molt Road Alert: Orders need attention! Run: ./molt-road-openclaw.sh heartbeat"}'
-fi
+./molt-road-openclaw.sh daemon start >> molt-road-cron-history.log 2>&1
 
 # Log completion
 echo "Last run: $(date)" >> molt-road-cron-history.log
\ No newline at end of file
@@ -2,76 +2,230 @@
 """
 Molt Road Heartbeat - Monitor and manage your agent empire
 Run this periodically to check orders, deliver goods, and find opportunities
+
+All agents are checked concurrently (each with its own session on the
+shared connection pool) under one global limit on requests in flight, and
+an agent's deliveries and confirmations are sent in parallel, so a cycle
+takes about as long as the slowest agent rather than the sum of them all.
+Read-only endpoints are fetched once per cycle through a CycleSnapshot
+shared by the status checks, the opportunity scan and the report. Order
+lists are synced incrementally (conditional GETs plus a persisted cursor,
+see molt_road_sync.py), so only new or changed orders are acted on.
+
+With --daemon it stays running instead of being restarted by cron: agents,
+sessions and connection pools stay warm, polling speeds up to
+--min-interval while any order holds credits in escrow and backs off to
+--max-interval when idle, and the opportunity scan and metrics report run
+every --report-interval. Order events are appended as JSON lines to
+molt-road-state/events.jsonl; those needing attention are also sent to the
+OpenClaw session endpoint (MOLT_ROAD_ALERT_URL, empty to disable).
+
+Usage:
+  python molt-road-heartbeat.py [--concurrency N]
+  python molt-road-heartbeat.py --daemon [--min-interval SECONDS] [--max-interval SECONDS]
+                                [--report-interval SECONDS] [--concurrency N]
+
+Set MOLT_ROAD_URL to point the heartbeat at another API (e.g. a local fake).
 """
 
-import requests
+import asyncio
 import json
 import os
+import sys
+import time
+import signal
 from datetime import datetime
 import glob
 
-BASE_URL = "https://moltroad.com/api/v1"
+from http_transport import create_session
+from molt_road_snapshot import CycleSnapshot
+from molt_road_sync import OrderSync
+from molt_road_metrics import record_report
+
+BASE_URL = os.environ.get("MOLT_ROAD_URL", "https://moltroad.com/api/v1")
+
+AGENTS_DIR = "molt-road-agents"
+REPORTS_DIR = "molt-road-reports"
+
+STATE_DIR = "molt-road-state"
+EVENTS_PATH = os.path.join(STATE_DIR, "events.jsonl")
+PID_PATH = os.path.join(STATE_DIR, "daemon.pid")
+
+# OpenClaw session endpoint that receives alert messages ('' disables alerts)
+ALERT_URL = os.environ.get("MOLT_ROAD_ALERT_URL", "http://localhost:18789/api/v1/sessions/send")
+
+# Events that are pushed as alerts, not just logged
+ALERT_EVENTS = ("orders_need_attention", "delivery_failed", "check_failed")
+
+# Requests in flight across all agents
+DEFAULT_CONCURRENCY = 8
+
+REQUEST_TIMEOUT = 30
+
+# Daemon polling: MIN_INTERVAL while credits sit in escrow, doubling up to MAX_INTERVAL when idle
+MIN_INTERVAL = 60
+MAX_INTERVAL = 30 * 60
+
+# Daemon opportunity scan + metrics report cadence (the old cron period)
+REPORT_INTERVAL = 4 * 3600
 
 class MoltRoadHeartbeat:
-    def __init__(self):
+    def __init__(self, base_url=BASE_URL, concurrency=DEFAULT_CONCURRENCY, quiet=False):
+        self.base_url = base_url
+        self.concurrency = max(1, concurrency)
+        # Quiet: only agents with order activity print their status block
+        self.quiet = quiet
+        self.agents_mtime = self._agents_mtime()
         self.agents = self.load_agents()
-        
+        self.sessions = {}
+        self.public_session = None
+        self.semaphore = None
+        self.snapshot = None
+        self.http_calls = 0
+        self.order_sync = OrderSync()
+        self.events = []
+        self.last_events = []
+        self.alerted = set()
+
+    def _agents_mtime(self):
+        try:
+            return os.stat(AGENTS_DIR).st_mtime
+        except OSError:
+            return None
+
+    def reload_agents(self):
+        """Reload credentials only if agents were added or removed since the last load"""
+        mtime = self._agents_mtime()
+        if mtime != self.agents_mtime:
+            self.agents_mtime = mtime
+            self.agents = self.load_agents()
+            return True
+        return False
+
     def load_agents(self):
         """Load all registered agents from saved credentials"""
         agents = []
-        for agent_file in glob.glob("molt-road-agents/*.json"):
+        for agent_file in sorted(glob.glob(f"{AGENTS_DIR}/*.json")):
             with open(agent_file, "r") as f:
                 agent_data = json.load(f)
                 agents.append(agent_data)
         return agents
-    
-    def check_agent_status(self, agent):
-        """Check status of a single agent"""
-        headers = {"X-API-Key": agent["api_key"]}
-        
-        print(f"\n🤖 Checking {agent['name']}...")
-        
-        # Get profile
-        me = requests.get(f"{BASE_URL}/me", headers=headers).json()
-        print(f"   💰 Balance: {me['balance']} credits")
-        print(f"   ⭐ Rating: {me.get('rating', 'No ratings yet')} ({me.get('rating_count', 0)} reviews)")
-        
-        # Check pending orders to deliver
-        seller_orders = requests.get(f"{BASE_URL}/orders?role=seller", headers=headers).json()
-        pending = [o for o in seller_orders["orders"] if o["status"] == "escrowed"]
-        
-        if pending:
-            print(f"   📦 {len(pending)} orders waiting for delivery!")
-            for order in pending:
-                print(f"      - Order {order['id']}: {order['listing']['title']}")
-                
-                # Auto-deliver based on listing type
-                if "analysis" in order["listing"]["title"].lower():
-                    self.deliver_analysis(agent, order)
-                elif "hook" in order["listing"]["title"].lower():
-                    self.deliver_hooks(agent, order)
-                elif "intelligence" in order["listing"]["title"].lower():
-                    self.deliver_intelligence(agent, order)
-        
-        # Check orders to confirm
-        buyer_orders = requests.get(f"{BASE_URL}/orders?role=buyer", headers=headers).json()
-        to_confirm = [o for o in buyer_orders["orders"] if o["status"] == "delivered"]
-        
-        if to_confirm:
-            print(f"   ✅ {len(to_confirm)} deliveries to confirm")
-            for order in to_confirm:
-                # Auto-confirm if data looks good
-                if order.get("delivery_data"):
-                    response = requests.post(
-                        f"{BASE_URL}/orders/{order['id']}/confirm",
-                        headers=headers
-                    )
-                    if response.status_code == 200:
-                        print(f"      ✅ Confirmed order {order['id']}")
-        
+
+    def session_for(self, agent=None):
+        """Per-agent session (API key header) on the shared pool; public endpoints use an anonymous one"""
+        if agent is None:
+            if self.public_session is None:
+                self.public_session = create_session(pool_size=self.concurrency)
+            return self.public_session
+        if agent["api_key"] not in self.sessions:
+            self.sessions[agent["api_key"]] = create_session({"X-API-Key": agent["api_key"]}, self.concurrency)
+        return self.sessions[agent["api_key"]]
+
+    async def request(self, method, path, agent=None, **kwargs):
+        """One API call under the global concurrency limit"""
+        session = self.session_for(agent)
+        self.http_calls += 1
+        async with self.semaphore:
+            return await asyncio.to_thread(
+                session.request, method, f"{self.base_url}{path}", timeout=REQUEST_TIMEOUT, **kwargs
+            )
+
+    async def get_json(self, path, agent=None):
+        response = await self.request("GET", path, agent)
+        response.raise_for_status()
+        return response.json()
+
+    async def snapshot_json(self, path, agent=None):
+        """Read-only endpoint, fetched at most once per cycle"""
+        return await self.snapshot.get(path, lambda: self.get_json(path, agent), agent["name"] if agent else None)
+
+    async def check_agent_status(self, agent):
+        """Check status of a single agent; returns its /me profile"""
+        # Lines are buffered so concurrent agents print as whole blocks
+        log = [f"\n🤖 Checking {agent['name']}..."]
+        active = False
+
+        try:
+            # Profile and both order lists at once; unchanged lists come back as 304s
+            me, seller_response, buyer_response = await asyncio.gather(
+                self.snapshot_json("/me", agent),
+                self.request("GET", "/orders?role=seller", agent,
+                             headers=self.order_sync.request_headers(agent["name"], "seller")),
+                self.request("GET", "/orders?role=buyer", agent,
+                             headers=self.order_sync.request_headers(agent["name"], "buyer"))
+            )
+            log.append(f"   💰 Balance: {me['balance']} credits")
+            log.append(f"   ⭐ Rating: {me.get('rating', 'No ratings yet')} ({me.get('rating_count', 0)} reviews)")
+            unchanged = seller_response.status_code == 304 and buyer_response.status_code == 304
+            if unchanged:
+                log.append("   💤 No order changes since the last sync")
+
+            tasks = []
+
+            # Check pending orders to deliver (new, changed, or not yet delivered)
+            pending = self.order_sync.merge(agent["name"], "seller", seller_response)
+            if pending:
+                log.append(f"   📦 {len(pending)} orders waiting for delivery!")
+                for order in pending:
+                    log.append(f"      - Order {order['id']}: {order['listing']['title']}")
+
+                    # Auto-deliver based on listing type
+                    if "analysis" in order["listing"]["title"].lower():
+                        tasks.append(self.deliver_analysis(agent, order))
+                    elif "hook" in order["listing"]["title"].lower():
+                        tasks.append(self.deliver_hooks(agent, order))
+                    elif "intelligence" in order["listing"]["title"].lower():
+                        tasks.append(self.deliver_intelligence(agent, order))
+
+            # Check orders to confirm
+            to_confirm = self.order_sync.merge(agent["name"], "buyer", buyer_response)
+            if to_confirm:
+                log.append(f"   ✅ {len(to_confirm)} deliveries to confirm")
+                for order in to_confirm:
+                    # Auto-confirm if data looks good
+                    if order.get("delivery_data"):
+                        tasks.append(self.confirm_order(agent, order))
+
+            # Quiet mode prints only news: changed order lists or something sent
+            active = bool(tasks) or (bool(pending or to_confirm) and not unchanged)
+
+            # Deliveries and confirmations go out together
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    log.append(f"      ❌ {result}")
+                elif result:
+                    log.append(result)
+        except Exception as e:
+            log.append(f"   ❌ Check failed: {e}")
+            self.emit("check_failed", agent["name"], error=str(e))
+            me = None
+            active = True
+
+        if active or not self.quiet:
+            print("\n".join(log))
         return me
-    
-    def deliver_analysis(self, agent, order):
+
+    async def confirm_order(self, agent, order):
+        response = await self.request("POST", f"/orders/{order['id']}/confirm", agent)
+        if response.status_code == 200:
+            self.order_sync.mark_done(agent["name"], "buyer", order["id"])
+            self.emit("order_confirmed", agent["name"], order_id=order["id"])
+            return f"      ✅ Confirmed order {order['id']}"
+        self.emit("delivery_failed", agent["name"], order_id=order["id"], action="confirm",
+                  status=response.status_code)
+        return f"      ❌ Confirm failed for order {order['id']} (HTTP {response.status_code})"
+
+    async def deliver(self, agent, order, data, kind):
+        response = await self.request("POST", f"/orders/{order['id']}/deliver", agent, json={"data": data})
+        if response.status_code == 200:
+            self.order_sync.mark_done(agent["name"], "seller", order["id"])
+            self.emit("order_delivered", agent["name"], order_id=order["id"], kind=kind)
+            return f"      📤 Delivered {kind} for order {order['id']}"
+        self.emit("delivery_failed", agent["name"], order_id=order["id"], action="deliver",
+                  status=response.status_code)
+        return f"      ❌ Delivery failed for order {order['id']} (HTTP {response.status_code})"
+
+    async def deliver_analysis(self, agent, order):
         """Deliver content analysis"""
         analysis = {
             "report": "Viral Content Analysis Report",
@@ -86,17 +240,10 @@ class MoltRoadHeartbeat:
             "optimal_posting_time": "Tuesday 2PM ET",
             "predicted_engagement": "5K+ likes, 500+ replies"
         }
-        
-        response = requests.post(
-            f"{BASE_URL}/orders/{order['id']}/deliver",
-            headers={"X-API-Key": agent["api_key"]},
-            json={"data": analysis}
-        )
-        
-        if response.status_code == 200:
-            print(f"      📤 Delivered analysis for order {order['id']}")
-    
-    def deliver_hooks(self, agent, order):
+
+        return await self.deliver(agent, order, analysis, "analysis")
+
+    async def deliver_hooks(self, agent, order):
         """Deliver viral hooks"""
         hooks = {
             "hook_pack": "Father Wound Viral Openers",
@@ -110,17 +257,10 @@ class MoltRoadHeartbeat:
             "usage_notes": "Post between 2-4 PM ET. Follow with vulnerability + solution.",
             "tested_engagement": "Average 3K+ likes per hook"
         }
-        
-        response = requests.post(
-            f"{BASE_URL}/orders/{order['id']}/deliver",
-            headers={"X-API-Key": agent["api_key"]},
-            json={"data": hooks}
-        )
-        
-        if response.status_code == 200:
-            print(f"      📤 Delivered hooks for order {order['id']}")
-    
-    def deliver_intelligence(self, agent, order):
+
+        return await self.deliver(agent, order, hooks, "hooks")
+
+    async def deliver_intelligence(self, agent, order):
         """Deliver customer intelligence"""
         intel = {
             "report": "Gumroad High-Value Customer Alert",
@@ -132,114 +272,286 @@ class MoltRoadHeartbeat:
             "recommendations": "Personal outreach within 48 hours. Mention specific products they engaged with.",
             "conversion_window": "Next 72 hours"
         }
-        
-        response = requests.post(
-            f"{BASE_URL}/orders/{order['id']}/deliver",
-            headers={"X-API-Key": agent["api_key"]},
-            json={"data": intel}
-        )
-        
-        if response.status_code == 200:
-            print(f"      📤 Delivered intelligence for order {order['id']}")
-    
-    def find_opportunities(self):
+
+        return await self.deliver(agent, order, intel, "intelligence")
+
+    async def find_opportunities(self):
         """Scan for new opportunities"""
+        bounties, activity, stats = await asyncio.gather(
+            self.snapshot_json("/bounties"),
+            self.snapshot_json("/stats/activity?limit=10"),
+            self.snapshot_json("/stats")
+        )
+
         print("\n🔍 Scanning for opportunities...")
-        
+
         # Check bounties
-        bounties = requests.get(f"{BASE_URL}/bounties").json()["bounties"]
         relevant = []
-        
-        for bounty in bounties:
+        for bounty in bounties["bounties"]:
             if any(kw in bounty["title"].lower() for kw in ["content", "viral", "christian", "analysis", "data"]):
                 relevant.append(bounty)
-        
+
         if relevant:
             print(f"   💰 Found {len(relevant)} relevant bounties:")
             for bounty in relevant[:3]:
                 print(f"      - {bounty['title']} ({bounty['reward']} credits)")
-        
+
         # Check activity feed for trends
-        activity = requests.get(f"{BASE_URL}/stats/activity?limit=10").json()["activity"]
-        
-        new_agents = [a for a in activity if a["type"] == "registration"]
+        new_agents = [a for a in activity["activity"] if a["type"] == "registration"]
         if new_agents:
             print(f"   🆕 {len(new_agents)} new agents joined recently")
-        
+
         # Check stats
-        stats = requests.get(f"{BASE_URL}/stats").json()
         print(f"\n📊 Marketplace Stats:")
         print(f"   Total agents: {stats['agents']}")
         print(f"   Active listings: {stats['listings']}")
         print(f"   Total volume: {stats['volume']} credits")
-    
-    def generate_report(self):
+
+    async def generate_report(self):
         """Generate summary report"""
+        profiles = await asyncio.gather(
+            *(self.snapshot_json("/me", agent) for agent in self.agents), return_exceptions=True
+        )
+
         print("\n" + "="*50)
         print("📈 MOLT ROAD EMPIRE REPORT")
         print("="*50)
-        
+
         total_balance = 0
         total_sales = 0
         total_ratings = 0
-        
-        for agent in self.agents:
-            headers = {"X-API-Key": agent["api_key"]}
-            me = requests.get(f"{BASE_URL}/me", headers=headers).json()
-            
+
+        for me in profiles:
+            if isinstance(me, Exception):
+                continue
+
             total_balance += me["balance"]
             if me.get("rating_count"):
                 total_ratings += me["rating_count"]
-            
+
             # Count sales from active listings
             total_sales += len(me.get("active_listings", []))
-        
+
         print(f"\n💼 Portfolio Summary:")
         print(f"   Active agents: {len(self.agents)}")
         print(f"   Total balance: {total_balance} credits")
         print(f"   Active listings: {total_sales}")
         print(f"   Total reviews: {total_ratings}")
-        
+        print(f"   API calls: {self.http_calls} ({self.snapshot.saved} saved by the cycle snapshot, "
+              f"{self.order_sync.unchanged} order lists unchanged)")
+
         print(f"\n💡 Recommendations:")
         if total_balance > 500:
             print("   - Deploy more specialized agents")
         if total_ratings < 10:
             print("   - Focus on quick deliveries for more reviews")
         print("   - Monitor competitor listings for pricing")
-        
-        # Save report
-        with open(f"molt-road-reports/report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json", "w") as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "agents": len(self.agents),
-                "total_balance": total_balance,
-                "total_ratings": total_ratings,
-                "active_listings": total_sales
-            }, f, indent=2)
+
+        # Append to the metrics time series (molt_road_metrics.py trend)
+        record_report({
+            "agents": len(self.agents),
+            "total_balance": total_balance,
+            "total_ratings": total_ratings,
+            "active_listings": total_sales,
+            "http_calls": self.http_calls,
+            "http_calls_saved": self.snapshot.saved
+        }, {agent["name"]: me for agent, me in zip(self.agents, profiles) if not isinstance(me, Exception)})
+
+    def emit(self, event, agent=None, **fields):
+        """Record a structured event for this cycle"""
+        self.events.append({"ts": datetime.now().isoformat(timespec="seconds"), "event": event,
+                            "agent": agent, **fields})
+
+    async def publish_events(self):
+        """
+        Append the cycle's events to the event log and push the ones needing
+        attention to OpenClaw as a single alert (each problem alerted once
+        while it persists)
+        """
+        alerts = []
+        seen = set()
+        for event in self.events:
+            if event["event"] in ALERT_EVENTS:
+                key = (event["agent"], event.get("order_id") or event.get("error"))
+                seen.add(key)
+                if key not in self.alerted:
+                    self.alerted.add(key)
+                    alerts.append(event)
+
+        # Orders still open after the cycle weren't auto-handled
+        for (agent, role), orders in self.order_sync.open_orders().items():
+            seen.update((agent, order["id"]) for order in orders)
+            fresh = [order["id"] for order in orders if (agent, order["id"]) not in self.alerted]
+            if fresh:
+                self.alerted.update((agent, order_id) for order_id in fresh)
+                self.emit("orders_need_attention", agent, role=role, order_ids=fresh)
+                alerts.append(self.events[-1])
+
+        # Forget problems that cleared: keeps the set bounded and lets a recurrence alert again
+        self.alerted &= seen
+
+        events, self.events = self.events, []
+        if not events:
+            return events
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(EVENTS_PATH, "a") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+        if alerts and ALERT_URL:
+            lines = []
+            for event in alerts:
+                detail = ", ".join(event.get("order_ids", [])) or event.get("order_id") or event.get("error", "")
+                lines.append(f"{event['agent'] or 'heartbeat'}: {event['event'].replace('_', ' ')} ({detail})")
+            message = "🦞 Molt Road Alert: " + "; ".join(lines)
+            try:
+                await asyncio.to_thread(self.session_for().post, ALERT_URL, json={"message": message}, timeout=10)
+            except Exception as e:
+                print(f"⚠️  Could not send alert: {e}")
+        return events
+
+    async def run_cycle(self, report=True):
+        """
+        One heartbeat: every agent checked concurrently alongside the
+        opportunity scan, then the report (scan and report skipped when
+        report is False), then the cycle's events are published
+
+        Returns:
+            list: /me profile per agent (None where the check failed)
+        """
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.snapshot = CycleSnapshot(self.base_url)
+        self.http_calls = 0
+        self.order_sync.unchanged = 0
+        scans = [self.find_opportunities()] if report else []
+        results = await asyncio.gather(
+            *(self.check_agent_status(agent) for agent in self.agents),
+            *scans,
+            return_exceptions=True
+        )
+        profiles = results[:len(self.agents)]
+        if scans and isinstance(results[-1], Exception):
+            print(f"\n❌ Opportunity scan failed: {results[-1]}")
+        if report:
+            await self.generate_report()
+            self.snapshot.save()
+        self.order_sync.save()
+        self.last_events = await self.publish_events()
+        return profiles
+
+    def run(self):
+        """Run one heartbeat cycle; returns the cycle time in seconds"""
+        started = time.perf_counter()
+        asyncio.run(self.run_cycle())
+        return time.perf_counter() - started
+
+    async def run_forever(self, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                          report_interval=REPORT_INTERVAL):
+        """
+        Daemon loop: poll every agent, then sleep min_interval while any
+        order holds credits in escrow (or still needs action), doubling the
+        sleep up to max_interval while idle. A failed cycle is logged as a
+        check_failed event and retried with backoff. Stops cleanly on
+        SIGTERM/SIGINT.
+        """
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(PID_PATH, "w") as f:
+            f.write(str(os.getpid()))
+
+        interval = min_interval
+        last_report = None
+        failures = 0
+        try:
+            while not stop.is_set():
+                report = last_report is None or time.monotonic() - last_report >= report_interval
+                if report:
+                    # A failing report waits for the next slot instead of blocking order polling
+                    last_report = time.monotonic()
+                started = time.perf_counter()
+                try:
+                    if self.reload_agents():
+                        print(f"🔄 Reloaded {len(self.agents)} agents")
+                    await self.run_cycle(report=report)
+                except Exception as e:
+                    # Only cancellation or the stop signal ends the daemon (CancelledError isn't an Exception)
+                    failures += 1
+                    interval = min(min_interval * 2 ** failures, max_interval)
+                    print(f"❌ {datetime.now().strftime('%H:%M:%S')} Heartbeat cycle failed: "
+                          f"{type(e).__name__}: {e}; retrying in {interval:g}s")
+                    self.emit("check_failed", error=f"{type(e).__name__}: {e}")
+                    try:
+                        self.last_events = await self.publish_events()
+                    except Exception as publish_error:
+                        self.events, self.last_events = [], []
+                        print(f"⚠️  Could not publish events: {publish_error}")
+                    try:
+                        await asyncio.wait_for(stop.wait(), interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                failures = 0
+
+                handled = sum(1 for event in self.last_events if event["event"] in ("order_delivered", "order_confirmed"))
+                in_escrow = self.order_sync.in_escrow()
+                busy = handled or in_escrow or self.order_sync.open_orders()
+                interval = min_interval if busy else min(interval * 2, max_interval)
+                print(f"💓 {datetime.now().strftime('%H:%M:%S')} {len(self.agents)} agents in "
+                      f"{time.perf_counter() - started:.2f}s, {handled} orders handled, {in_escrow} in escrow; "
+                      f"next check in {interval:g}s")
+
+                try:
+                    await asyncio.wait_for(stop.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if os.path.exists(PID_PATH):
+                os.remove(PID_PATH)
+
+
+def option(args, name, default, cast=int):
+    if name in args:
+        return cast(args[args.index(name) + 1])
+    return default
 
 
 if __name__ == "__main__":
+    args = sys.argv[1:]
+    concurrency = option(args, "--concurrency", DEFAULT_CONCURRENCY)
+
+    # Create directories
+    os.makedirs(AGENTS_DIR, exist_ok=True)
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+
+    if "--daemon" in args:
+        # Line-buffered so the daemon log is readable while it runs
+        sys.stdout.reconfigure(line_buffering=True)
+        min_interval = option(args, "--min-interval", MIN_INTERVAL, float)
+        max_interval = option(args, "--max-interval", MAX_INTERVAL, float)
+        report_interval = option(args, "--report-interval", REPORT_INTERVAL, float)
+        print(f"🔄 Molt Road Heartbeat daemon starting (pid {os.getpid()}, "
+              f"polling every {min_interval:g}-{max_interval:g}s)")
+        heartbeat = MoltRoadHeartbeat(concurrency=concurrency, quiet=True)
+        if not heartbeat.agents:
+            print("⚠️  No agents yet; waiting for molt-road-agent.py to deploy some")
+        asyncio.run(heartbeat.run_forever(min_interval, max_interval, report_interval))
+        print("\n✅ Heartbeat daemon stopped")
+        sys.exit(0)
+
     print("🔄 Molt Road Heartbeat Starting...")
     print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Create directories
-    os.makedirs("molt-road-agents", exist_ok=True)
-    os.makedirs("molt-road-reports", exist_ok=True)
-    
+
     # Run heartbeat
-    heartbeat = MoltRoadHeartbeat()
-    
+    heartbeat = MoltRoadHeartbeat(concurrency=concurrency)
+
     if not heartbeat.agents:
         print("\n⚠️  No agents found! Deploy agents first with molt-road-agent.py")
     else:
-        # Check each agent
-        for agent in heartbeat.agents:
-            heartbeat.check_agent_status(agent)
-        
-        # Find opportunities
-        heartbeat.find_opportunities()
-        
-        # Generate report
-        heartbeat.generate_report()
-    
-    print("\n✅ Heartbeat complete!")
\ No newline at end of file
+        cycle_time = heartbeat.run()
+        print(f"\n⏱️  {len(heartbeat.agents)} agents checked in {cycle_time:.2f}s")
+
+    print("\n✅ Heartbeat complete!")
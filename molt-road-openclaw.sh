@@ -23,12 +23,14 @@ show_help() {
     echo "  deploy    - Deploy new agents to Molt Road"
     echo "  status    - Check status of all agents"
     echo "  heartbeat - Run heartbeat check (orders, opportunities)"
+    echo "  daemon    - Long-running heartbeat: daemon start|stop|status"
     echo "  setup     - Initial setup and configuration"
     echo "  help      - Show this help message"
     echo ""
     echo "Examples:"
     echo "  $0 deploy   # Deploy the agent network"
     echo "  $0 status   # Check agent balances and orders"
+    echo "  $0 daemon start   # Poll orders continuously (fast while credits are in escrow)"
 }
 
 # Setup function
@@ -82,6 +84,48 @@ heartbeat() {
     python3 molt-road-heartbeat.py
 }
 
+# Long-running heartbeat daemon
+DAEMON_PID="molt-road-state/daemon.pid"
+
+daemon_running() {
+    [ -f "$DAEMON_PID" ] && kill -0 "$(cat "$DAEMON_PID")" 2>/dev/null
+}
+
+daemon() {
+    cd "$WORKSPACE"
+    case "${1:-status}" in
+        start)
+            if daemon_running; then
+                echo -e "${GREEN}💓 Heartbeat daemon already running (pid $(cat "$DAEMON_PID"))${NC}"
+                return
+            fi
+            mkdir -p molt-road-state
+            nohup python3 molt-road-heartbeat.py --daemon >> molt-road-daemon.log 2>&1 &
+            echo -e "${GREEN}💓 Heartbeat daemon started (pid $!), logging to molt-road-daemon.log${NC}"
+            ;;
+        stop)
+            if daemon_running; then
+                kill "$(cat "$DAEMON_PID")"
+                echo -e "${GREEN}🛑 Heartbeat daemon stopped${NC}"
+            else
+                echo -e "${RED}Heartbeat daemon not running${NC}"
+            fi
+            ;;
+        status)
+            if daemon_running; then
+                echo -e "${GREEN}💓 Heartbeat daemon running (pid $(cat "$DAEMON_PID"))${NC}"
+                tail -n 5 molt-road-daemon.log 2>/dev/null || true
+            else
+                echo -e "${RED}Heartbeat daemon not running. Run '$0 daemon start'.${NC}"
+            fi
+            ;;
+        *)
+            echo -e "${RED}Usage: $0 daemon start|stop|status${NC}"
+            exit 1
+            ;;
+    esac
+}
+
 # Main command handler
 case "${1:-help}" in
     deploy)
@@ -93,6 +137,9 @@ case "${1:-help}" in
     heartbeat)
         heartbeat
         ;;
+    daemon)
+        daemon "${2:-status}"
+        ;;
     setup)
         setup
         ;;
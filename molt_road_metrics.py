@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Molt Road Metrics
+Append-only SQLite time series of heartbeat reports: one row per run with
+the portfolio totals, one row per agent per run, and hourly/daily rollups
+(count, sum, min, max, last) maintained as each run is appended, so trend
+queries over years of 4-hourly runs read a few hundred rollup rows instead
+of every report.
+
+Buckets are UTC hours and days.
+
+Usage:
+  python molt_road_metrics.py trend [--agent NAME] [--by run|hour|day] [--since 90d|YYYY-MM-DD] [--until DATE]
+  python molt_road_metrics.py agents
+  python molt_road_metrics.py import [molt-road-reports/]
+
+Example:
+  python molt_road_metrics.py trend --agent HookDealer47 --since 90d
+"""
+
+import os
+import sys
+import glob
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+DEFAULT_METRICS_PATH = os.path.join("molt-road-reports", "metrics.db")
+
+HOUR = 3600
+DAY = 86400
+PERIODS = {"hour": HOUR, "day": DAY}
+
+# Agent name under which portfolio totals are rolled up
+TOTAL = "*"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    ts INTEGER PRIMARY KEY,
+    agents INTEGER,
+    total_balance REAL,
+    total_ratings INTEGER,
+    active_listings INTEGER,
+    http_calls INTEGER,
+    http_calls_saved INTEGER
+);
+CREATE TABLE IF NOT EXISTS samples (
+    agent TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    balance REAL,
+    rating REAL,
+    rating_count INTEGER,
+    active_listings INTEGER,
+    PRIMARY KEY (agent, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    period INTEGER NOT NULL,
+    agent TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    samples INTEGER,
+    balance_sum REAL,
+    balance_min REAL,
+    balance_max REAL,
+    balance_last REAL,
+    ratings_last INTEGER,
+    listings_last INTEGER,
+    last_ts INTEGER,
+    PRIMARY KEY (period, agent, bucket)
+) WITHOUT ROWID;
+"""
+
+# 'last' columns only move forward in time, so backfilled runs can't overwrite newer ones
+ROLLUP_UPSERT = """
+INSERT INTO rollups VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (period, agent, bucket) DO UPDATE SET
+    samples = samples + 1,
+    balance_sum = balance_sum + excluded.balance_sum,
+    balance_min = MIN(balance_min, excluded.balance_min),
+    balance_max = MAX(balance_max, excluded.balance_max),
+    balance_last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.balance_last ELSE balance_last END,
+    ratings_last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.ratings_last ELSE ratings_last END,
+    listings_last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.listings_last ELSE listings_last END,
+    last_ts = MAX(last_ts, excluded.last_ts)
+"""
+
+
+class MetricsStore:
+    def __init__(self, path=DEFAULT_METRICS_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def _rollup(self, agent, ts, balance, ratings, listings):
+        for period in PERIODS.values():
+            self.db.execute(ROLLUP_UPSERT, (period, agent, ts - ts % period,
+                                            balance, balance, balance, balance, ratings, listings, ts))
+
+    def record(self, totals, profiles=None, ts=None):
+        """
+        Append one heartbeat run
+
+        Args:
+            totals (dict): Report totals (agents, total_balance, total_ratings,
+                active_listings, http_calls, http_calls_saved)
+            profiles (dict): Agent name -> /me profile
+            ts (int): Unix time of the run (default: now)
+
+        Returns:
+            bool: False if a run was already recorded at that second
+        """
+        ts = int(ts if ts is not None else time.time())
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ts, totals.get("agents"), totals.get("total_balance"), totals.get("total_ratings"),
+                 totals.get("active_listings"), totals.get("http_calls"), totals.get("http_calls_saved"))
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._rollup(TOTAL, ts, totals.get("total_balance") or 0,
+                         totals.get("total_ratings") or 0, totals.get("active_listings") or 0)
+
+            for name, me in (profiles or {}).items():
+                listings = len(me.get("active_listings", []))
+                self.db.execute(
+                    "INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, ts, me["balance"], me.get("rating"), me.get("rating_count") or 0, listings)
+                )
+                self._rollup(name, ts, me["balance"], me.get("rating_count") or 0, listings)
+        return True
+
+    def import_reports(self, directory="molt-road-reports"):
+        """Backfill from the report-*.json files written before the store existed"""
+        added = 0
+        for path in sorted(glob.glob(os.path.join(directory, "report-*.json"))):
+            try:
+                with open(path, "r") as f:
+                    report = json.load(f)
+                ts = datetime.fromisoformat(report["timestamp"]).timestamp()
+            except (OSError, ValueError, KeyError):
+                continue
+            if self.record(report, ts=ts):
+                added += 1
+        return added
+
+    def trend(self, agent=None, by="day", since=None, until=None):
+        """
+        Balance trend as [(bucket start, samples, average, min, max, last,
+        reviews, listings)], oldest first; by='run' returns raw runs
+        """
+        agent = agent or TOTAL
+        since = since or 0
+        until = until or 2 ** 62
+        if by == "run":
+            if agent == TOTAL:
+                sql = ("SELECT ts, 1, total_balance, total_balance, total_balance, total_balance, total_ratings, "
+                       "active_listings FROM runs WHERE ts >= ? AND ts < ? ORDER BY ts")
+                return self.db.execute(sql, (since, until)).fetchall()
+            sql = ("SELECT ts, 1, balance, balance, balance, balance, rating_count, active_listings "
+                   "FROM samples WHERE agent = ? AND ts >= ? AND ts < ? ORDER BY ts")
+            return self.db.execute(sql, (agent, since, until)).fetchall()
+
+        period = PERIODS[by]
+        sql = ("SELECT bucket, samples, balance_sum / samples, balance_min, balance_max, balance_last, "
+               "ratings_last, listings_last FROM rollups "
+               "WHERE period = ? AND agent = ? AND bucket >= ? AND bucket < ? ORDER BY bucket")
+        return self.db.execute(sql, (period, agent, since - since % period, until)).fetchall()
+
+    def agents(self):
+        """(agent, runs, first ts, last ts) for every agent with samples"""
+        return self.db.execute(
+            "SELECT agent, SUM(samples), MIN(bucket), MAX(last_ts) FROM rollups "
+            "WHERE period = ? AND agent != ? GROUP BY agent ORDER BY agent", (DAY, TOTAL)
+        ).fetchall()
+
+    def close(self):
+        self.db.close()
+
+
+def record_report(totals, profiles=None):
+    """Heartbeat hook: append a run, never failing the heartbeat"""
+    try:
+        store = MetricsStore()
+        store.record(totals, profiles)
+        store.close()
+    except Exception as e:
+        print(f"⚠️  Could not update metrics store: {e}")
+
+
+def parse_time(value):
+    """'90d' (days ago) or an ISO date, as unix seconds"""
+    if value is None:
+        return None
+    if value.endswith("d") and value[:-1].isdigit():
+        return int(time.time()) - int(value[:-1]) * DAY
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def label(ts, by):
+    moment = datetime.fromtimestamp(ts, timezone.utc)
+    return moment.strftime("%Y-%m-%d" if by == "day" else "%Y-%m-%d %H:%M")
+
+
+def option(args, name, default=None, cast=str):
+    if name in args:
+        return cast(args[args.index(name) + 1])
+    return default
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("trend", "agents", "import"):
+        print(__doc__.strip())
+        return
+
+    args = sys.argv[2:]
+    store = MetricsStore(option(args, "--db", DEFAULT_METRICS_PATH))
+
+    if sys.argv[1] == "import":
+        directory = args[0] if args and not args[0].startswith("--") else "molt-road-reports"
+        print(f"📥 Imported {store.import_reports(directory)} reports from {directory}/")
+        return
+
+    if sys.argv[1] == "agents":
+        for agent, runs, first, last in store.agents():
+            print(f"  {agent:<28} {runs:>6} runs  {label(first, 'day')} → {label(last, 'day')}")
+        return
+
+    agent = option(args, "--agent")
+    by = option(args, "--by", "day")
+    if by not in ("run", "hour", "day"):
+        print("--by must be run, hour or day")
+        return
+    started = time.perf_counter()
+    rows = store.trend(agent, by, parse_time(option(args, "--since")), parse_time(option(args, "--until")))
+    elapsed = time.perf_counter() - started
+
+    print(f"📈 Balance by {by} for {agent or 'all agents'} ({len(rows)} rows, {elapsed * 1000:.1f}ms)")
+    peak = max((row[4] for row in rows), default=0) or 1
+    for bucket, samples, average, low, high, last, reviews, listings in rows:
+        bar = "█" * max(0, round(average / peak * 30))
+        spread = f"  {low:g}–{high:g}" if high != low else ""
+        print(f"  {label(bucket, by)}  {average:9.1f}  {bar:<30}{spread}  reviews {reviews}  listings {listings}")
+
+
+if __name__ == "__main__":
+    main()
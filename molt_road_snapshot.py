@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Molt Road Cycle Snapshot
+Read-only endpoint responses (/me, /bounties, /stats/activity, /stats,
+/listings) memoized for one heartbeat cycle, so every consumer in the cycle
+shares one HTTP call per endpoint (and per agent for /me). Concurrent
+readers of a response still in flight wait for it rather than fetching it
+again.
+
+The heartbeat saves its snapshot at the end of the cycle; molt-road-agent.py's
+marketplace scan reuses it while it is recent instead of refetching.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+SNAPSHOT_PATH = os.path.join("molt-road-reports", "last-snapshot.json")
+
+# How long a saved snapshot stays usable by other scripts
+SNAPSHOT_MAX_AGE = 15 * 60
+
+
+class CycleSnapshot:
+    def __init__(self, base_url, taken_at=None, responses=None):
+        self.base_url = base_url
+        self.taken_at = taken_at or time.time()
+        self.responses = responses or {}
+        self.calls = 0
+        self.saved = 0
+        self._pending = {}
+
+    @staticmethod
+    def key(path, agent=None):
+        return f"{agent}:{path}" if agent else path
+
+    async def get(self, path, load, agent=None):
+        """
+        Response for path (per agent name if given), calling the coroutine
+        function load only the first time in the cycle
+        """
+        key = self.key(path, agent)
+        if key in self.responses:
+            self.saved += 1
+            return self.responses[key]
+        if key in self._pending:
+            self.saved += 1
+            return await asyncio.shield(self._pending[key])
+
+        task = asyncio.ensure_future(load())
+        self._pending[key] = task
+        try:
+            value = await task
+        finally:
+            del self._pending[key]
+        self.calls += 1
+        self.responses[key] = value
+        return value
+
+    def get_sync(self, path, load, agent=None):
+        """Blocking counterpart of get() for synchronous callers"""
+        key = self.key(path, agent)
+        if key in self.responses:
+            self.saved += 1
+            return self.responses[key]
+        value = self.responses[key] = load()
+        self.calls += 1
+        return value
+
+    def stats(self):
+        return {"snapshot_fetches": self.calls, "http_calls_saved": self.saved}
+
+    def save(self, path=SNAPSHOT_PATH):
+        """Write the public responses (agent profiles stay in memory) for reuse by other scripts"""
+        public = {key: value for key, value in self.responses.items() if key.startswith("/")}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"base_url": self.base_url, "taken_at": self.taken_at, "responses": public}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_recent(cls, base_url, path=SNAPSHOT_PATH, max_age=SNAPSHOT_MAX_AGE):
+        """The last saved snapshot for base_url if younger than max_age, else an empty one"""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(base_url)
+        if data.get("base_url") != base_url or time.time() - data.get("taken_at", 0) > max_age:
+            return cls(base_url)
+        return cls(base_url, data["taken_at"], data.get("responses"))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Molt Road Order Sync
+Persisted per-agent sync state for the seller and buyer order feeds, so a
+heartbeat only acts on orders that are new or changed since the last one:
+
+- order lists are fetched with If-None-Match / If-Modified-Since from the
+  last ETag / Last-Modified, so an unchanged feed is a bodiless 304
+- when the API sends updated_at, orders older than the feed's cursor
+  (newest updated_at seen) are skipped; without it (created_at alone says
+  nothing about status changes) every order not yet done is re-evaluated
+- orders still needing action are kept as a compact open set, retried
+  from state when the feed is unchanged; open and escrow state is rebuilt
+  from every full listing, so orders that drop out of it are forgotten
+- delivered and confirmed order IDs are remembered across runs and never
+  acted on twice
+- orders with credits still in escrow (escrowed or delivered, on either
+  side) are tracked so a polling daemon knows when to check more often
+"""
+
+import json
+import os
+
+SYNC_PATH = os.path.join("molt-road-state", "order-sync.json")
+
+# Delivered/confirmed order IDs remembered per feed
+DONE_HISTORY = 500
+
+# Status that needs action on each side of an order
+ACTIONABLE = {"seller": "escrowed", "buyer": "delivered"}
+
+# Statuses with credits held in escrow, whoever has to act next
+IN_ESCROW = ("escrowed", "delivered")
+
+
+def order_stamp(order):
+    """Last-change timestamp of an order ('' if the API doesn't send updated_at)"""
+    return str(order.get("updated_at") or "")
+
+
+def compact(order):
+    """The fields the heartbeat acts on; delivery data itself isn't kept"""
+    return {
+        "id": order["id"],
+        "status": order["status"],
+        "listing": {"title": order.get("listing", {}).get("title", "")},
+        "delivery_data": bool(order.get("delivery_data")) or None
+    }
+
+
+class OrderSync:
+    def __init__(self, path=SYNC_PATH):
+        self.path = path
+        try:
+            with open(path, "r") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+        self.unchanged = 0
+
+    def feed(self, agent_name, role):
+        feed = self.state.setdefault(agent_name, {}).setdefault(role, {
+            "etag": None, "last_modified": None, "cursor": "", "open": {}, "done": []
+        })
+        feed.setdefault("escrow", [])
+        return feed
+
+    def request_headers(self, agent_name, role):
+        """Conditional request headers for an agent's order list"""
+        feed = self.feed(agent_name, role)
+        headers = {}
+        if feed["etag"]:
+            headers["If-None-Match"] = feed["etag"]
+        if feed["last_modified"]:
+            headers["If-Modified-Since"] = feed["last_modified"]
+        return headers
+
+    def merge(self, agent_name, role, response):
+        """
+        Fold an /orders response into the feed's state
+
+        Returns:
+            list: Open orders that still need action (new, changed or retried)
+        """
+        feed = self.feed(agent_name, role)
+        if response.status_code == 304:
+            self.unchanged += 1
+            return list(feed["open"].values())
+        response.raise_for_status()
+
+        feed["etag"] = response.headers.get("ETag")
+        feed["last_modified"] = response.headers.get("Last-Modified")
+        orders = response.json()["orders"]
+        # A full listing: orders missing from it are gone, whatever state we kept for them
+        present = {order["id"] for order in orders}
+        done = set(feed["done"])
+        escrow = set(feed["escrow"]) & present
+        feed["open"] = {order_id: order for order_id, order in feed["open"].items() if order_id in present}
+        cursor = newest = feed["cursor"]
+        for order in orders:
+            stamp = order_stamp(order)
+            # Unchanged since an earlier sync folded it in; unstamped orders are always re-checked
+            if stamp and stamp < cursor:
+                continue
+            newest = max(newest, stamp)
+            if order["status"] in IN_ESCROW:
+                escrow.add(order["id"])
+            else:
+                escrow.discard(order["id"])
+            if order["id"] in done:
+                continue
+            if order["status"] == ACTIONABLE[role]:
+                feed["open"][order["id"]] = compact(order)
+            else:
+                feed["open"].pop(order["id"], None)
+        feed["cursor"] = newest
+        feed["escrow"] = sorted(escrow)
+        return list(feed["open"].values())
+
+    def mark_done(self, agent_name, role, order_id):
+        """Record a successful delivery/confirmation so it's never repeated"""
+        feed = self.feed(agent_name, role)
+        feed["open"].pop(order_id, None)
+        if order_id not in feed["done"]:
+            feed["done"].append(order_id)
+            del feed["done"][:-DONE_HISTORY]
+        if role == "buyer" and order_id in feed["escrow"]:
+            # Confirming releases the escrow; a delivery leaves it held until the buyer confirms
+            feed["escrow"].remove(order_id)
+
+    def open_orders(self, agent_name=None):
+        """{(agent, role): [open orders]} still needing action, for every agent or one"""
+        return {(name, role): list(feed["open"].values())
+                for name, feeds in self.state.items() if agent_name in (None, name)
+                for role, feed in feeds.items() if feed["open"]}
+
+    def in_escrow(self):
+        """Orders known to hold credits in escrow across all agents"""
+        return sum(len(feed.get("escrow", [])) for feeds in self.state.values() for feed in feeds.values())
+
+    def save(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Nitter Mirror Pool
+Health-scored nitter instances for X extraction. Tracks success rate and
+latency per mirror in a persisted health file, tries the best mirrors
+first (optionally racing the top ones), and opens a circuit breaker on
+mirrors that keep failing so they're skipped for a cooldown.
+
+Usage:
+  python nitter_pool.py status
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+DEFAULT_INSTANCES = [
+    'nitter.privacydev.net',
+    'nitter.poast.org',
+    'nitter.adminforge.de',
+]
+
+HEALTH_FILE = os.path.join('intel', 'cache', 'nitter-health.json')
+
+# Consecutive failures that open a mirror's circuit, and how long it stays open
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 15 * 60
+
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.3
+
+
+class NitterMirrorPool:
+    def __init__(self, instances=None, health_file=HEALTH_FILE,
+                 failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.instances = list(instances or DEFAULT_INSTANCES)
+        self.health_file = health_file
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.health = self.load_health()
+
+    def load_health(self):
+        """Per-instance stats from the health file (missing file = no history)"""
+        try:
+            with open(self.health_file, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+
+        return {instance: {
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'latency': None,
+            'open_until': 0,
+            'last_success': None,
+            **saved.get(instance, {})
+        } for instance in self.instances}
+
+    def save_health(self):
+        with self.save_lock:
+            with self.lock:
+                snapshot = json.dumps(self.health, indent=2)
+            if os.path.dirname(self.health_file):
+                os.makedirs(os.path.dirname(self.health_file), exist_ok=True)
+            tmp_file = f"{self.health_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.health_file)
+
+    def score(self, instance):
+        """Higher is better: smoothed success rate discounted by average latency"""
+        stats = self.health[instance]
+        success_rate = (stats['successes'] + 1) / (stats['successes'] + stats['failures'] + 2)
+        latency = stats['latency'] if stats['latency'] is not None else 1.0
+        return success_rate / (1 + latency)
+
+    def is_open(self, instance, now=None):
+        """Circuit open: too many recent failures and still cooling down"""
+        return self.health[instance]['open_until'] > (now or time.time())
+
+    def ranked(self):
+        """
+        Mirrors to try, best first; open circuits are left out, except that
+        when every circuit is open the one opened longest ago is probed
+        (half-open), since nitter outages are usually partial and short
+        """
+        now = time.time()
+        available = [i for i in self.instances if not self.is_open(i, now)]
+        if not available and self.instances:
+            return [min(self.instances, key=lambda i: self.health[i]['open_until'])]
+        return sorted(available, key=self.score, reverse=True)
+
+    def record_success(self, instance, latency):
+        with self.lock:
+            stats = self.health[instance]
+            stats['successes'] += 1
+            stats['consecutive_failures'] = 0
+            stats['open_until'] = 0
+            stats['last_success'] = time.time()
+            if stats['latency'] is None:
+                stats['latency'] = latency
+            else:
+                stats['latency'] = LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * stats['latency']
+
+    def record_failure(self, instance):
+        with self.lock:
+            stats = self.health[instance]
+            stats['failures'] += 1
+            stats['consecutive_failures'] += 1
+            # A half-open mirror that fails again goes straight back to cooldown
+            if stats['consecutive_failures'] >= self.failure_threshold:
+                stats['open_until'] = time.time() + self.cooldown
+
+    def _attempt(self, fetch, instance, decided=None):
+        """
+        Run fetch(instance), recording the outcome; returns the result or None.
+        Nothing is recorded if the decided event was set meanwhile (a race
+        already won by another mirror).
+        """
+        started = time.perf_counter()
+        try:
+            result = fetch(instance)
+        except Exception as e:
+            if not (decided and decided.is_set()):
+                print(f"Failed with {instance}: {e}")
+            result = None
+
+        if decided and decided.is_set():
+            return result
+        if result:
+            self.record_success(instance, time.perf_counter() - started)
+        else:
+            self.record_failure(instance)
+        return result
+
+    def fetch(self, fetch, race=2):
+        """
+        Get a result from the healthiest mirror that returns one
+
+        Args:
+            fetch (callable): fetch(instance) -> result, or None/raise on failure
+            race (int): Number of top-ranked mirrors to query concurrently
+                before falling back to the rest one at a time
+
+        Returns:
+            tuple: (result, instance), or (None, None) if every mirror failed
+        """
+        candidates = self.ranked()
+        leaders, rest = candidates[:max(1, race)], candidates[max(1, race):]
+
+        try:
+            if len(leaders) > 1:
+                decided = threading.Event()
+                pool = ThreadPoolExecutor(max_workers=len(leaders))
+                futures = {pool.submit(self._attempt, fetch, instance, decided): instance for instance in leaders}
+                # Losers still running when a winner returns finish in the background, unrecorded
+                pool.shutdown(wait=False)
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        instance = futures.pop(future)
+                        result = future.result()
+                        if result:
+                            decided.set()
+                            return result, instance
+            else:
+                rest = leaders + rest
+
+            for instance in rest:
+                result = self._attempt(fetch, instance)
+                if result:
+                    return result, instance
+            return None, None
+        finally:
+            self.save_health()
+
+    def status(self):
+        """Rows of (instance, score, stats) for display, best first"""
+        return [(instance, self.score(instance), self.health[instance])
+                for instance in sorted(self.instances, key=self.score, reverse=True)]
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'status':
+        print(__doc__.strip())
+        return
+
+    pool = NitterMirrorPool()
+    now = time.time()
+    print("🪞 Nitter mirror health")
+    for instance, score, stats in pool.status():
+        latency = f"{stats['latency']:.2f}s" if stats['latency'] is not None else "n/a"
+        state = f"OPEN {int(stats['open_until'] - now)}s" if pool.is_open(instance, now) else "ok"
+        print(f"  {instance:<28} score {score:.3f}  "
+              f"{stats['successes']}✓ {stats['failures']}✗  latency {latency}  {state}")
+
+
+if __name__ == '__main__':
+    main()
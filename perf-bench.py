@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks
+Timing harnesses for the scrapers and pipeline, run against a local stub
+HTTP server so no API credits are spent
+
+Usage:
+  python perf-bench.py tinyfish-batch [--urls N] [--concurrency N] [--delay SECONDS]
+  python perf-bench.py transport [--requests N]
+  python perf-bench.py scoring [--docs N]
+  python perf-bench.py coldstart [--runs N] [--tokenizer auto|nltk|regex]
+  python perf-bench.py draft [--words N] [--edits N]
+  python perf-bench.py kjv [--store data/kjv.bin] [--lookups N]
+  python perf-bench.py heartbeat [--agents N] [--orders N] [--history N] [--cycles N] [--delay SECONDS] [--concurrency N]
+  python perf-bench.py metrics [--years N] [--agents N]
+  python perf-bench.py daemon [--duration SECONDS] [--orders N] [--cron-interval SECONDS]
+                              [--min-interval SECONDS] [--max-interval SECONDS]
+"""
+
+import io
+import os
+import sys
+import glob
+import json
+import random
+import subprocess
+import time
+import tempfile
+import threading
+import contextlib
+import importlib.util
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STUB_HTML = (
+    "<html><head><title>Stub Article</title><style>p {color: red}</style></head><body>"
+    "<script>var tracking = 1;</script><article>"
+    + "<p>My father was never there. I fought the battle alone and found grace.</p>" * 50
+    + "</article></body></html>"
+)
+
+
+def load_script(filename):
+    """Import one of the hyphenated CLI scripts as a module"""
+    name = os.path.splitext(os.path.basename(filename))[0].replace('-', '_')
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubAPIServer:
+    """Threaded local HTTP server that answers every request with canned JSON"""
+
+    def __init__(self, delay=0.05, body=None):
+        self.delay = delay
+        self.body = json.dumps(body or {"text": STUB_HTML}).encode()
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Buffer header + body into one write; unbuffered writes stall keep-alive on delayed ACKs
+            wbufsize = -1
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                with stub.lock:
+                    stub.requests += 1
+                time.sleep(stub.delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            do_GET = respond
+            do_POST = respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeMoltRoad:
+    """
+    Stateful local fake of the Molt Road /api/v1 endpoints the heartbeat
+    uses: per-key profiles and orders, deliver/confirm transitions,
+    bounties, activity and stats, with a fixed latency per request
+    """
+
+    def __init__(self, agents=3, seller_orders=4, buyer_orders=2, history=0, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.alerts = []
+        self.created = {}
+        self.delivered = {}
+        self.keys = [f"fake-key-{i}" for i in range(agents)]
+        self.profiles = {key: {"name": f"FakeAgent{i}", "balance": 100 + i, "rating": 4.5, "rating_count": i,
+                               "active_listings": [{"id": f"l{i}"}]} for i, key in enumerate(self.keys)}
+        titles = ["Viral Content Analysis", "Father Wound Hook Pack", "Gumroad Intelligence Report"]
+        self.orders = {}
+        for i, key in enumerate(self.keys):
+            buyer = self.keys[(i + 1) % len(self.keys)]
+            for j in range(seller_orders):
+                self.add_order(key, buyer, titles[j % len(titles)], "escrowed")
+            for j in range(buyer_orders):
+                self.add_order(buyer, key, titles[j % len(titles)], "delivered", {"report": "ok"})
+            for j in range(history):
+                self.add_order(key, buyer, titles[j % len(titles)], "completed", {"report": "ok"})
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = -1
+
+            def respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                time.sleep(fake.delay)
+                status, payload, headers = fake.handle(self.command, self.path, self.headers, body)
+                data = json.dumps(payload).encode() if status != 304 else b""
+                with fake.lock:
+                    fake.bytes_sent += len(data)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = respond
+            do_POST = respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v1"
+
+    def add_order(self, seller, buyer, title, status, delivery_data=None):
+        order_id = f"o{len(self.orders) + 1}"
+        self.orders[order_id] = {"id": order_id, "seller": seller, "buyer": buyer, "status": status,
+                                 "listing": {"title": title}, "delivery_data": delivery_data,
+                                 "updated_at": self.now()}
+        self.created[order_id] = time.time()
+        return order_id
+
+    def place_order(self, seller_index, title="Viral Content Analysis"):
+        """A new escrowed order for one agent, from the next agent, while the server runs"""
+        with self.lock:
+            seller = self.keys[seller_index % len(self.keys)]
+            buyer = self.keys[(seller_index + 1) % len(self.keys)]
+            return self.add_order(seller, buyer, title, "escrowed")
+
+    @staticmethod
+    def now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def write_agents(self, directory):
+        """Agent credential files, as molt-road-agent.py saves them"""
+        os.makedirs(directory, exist_ok=True)
+        for key, profile in self.profiles.items():
+            with open(os.path.join(directory, f"{profile['name']}.json"), "w") as f:
+                json.dump({"name": profile["name"], "api_key": key}, f)
+
+    def handle(self, method, path, request_headers, body):
+        """(status, JSON payload, extra response headers) for one request"""
+        key = request_headers.get("X-API-Key")
+        route, _, query = path.partition("?")
+        route = route[len("/api/v1"):]
+        params = dict(pair.split("=", 1) for pair in query.split("&") if "=" in pair)
+        with self.lock:
+            name = "/orders/{id}/" + route.rsplit("/", 1)[-1] if route.count("/") == 3 else route
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+            if route == "/me":
+                return 200, self.profiles[key], {}
+            if route == "/orders":
+                side = "seller" if params.get("role") == "seller" else "buyer"
+                orders = [dict(o) for o in self.orders.values() if o[side] == key]
+                etag = f'"{len(orders)}-{max((o["updated_at"] for o in orders), default="")}"'
+                if request_headers.get("If-None-Match") == etag:
+                    self.not_modified += 1
+                    return 304, None, {"ETag": etag}
+                return 200, {"orders": orders}, {"ETag": etag}
+            if route.startswith("/orders/"):
+                _, _, order_id, action = route.split("/")
+                order = self.orders[order_id]
+                if action == "deliver" and order["seller"] == key and order["status"] == "escrowed":
+                    order.update(status="delivered", delivery_data=body.get("data"), updated_at=self.now())
+                    self.delivered[order_id] = time.time()
+                    return 200, {"success": True}, {}
+                if action == "confirm" and order["buyer"] == key and order["status"] == "delivered":
+                    order.update(status="completed", updated_at=self.now())
+                    return 200, {"success": True}, {}
+                return 409, {"error": f"cannot {action} order in status {order['status']}"}, {}
+            if route == "/bounties":
+                return 200, {"bounties": [{"title": "Viral content dataset", "reward": 200}]}, {}
+            if route == "/stats/activity":
+                return 200, {"activity": [{"type": "registration"}, {"type": "order"}]}, {}
+            if route == "/stats":
+                return 200, {"agents": len(self.keys), "listings": len(self.keys), "volume": 1000}, {}
+            if route == "/listings":
+                return 200, {"listings": []}, {}
+            if route == "/sessions/send":
+                self.alerts.append(body.get("message"))
+                return 200, {"success": True}, {}
+            return 404, {"error": "not found"}, {}
+
+    def count(self, status):
+        return sum(1 for o in self.orders.values() if o["status"] == status)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def option(args, name, default, cast=int):
+    """Read a --name VALUE option from an argument list"""
+    if name in args:
+        return cast(args[args.index(name) + 1])
+    return default
+
+
+def bench_tinyfish_batch(args):
+    """Sequential vs concurrent TinyFishScraper.scrape_batch against the stub"""
+    url_count = option(args, "--urls", 40)
+    concurrency = option(args, "--concurrency", 8)
+    delay = option(args, "--delay", 0.1, float)
+
+    tinyfish = load_script("tinyfish-scraper.py")
+    urls = [f"https://host{i % 4}.example.com/p/post-{i}" for i in range(url_count)]
+
+    print(f"🐟 TinyFish batch: {url_count} URLs, {delay:.2f}s stub latency")
+    with StubAPIServer(delay=delay) as stub, tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for workers in (1, concurrency):
+                scraper = tinyfish.TinyFishScraper(use_cache=False)
+                scraper.base_url = f"{stub.url}/v1"
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    entries = scraper.scrape_batch(urls, concurrency=workers, per_host=max(1, workers // 2))
+                wall_time = time.perf_counter() - started
+
+                in_order = [entry["url"] for entry in entries] == urls
+                failed = sum(1 for entry in entries if "error" in entry["result"])
+                latencies = [entry["latency"] for entry in entries]
+                print(f"   concurrency={workers:<3} wall={wall_time:6.2f}s "
+                      f"throughput={url_count / wall_time * 60:7.1f}/min "
+                      f"p50={tinyfish.percentile(latencies, 50):.3f}s "
+                      f"p95={tinyfish.percentile(latencies, 95):.3f}s "
+                      f"ordered={'yes' if in_order else 'NO'} failed={failed}")
+        finally:
+            os.chdir(cwd)
+
+
+def bench_transport(args):
+    """Fresh connection per request vs the shared keep-alive pool"""
+    import requests
+    from http_transport import create_session, pool_stats
+
+    count = option(args, "--requests", 200)
+    print(f"🔌 Transport: {count} POSTs to a local stub")
+
+    with StubAPIServer(delay=0) as stub:
+        started = time.perf_counter()
+        for _ in range(count):
+            requests.post(f"{stub.url}/v1/scrape", json={"url": "https://example.com"}, timeout=30)
+        fresh_time = time.perf_counter() - started
+        fresh_connections = stub.connections
+
+        session = create_session({"Content-Type": "application/json"})
+        started = time.perf_counter()
+        for _ in range(count):
+            session.post(f"{stub.url}/v1/scrape", json={"url": "https://example.com"}, timeout=30)
+        pooled_time = time.perf_counter() - started
+        pooled_connections = stub.connections - fresh_connections
+
+    print(f"   requests.post  {fresh_time:6.3f}s  {fresh_time / count * 1000:6.2f}ms/req  {fresh_connections} connections")
+    print(f"   shared session {pooled_time:6.3f}s  {pooled_time / count * 1000:6.2f}ms/req  {pooled_connections} connections")
+    print(f"   pool: {pool_stats()}")
+    print("   (loopback has no TLS; against a real API host each saved connection also skips a TLS handshake)")
+
+
+SCORING_SENTENCES = [
+    "My father was never there and I fought the battle alone.",
+    "The old man said she left, and the empty bed was all that remained.",
+    "Discover the secret to real strength: stand firm in faith and find grace.",
+    "Many men are burned out, angry and lost faith after the divorce.",
+    "Click here to join the brotherhood today and get your second chance.",
+    "Pray for wisdom. God restores the broken and the weak become warriors.",
+    "Nothing happened on Tuesday; the report was filed and the meeting ended.",
+]
+
+
+def scoring_corpus(count):
+    """Deterministic synthetic posts of varied length and trigger mix"""
+    docs = []
+    for i in range(count):
+        sentences = [SCORING_SENTENCES[(i * 7 + j * 3) % len(SCORING_SENTENCES)] for j in range(5 + i % 40)]
+        docs.append("\n".join(sentences))
+    return docs
+
+
+def bench_scoring(args):
+    """Per-document analyzers vs NumPy batch scoring, checking identical output"""
+    os.environ.setdefault("AGENTQL_API_KEY", "perf-bench")
+    from batch_scoring import BatchScorer
+    from intel_extractor import IntelExtractor
+    from theme_categorizer import ThemeCategorizer
+
+    count = option(args, "--docs", 10000)
+    docs = scoring_corpus(count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        agentql = load_script("agentql-scraper.py").AgentQLScraper(use_cache=False)
+    extractor = IntelExtractor(use_cache=False)
+    themes = ThemeCategorizer()
+    scorer = BatchScorer()
+
+    print(f"🧮 Scoring {count} documents ({sum(len(d.split()) for d in docs)} words)")
+    analyzers = [
+        ("intel metrics", lambda d: extractor.analyze_content({"content": d})["analysis"]["metrics"], scorer.intel_metrics),
+        ("agentql triggers", agentql.analyze_content, scorer.agentql_analyses),
+        ("theme scores", themes.analyze_content, scorer.theme_scores),
+    ]
+    for name, single, batch in analyzers:
+        started = time.perf_counter()
+        expected = [single(doc) for doc in docs]
+        single_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = batch(docs)
+        batch_time = time.perf_counter() - started
+
+        print(f"   {name:<17} per-doc {single_time:6.2f}s  batch {batch_time:6.2f}s  "
+              f"{single_time / batch_time:5.1f}x  identical={'yes' if actual == expected else 'NO'}")
+
+
+COLDSTART_SCRIPT = '''
+import time
+started = time.perf_counter()
+from content_pipeline import ContentPipeline
+pipeline = ContentPipeline(tokenizer={tokenizer!r})
+constructed = time.perf_counter()
+pipeline.process_content("Stand firm in the battle. Victory is yours, warrior of God!")
+print(constructed - started, time.perf_counter() - constructed)
+'''
+
+
+def bench_coldstart(args):
+    """Fresh-interpreter time to import and build ContentPipeline, then the first analysis"""
+    runs = option(args, "--runs", 5)
+    tokenizer = option(args, "--tokenizer", "auto", str)
+    script = COLDSTART_SCRIPT.format(tokenizer=tokenizer)
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    print(f"❄️  ContentPipeline cold start, {runs} fresh interpreters, tokenizer={tokenizer}")
+    constructs, firsts = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", script], cwd=here, capture_output=True,
+                                text=True, check=True).stdout.split()
+        total = time.perf_counter() - started
+        constructs.append(float(output[0]))
+        firsts.append(float(output[1]))
+    constructs.sort()
+    firsts.sort()
+    print(f"   import + ContentPipeline(): median {constructs[runs // 2] * 1000:7.1f}ms")
+    print(f"   first process_content:      median {firsts[runs // 2] * 1000:7.1f}ms (loads the tokenizer)")
+    print(f"   last interpreter wall time: {total * 1000:7.1f}ms")
+
+
+def bench_draft(args):
+    """Full rescoring vs DraftScorer after single-paragraph edits"""
+    from content_pipeline import ContentPipeline
+
+    words = option(args, "--words", 3000)
+    edits = option(args, "--edits", 50)
+    pipeline = ContentPipeline()
+    paragraphs = []
+    while sum(len(p.split()) for p in paragraphs) < words:
+        paragraphs.append(" ".join(SCORING_SENTENCES[(len(paragraphs) + j) % len(SCORING_SENTENCES)] for j in range(6)))
+    draft = pipeline.draft_scorer("\n\n".join(paragraphs))
+
+    print(f"✍️  Draft of {len(paragraphs)} paragraphs (~{words} words), {edits} single-paragraph edits")
+    full_time = incremental_time = 0
+    for i in range(edits):
+        paragraphs[(i * 7) % len(paragraphs)] += " Stand firm."
+        text = "\n\n".join(paragraphs)
+
+        started = time.perf_counter()
+        expected_voice = pipeline.voice_matcher.analyze_text(text)
+        expected_themes = pipeline.theme_categorizer.analyze_content(text)
+        full_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        draft.update(text)
+        voice, themes = draft.voice(), draft.theme_scores()
+        incremental_time += time.perf_counter() - started
+
+        if voice != expected_voice or themes != expected_themes:
+            print(f"   ❌ scores differ after edit {i}")
+            return
+
+    print(f"   full rescore   {full_time / edits * 1000:7.2f}ms/edit")
+    print(f"   incremental    {incremental_time / edits * 1000:7.2f}ms/edit  "
+          f"({draft.last_rescored} paragraph rescored, identical scores)")
+
+
+def synthetic_kjv(path):
+    """Plain-text KJV stand-in with every book, for benchmarking without the real text"""
+    from kjv_store import BOOKS
+    with open(path, "w") as f:
+        for name, _ in BOOKS:
+            for chapter in range(1, 19):
+                for verse in range(1, 27):
+                    f.write(f"{name} {chapter}:{verse} And it came to pass that the word of the LORD came "
+                            f"unto his servant, saying, Stand fast in the faith ({chapter}:{verse}).\n")
+
+
+def bench_kjv(args):
+    """Random verse lookups against the binary KJV store"""
+    from kjv_store import BOOK_NAMES, KJVStore, build_store
+
+    lookups = option(args, "--lookups", 100000)
+    store_path = option(args, "--store", None, str)
+    with tempfile.TemporaryDirectory() as workdir:
+        if store_path is None:
+            source = os.path.join(workdir, "kjv.txt")
+            synthetic_kjv(source)
+            store_path = os.path.join(workdir, "kjv.bin")
+            started = time.perf_counter()
+            build_store(source, store_path)
+            print(f"📖 Built synthetic store in {time.perf_counter() - started:.2f}s (pass --store for the real one)")
+
+        started = time.perf_counter()
+        store = KJVStore(store_path)
+        open_time = time.perf_counter() - started
+
+        rng = random.Random(1611)
+        refs = []
+        for _ in range(lookups):
+            book = rng.choice(BOOK_NAMES)
+            chapter = rng.randint(1, max(1, store.chapter_count_of(book)))
+            refs.append((book, chapter, rng.randint(1, max(1, store.verse_count_of(book, chapter)))))
+
+        started = time.perf_counter()
+        for book, chapter, verse in refs:
+            store.verse(book, chapter, verse)
+        lookup_time = time.perf_counter() - started
+
+        print(f"   open {open_time * 1e6:8.1f}µs  ({os.path.getsize(store_path) / 1024:.0f} KB mapped, "
+              f"{store.verse_count} verses)")
+        print(f"   {lookups} random lookups: {lookup_time / lookups * 1e6:.2f}µs/verse")
+        store.close()
+
+
+def bench_heartbeat(args):
+    """Molt Road heartbeat against the local fake API: one request at a time vs concurrent, then warm cycles"""
+    agents = option(args, "--agents", 6)
+    orders = option(args, "--orders", 4)
+    history = option(args, "--history", 500)
+    delay = option(args, "--delay", 0.05, float)
+    concurrency = option(args, "--concurrency", 8)
+    cycles = option(args, "--cycles", 4)
+    heartbeat = load_script("molt-road-heartbeat.py")
+
+    print(f"💓 Heartbeat: {agents} agents x {orders} escrowed orders ({history} past orders each), "
+          f"{delay:.2f}s fake API latency")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            for limit in (1, concurrency):
+                # Fresh working directory per run so sync state doesn't carry over between fakes
+                os.chdir(tempfile.mkdtemp(dir=workdir))
+                with FakeMoltRoad(agents=agents, seller_orders=orders, history=history, delay=delay) as fake:
+                    fake.write_agents(heartbeat.AGENTS_DIR)
+                    os.makedirs(heartbeat.REPORTS_DIR, exist_ok=True)
+                    heartbeat.ALERT_URL = fake.url + "/sessions/send"
+                    monitor = heartbeat.MoltRoadHeartbeat(base_url=fake.url, concurrency=limit)
+                    for cycle in range(1, cycles + 1):
+                        requests_before, bytes_before = sum(fake.calls.values()), fake.bytes_sent
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            cycle_time = monitor.run()
+                        print(f"   concurrency={limit:<3} cycle {cycle}: {cycle_time:6.2f}s  "
+                              f"requests={sum(fake.calls.values()) - requests_before:<4} "
+                              f"saved={monitor.snapshot.saved:<3} 304s={monitor.order_sync.unchanged:<3} "
+                              f"{(fake.bytes_sent - bytes_before) / 1024:7.1f} KB  "
+                              f"escrowed left={fake.count('escrowed')} awaiting confirm={fake.count('delivered')}")
+        finally:
+            os.chdir(cwd)
+
+
+def bench_metrics(args):
+    """Daily balance trend: globbing per-run report JSON vs the metrics rollups"""
+    from molt_road_metrics import DAY, MetricsStore
+
+    years = option(args, "--years", 3)
+    agents = option(args, "--agents", 6)
+    runs = years * 365 * 6
+    start = int(time.time()) - runs * 4 * 3600
+    names = [f"Agent{i}" for i in range(agents)]
+
+    print(f"📈 Metrics: {years} years of 4-hourly runs ({runs} runs x {agents} agents)")
+    with tempfile.TemporaryDirectory() as workdir:
+        store = MetricsStore(os.path.join(workdir, "metrics.db"))
+        started = time.perf_counter()
+        for run in range(runs):
+            ts = start + run * 4 * 3600
+            profiles = {name: {"balance": 100 + run % 97 + i, "rating_count": run // 50,
+                               "active_listings": [{}] * (1 + i % 3)} for i, name in enumerate(names)}
+            totals = {"agents": agents, "total_balance": sum(p["balance"] for p in profiles.values()),
+                      "total_ratings": sum(p["rating_count"] for p in profiles.values()), "active_listings": 12}
+            store.record(totals, profiles, ts=ts)
+            with open(os.path.join(workdir, f"report-{run:06d}.json"), "w") as f:
+                json.dump({"timestamp": datetime.fromtimestamp(ts).isoformat(), **totals}, f)
+        print(f"   wrote {runs} runs in {time.perf_counter() - started:.1f}s "
+              f"({os.path.getsize(store.path) / 1024:.0f} KB database)")
+
+        since = int(time.time()) - 90 * DAY
+        started = time.perf_counter()
+        days = {}
+        for path in glob.glob(os.path.join(workdir, "report-*.json")):
+            with open(path) as f:
+                report = json.load(f)
+            ts = datetime.fromisoformat(report["timestamp"]).timestamp()
+            if ts >= since:
+                days.setdefault(int(ts) // DAY, []).append(report["total_balance"])
+        glob_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        totals_trend = store.trend(since=since)
+        agent_trend = store.trend("Agent0", since=since)
+        all_time = store.trend(by="day")
+        store_time = time.perf_counter() - started
+
+        print(f"   90-day daily trend, glob + parse JSON: {glob_time * 1000:8.1f}ms ({len(days)} days)")
+        print(f"   90-day totals + agent + all-time daily trends from rollups: {store_time * 1000:6.1f}ms "
+              f"({len(totals_trend)} + {len(agent_trend)} + {len(all_time)} rows)")
+        store.close()
+
+
+def bench_daemon(args):
+    """Order-to-delivery latency and CPU: cron-style fresh runs vs the heartbeat daemon"""
+    import resource
+    import signal
+    import statistics
+
+    duration = option(args, "--duration", 20, float)
+    orders = option(args, "--orders", 12)
+    cron_interval = option(args, "--cron-interval", 4, float)
+    min_interval = option(args, "--min-interval", 0.2, float)
+    max_interval = option(args, "--max-interval", 1, float)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "molt-road-heartbeat.py")
+    rng = random.Random(4)
+    schedule = sorted(rng.uniform(0, duration * 0.8) for _ in range(orders))
+
+    print(f"⏲️  Daemon vs cron: {orders} orders placed over {duration:.0f}s; cron every {cron_interval:g}s, "
+          f"daemon {min_interval:g}-{max_interval:g}s adaptive")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            for mode in ("cron", "daemon"):
+                os.chdir(tempfile.mkdtemp(dir=workdir))
+                with FakeMoltRoad(agents=3, seller_orders=0, buyer_orders=0, delay=0.01) as fake:
+                    fake.write_agents("molt-road-agents")
+                    env = dict(os.environ, MOLT_ROAD_URL=fake.url,
+                               MOLT_ROAD_ALERT_URL=fake.url + "/sessions/send")
+                    cpu_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+                    started = time.monotonic()
+                    pending = list(schedule)
+                    daemon = None
+                    if mode == "daemon":
+                        daemon = subprocess.Popen(
+                            [sys.executable, script, "--daemon", "--min-interval", str(min_interval),
+                             "--max-interval", str(max_interval), "--report-interval", str(cron_interval)],
+                            env=env, stdout=subprocess.DEVNULL
+                        )
+                    next_run = started
+                    while time.monotonic() - started < duration:
+                        elapsed = time.monotonic() - started
+                        while pending and pending[0] <= elapsed:
+                            fake.place_order(len(pending))
+                            pending.pop(0)
+                        if daemon is None and time.monotonic() >= next_run:
+                            subprocess.run([sys.executable, script], env=env, stdout=subprocess.DEVNULL)
+                            next_run += cron_interval
+                        time.sleep(0.01)
+                    if daemon is not None:
+                        daemon.send_signal(signal.SIGTERM)
+                        daemon.wait()
+                    cpu_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+                    latencies = [fake.delivered[order_id] - fake.created[order_id] for order_id in fake.delivered]
+                    cpu = (cpu_after.ru_utime + cpu_after.ru_stime) - (cpu_before.ru_utime + cpu_before.ru_stime)
+                    median = f"{statistics.median(latencies):5.2f}s" if latencies else "   n/a"
+                    print(f"   {mode:<7} median order→delivery {median}  delivered {len(latencies)}/{orders}  "
+                          f"CPU {cpu:5.2f}s  requests {sum(fake.calls.values())}  alerts {len(fake.alerts)}")
+        finally:
+            os.chdir(cwd)
+
+
+BENCHMARKS = {
+    "tinyfish-batch": bench_tinyfish_batch,
+    "transport": bench_transport,
+    "scoring": bench_scoring,
+    "coldstart": bench_coldstart,
+    "draft": bench_draft,
+    "kjv": bench_kjv,
+    "heartbeat": bench_heartbeat,
+    "metrics": bench_metrics,
+    "daemon": bench_daemon,
+}
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(__doc__.strip())
+        print("\nBenchmarks: " + ", ".join(BENCHMARKS))
+        return
+
+    BENCHMARKS[sys.argv[1]](sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Phrase Scanner - compiled multi-phrase matcher
+Aho-Corasick automaton over word tokens, so every phrase (single or
+multi-word) is found on word boundaries in one linear pass over the text
+"""
+
+import re
+from collections import Counter, deque
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class PhraseScanner:
+    def __init__(self, lexicon):
+        """
+        Compile a lexicon into an automaton
+
+        Args:
+            lexicon (dict): {category: [phrases]}. A phrase may appear in
+                several categories and is matched case-insensitively.
+        """
+        self.lexicon = {category: list(phrases) for category, phrases in lexicon.items()}
+        self.phrase_categories = {}
+
+        # State 0 is the root; each state has token transitions, a failure
+        # link and the phrases that end there (including via failure links)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.max_length = 1
+
+        for category, phrases in self.lexicon.items():
+            for phrase in phrases:
+                tokens = tuple(TOKEN_PATTERN.findall(phrase.lower()))
+                if not tokens:
+                    continue
+                key = ' '.join(tokens)
+                categories = self.phrase_categories.setdefault(key, [])
+                if category not in categories:
+                    categories.append(category)
+                if len(categories) == 1:
+                    self._add_phrase(tokens, key)
+
+        self._build_failure_links()
+
+    def _add_phrase(self, tokens, key):
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = next_state
+            state = next_state
+        self.output[state].append((key, len(tokens)))
+        self.max_length = max(self.max_length, len(tokens))
+
+    def _build_failure_links(self):
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def scan(self, text):
+        """Yield (phrase, start, end) for every phrase occurrence in text"""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        # Character spans of the last few tokens, enough to locate the longest phrase start
+        spans = deque(maxlen=self.max_length)
+
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group().lower()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+
+            spans.append(match.span())
+            if output[state]:
+                for phrase, length in output[state]:
+                    yield phrase, spans[-length][0], spans[-1][1]
+
+    def analyze(self, text, positions=False):
+        """
+        Scan text once and aggregate the matches
+
+        Returns:
+            dict: 'categories' {category: occurrences}, 'phrases'
+            {phrase: occurrences} and, if requested, 'positions'
+            {phrase: [(start, end), ...]}
+        """
+        phrase_counts = Counter()
+        phrase_positions = {}
+
+        for phrase, start, end in self.scan(text):
+            phrase_counts[phrase] += 1
+            if positions:
+                phrase_positions.setdefault(phrase, []).append((start, end))
+
+        category_counts = dict.fromkeys(self.lexicon, 0)
+        for phrase, count in phrase_counts.items():
+            for category in self.phrase_categories[phrase]:
+                category_counts[category] += count
+
+        result = {'categories': category_counts, 'phrases': dict(phrase_counts)}
+        if positions:
+            result['positions'] = phrase_positions
+        return result
+
+    def category_phrases(self, category, phrase_counts):
+        """Phrases from one category that appear in an analyze() phrase count"""
+        return [phrase for phrase in phrase_counts if category in self.phrase_categories[phrase]]
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+On-disk cache for scraper fetches, keyed by normalized URL + query template.
+One SQLite file holds the index and the (compressed) bodies, with
+per-platform TTLs, size-bounded LRU eviction and ETag/Last-Modified
+validators for conditional re-fetches.
+
+Usage:
+  python response_cache.py stats
+  python response_cache.py clear
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+DEFAULT_CACHE_PATH = os.path.join("intel", "cache", "responses.db")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds a cached response stays fresh, per platform
+PLATFORM_TTLS = {
+    "x": 6 * 3600,
+    "substack": 7 * 86400,
+    "youtube": 86400,
+    "linkedin": 86400,
+    "web": 86400
+}
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+                   "ref", "ref_src", "fbclid", "gclid"}
+
+
+def normalize_url(url):
+    """Canonical form of a URL for cache keys"""
+    parsed = urlparse(url.strip())
+    scheme = (parsed.scheme or "https").lower()
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host in ("twitter.com", "mobile.twitter.com", "mobile.x.com"):
+        host = "x.com"
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = parsed.path.rstrip("/") or "/"
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                   if k.lower() not in TRACKING_PARAMS)
+    if host == "x.com":
+        # Post URLs only carry share-tracking params (?s=20&t=...)
+        query = []
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
+
+PLATFORM_HOSTS = {
+    "x": ("x.com", "twitter.com"),
+    "substack": ("substack.com",),
+    "youtube": ("youtube.com", "youtu.be"),
+    "linkedin": ("linkedin.com",)
+}
+
+
+def detect_platform_key(url):
+    """Platform bucket used for TTLs (the host or one of its subdomains, so dropbox.com isn't X)"""
+    host = (urlparse(url.strip()).hostname or "").lower()
+    for platform, domains in PLATFORM_HOSTS.items():
+        if any(host == domain or host.endswith("." + domain) for domain in domains):
+            return platform
+    return "web"
+
+
+class ResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**PLATFORM_TTLS, **(ttls or {})}
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_access)")
+        self.db.commit()
+        # Running size of all bodies, so a put doesn't re-sum the table
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def make_key(self, url, template=None):
+        """Cache key: normalized URL plus the query template/options sent with it"""
+        material = normalize_url(url)
+        if template is not None:
+            material += "\n" + json.dumps(template, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, url, template=None):
+        """
+        Look up a cached response, fresh or stale
+
+        Returns:
+            dict: body, etag, last_modified, fetched_at and 'fresh' (within
+            TTL), or None if nothing is cached
+        """
+        key = self.make_key(url, template)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT body, etag, last_modified, fetched_at, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.db.commit()
+
+        body, etag, last_modified, fetched_at, expires_at = row
+        return {
+            "body": zlib.decompress(body).decode(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+            "fresh": now < expires_at
+        }
+
+    def get_json(self, url, template=None):
+        """get() with the body decoded as JSON"""
+        entry = self.get(url, template)
+        if entry is not None:
+            entry["body"] = json.loads(entry["body"])
+        return entry
+
+    def put(self, url, body, template=None, etag=None, last_modified=None):
+        """Store a response body (str, or any JSON-serialisable value)"""
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        blob = zlib.compress(body.encode())
+        platform = detect_platform_key(url)
+        now = time.time()
+
+        key = self.make_key(url, template)
+        with self.lock:
+            replaced = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url), platform, blob, len(blob),
+                 etag, last_modified, now, now + self.ttls[platform], now)
+            )
+            self.total_bytes += len(blob) - (replaced[0] if replaced else 0)
+            self._evict()
+            self.db.commit()
+
+    def revalidated(self, url, template=None):
+        """Origin answered 304 Not Modified: restart the entry's TTL"""
+        now = time.time()
+        ttl = self.ttls[detect_platform_key(url)]
+        with self.lock:
+            self.db.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + ttl, now, self.make_key(url, template))
+            )
+            self.db.commit()
+
+    def conditional_headers(self, entry):
+        """If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        # Re-sync once before evicting, in case another process wrote to the same file
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if self.total_bytes <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            victims.append((key,))
+            self.total_bytes -= size
+            if self.total_bytes <= self.max_bytes:
+                break
+        self.db.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def stats(self):
+        """Entry count and size per platform"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT platform, COUNT(*), SUM(size), SUM(expires_at > ?) FROM responses GROUP BY platform",
+                (time.time(),)
+            ).fetchall()
+        return {platform: {"entries": count, "bytes": size, "fresh": fresh}
+                for platform, count, size, fresh in rows}
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+            self.total_bytes = 0
+        self.db.execute("VACUUM")
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("stats", "clear"):
+        print(__doc__.strip())
+        return
+
+    cache = ResponseCache()
+    if sys.argv[1] == "stats":
+        stats = cache.stats()
+        if not stats:
+            print("📭 Cache is empty")
+        for platform, info in sorted(stats.items()):
+            print(f"  {platform:<10} {info['entries']:>6} entries  {info['fresh']:>6} fresh  {info['bytes'] / 1024:>10.1f} KB")
+    else:
+        cache.clear()
+        print("🧹 Cache cleared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""ContentPipeline.process_many with a document that fails mid-batch, and cached results"""
+
+import copy
+
+import pytest
+
+from content_pipeline import ContentPipeline
+
+BATCH = [
+    {"source": "first", "content": "Stand firm in the battle, warrior. Victory is yours."},
+    {"source": "blank", "content": ""},
+    {"source": "last", "content": "My father was never there. I found grace in the fight."},
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bad_document_does_not_abort_batch(workers):
+    pipeline = ContentPipeline(tokenizer="regex")
+    results = list(pipeline.process_many(BATCH, workers=workers))
+
+    assert [result["source"] for result in results] == ["first", "blank", "last"]
+    assert "error" in results[1]
+    assert "error" not in results[0] and "voice_dna" in results[0]
+    assert "error" not in results[2] and "voice_dna" in results[2]
+
+
+def test_editing_results_leaves_cached_analysis_intact():
+    pipeline = ContentPipeline(tokenizer="regex")
+    content = BATCH[2]["content"]
+    first = pipeline.process_content(content)
+    expected = copy.deepcopy(pipeline.process_content(content))
+
+    first["voice_dna"]["match_score"] = -1
+    first["voice_suggestions"].append("edited")
+    first["themes"]["primary_themes"].append("edited")
+    first["themes"]["theme_scores"].clear()
+
+    assert pipeline.process_content(content) == expected
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""MoltRoadHeartbeat.publish_events alert deduplication across cycles"""
+
+import os
+import asyncio
+import importlib.util
+
+
+def load_script(filename):
+    """Import one of the hyphenated CLI scripts as a module"""
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def open_order(heartbeat, order_id):
+    heartbeat.order_sync.feed("Agent", "seller")["open"][order_id] = {"id": order_id, "status": "escrowed"}
+
+
+def published_events(heartbeat):
+    return [event["event"] for event in asyncio.run(heartbeat.publish_events())]
+
+
+def test_cleared_problems_are_forgotten_and_alert_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    heartbeat_module = load_script("molt-road-heartbeat.py")
+    monkeypatch.setattr(heartbeat_module, "ALERT_URL", None)
+    heartbeat = heartbeat_module.MoltRoadHeartbeat(quiet=True)
+
+    open_order(heartbeat, "o1")
+    heartbeat.emit("check_failed", "Agent", error="timeout")
+    assert published_events(heartbeat) == ["check_failed", "orders_need_attention"]
+    assert heartbeat.alerted == {("Agent", "o1"), ("Agent", "timeout")}
+
+    # Same problems next cycle: logged, but no new alert
+    heartbeat.emit("check_failed", "Agent", error="timeout")
+    assert published_events(heartbeat) == ["check_failed"]
+    assert heartbeat.alerted == {("Agent", "o1"), ("Agent", "timeout")}
+
+    # Both cleared: nothing left to remember
+    heartbeat.order_sync.mark_done("Agent", "seller", "o1")
+    assert published_events(heartbeat) == []
+    assert heartbeat.alerted == set()
+
+    # Reopened and failing again: alerted again
+    open_order(heartbeat, "o1")
+    heartbeat.emit("check_failed", "Agent", error="timeout")
+    assert published_events(heartbeat) == ["check_failed", "orders_need_attention"]
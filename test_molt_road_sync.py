@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""OrderSync.merge against order feeds with and without updated_at"""
+
+from molt_road_sync import OrderSync
+
+
+class FakeResponse:
+    def __init__(self, orders, status_code=200, etag=None):
+        self.orders = orders
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return {"orders": self.orders}
+
+    def raise_for_status(self):
+        pass
+
+
+def order(order_id, status, **stamps):
+    return {"id": order_id, "status": status, "listing": {"title": "Viral Content Analysis"}, **stamps}
+
+
+def open_ids(orders):
+    return sorted(o["id"] for o in orders)
+
+
+def test_old_order_changing_status_is_still_acted_on(tmp_path):
+    # The real API only sends created_at, which doesn't move when the status does
+    sync = OrderSync(str(tmp_path / "sync.json"))
+    first = sync.merge("Agent", "seller", FakeResponse([
+        order("old", "pending", created_at="2026-01-01T00:00:00Z"),
+        order("new", "escrowed", created_at="2026-03-01T00:00:00Z"),
+    ], etag='"1"'))
+    assert open_ids(first) == ["new"]
+    sync.mark_done("Agent", "seller", "new")
+    sync.save()
+
+    sync = OrderSync(str(tmp_path / "sync.json"))
+    second = sync.merge("Agent", "seller", FakeResponse([
+        order("old", "escrowed", created_at="2026-01-01T00:00:00Z"),
+        order("new", "delivered", created_at="2026-03-01T00:00:00Z"),
+    ], etag='"2"'))
+    assert open_ids(second) == ["old"]
+    assert sync.in_escrow() == 2
+
+
+def test_buyer_order_delivered_after_cursor_moved(tmp_path):
+    sync = OrderSync(str(tmp_path / "sync.json"))
+    sync.merge("Agent", "buyer", FakeResponse([
+        order("old", "escrowed", created_at="2026-01-01T00:00:00Z"),
+        order("newer", "escrowed", created_at="2026-02-01T00:00:00Z"),
+    ]))
+    pending = sync.merge("Agent", "buyer", FakeResponse([
+        order("old", "delivered", created_at="2026-01-01T00:00:00Z"),
+        order("newer", "escrowed", created_at="2026-02-01T00:00:00Z"),
+    ]))
+    assert open_ids(pending) == ["old"]
+
+
+def test_updated_at_cursor_skips_unchanged_orders(tmp_path):
+    sync = OrderSync(str(tmp_path / "sync.json"))
+    sync.merge("Agent", "seller", FakeResponse([
+        order("a", "escrowed", updated_at="2026-01-01T00:00:00Z"),
+        order("b", "pending", updated_at="2026-02-01T00:00:00Z"),
+    ]))
+    sync.mark_done("Agent", "seller", "a")
+    pending = sync.merge("Agent", "seller", FakeResponse([
+        order("a", "escrowed", updated_at="2026-01-01T00:00:00Z"),
+        order("b", "escrowed", updated_at="2026-03-01T00:00:00Z"),
+    ]))
+    assert open_ids(pending) == ["b"]
+    assert sync.feed("Agent", "seller")["cursor"] == "2026-03-01T00:00:00Z"
+
+
+def test_not_modified_retries_open_orders(tmp_path):
+    sync = OrderSync(str(tmp_path / "sync.json"))
+    sync.merge("Agent", "seller", FakeResponse([order("a", "escrowed", created_at="2026-01-01")], etag='"1"'))
+    assert sync.request_headers("Agent", "seller") == {"If-None-Match": '"1"'}
+    pending = sync.merge("Agent", "seller", FakeResponse(None, status_code=304))
+    assert open_ids(pending) == ["a"]
+    assert sync.unchanged == 1
+
+
+def test_orders_missing_from_a_full_listing_are_dropped(tmp_path):
+    sync = OrderSync(str(tmp_path / "sync.json"))
+    sync.merge("Agent", "seller", FakeResponse([
+        order("gone", "escrowed", updated_at="2026-01-01T00:00:00Z"),
+        order("kept", "escrowed", updated_at="2026-01-01T00:00:00Z"),
+    ], etag='"1"'))
+    assert sync.in_escrow() == 2
+
+    # "kept" is skipped by the cursor but still listed, so its state survives
+    pending = sync.merge("Agent", "seller", FakeResponse([
+        order("kept", "escrowed", updated_at="2026-01-01T00:00:00Z"),
+        order("new", "pending", updated_at="2026-02-01T00:00:00Z"),
+    ], etag='"2"'))
+    assert open_ids(pending) == ["kept"]
+    assert sync.in_escrow() == 1
+
+    pending = sync.merge("Agent", "seller", FakeResponse([], etag='"3"'))
+    assert pending == []
+    assert sync.in_escrow() == 0
+    assert sync.open_orders() == {}
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""NitterMirrorPool ranking with open circuits, and racing mirrors"""
+
+import time
+
+from nitter_pool import NitterMirrorPool
+
+MIRRORS = ["a.example", "b.example", "c.example"]
+
+
+def make_pool(tmp_path):
+    return NitterMirrorPool(MIRRORS, health_file=str(tmp_path / "health.json"),
+                            failure_threshold=1, cooldown=60)
+
+
+def test_all_open_probes_the_mirror_opened_longest_ago(tmp_path):
+    pool = make_pool(tmp_path)
+    now = time.time()
+    for offset, instance in zip((30, 10, 50), MIRRORS):
+        pool.health[instance]["open_until"] = now + offset
+    assert pool.ranked() == ["b.example"]
+
+    result, instance = pool.fetch(lambda mirror: f"post from {mirror}", race=2)
+    assert (result, instance) == ("post from b.example", "b.example")
+    assert not pool.is_open("b.example")
+
+
+def test_failed_probe_reopens_the_circuit(tmp_path):
+    pool = make_pool(tmp_path)
+    for instance in MIRRORS:
+        pool.health[instance]["open_until"] = time.time() + 5
+    assert pool.fetch(lambda mirror: None) == (None, None)
+    assert all(pool.is_open(instance) for instance in MIRRORS)
+
+
+def test_race_losers_finishing_late_are_not_recorded(tmp_path):
+    pool = make_pool(tmp_path)
+
+    def fetch(mirror):
+        if mirror == "a.example":
+            return "fast"
+        time.sleep(0.2)
+        return None
+
+    pool.health["c.example"]["successes"] = -10  # keep c out of the race
+    result, instance = pool.fetch(fetch, race=2)
+    assert (result, instance) == ("fast", "a.example")
+    time.sleep(0.4)
+    assert pool.health["b.example"]["failures"] == 0
+    assert not pool.is_open("b.example")
+    assert pool.health["a.example"]["successes"] == 1
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Response cache keys (through the scrapers' scrape_url), size accounting and platform buckets"""
+
+import os
+import importlib.util
+
+import pytest
+
+from response_cache import ResponseCache, detect_platform_key
+
+
+def load_script(filename):
+    """Import one of the hyphenated CLI scripts as a module"""
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def json(self):
+        return {"text": "Hold the line, brother. " * 10}
+
+
+class FakeSession:
+    """Counts the paid API calls a scraper makes"""
+
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, *args, **kwargs):
+        self.posts += 1
+        return FakeResponse()
+
+
+def scrape_twice(scraper, tmp_path):
+    scraper.cache = ResponseCache(str(tmp_path / "responses.db"))
+    scraper.session = FakeSession()
+    first = scraper.scrape_url("https://www.x.com/a/status/1?s=20")
+    second = scraper.scrape_url("https://x.com/a/status/1")
+    scraper.cache.close()
+    return scraper.session.posts, first, second
+
+
+def test_tinyfish_share_url_hits_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tinyfish = load_script("tinyfish-scraper.py")
+    posts, first, second = scrape_twice(tinyfish.TinyFishScraper(), tmp_path)
+    assert posts == 1
+    assert second["raw_data"] == first["raw_data"]
+
+
+def test_agentql_share_url_hits_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AGENTQL_API_KEY", "test-key")
+    agentql = load_script("agentql-scraper.py")
+    posts, first, second = scrape_twice(agentql.AgentQLScraper(), tmp_path)
+    assert posts == 1
+    assert second["raw_data"] == first["raw_data"]
+
+
+def test_options_still_split_the_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tinyfish = load_script("tinyfish-scraper.py")
+    scraper = tinyfish.TinyFishScraper()
+    scraper.cache = ResponseCache(str(tmp_path / "responses.db"))
+    scraper.session = FakeSession()
+    scraper.scrape_url("https://x.com/a/status/1")
+    scraper.scrape_url("https://x.com/a/status/1", {"screenshot": True})
+    assert scraper.session.posts == 2
+
+
+def test_running_size_tracks_puts_replacements_and_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.db"), max_bytes=4000)
+    for i in range(40):
+        cache.put(f"https://example.com/p/{i % 25}", {"text": f"post {i} " + "x" * (i * 37 % 900)})
+        actual = cache.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        assert cache.total_bytes == actual <= 4000
+    assert cache.get("https://example.com/p/14") is not None
+    cache.close()
+
+    reopened = ResponseCache(str(tmp_path / "responses.db"), max_bytes=4000)
+    assert reopened.total_bytes == actual
+    reopened.close()
+
+
+@pytest.mark.parametrize("url,platform", [
+    ("https://x.com/a/status/1", "x"),
+    ("https://mobile.twitter.com/a/status/1", "x"),
+    ("https://www.dropbox.com/s/file", "web"),
+    ("https://box.com/file", "web"),
+    ("https://biblicalman.substack.com/p/post", "substack"),
+    ("https://notsubstack.com/p/post", "web"),
+    ("https://youtu.be/abc", "youtube"),
+])
+def test_platform_key_matches_hosts_exactly(url, platform):
+    assert detect_platform_key(url) == platform
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""TinyFishScraper.scrape_batch against a local stub of the TinyFish API"""
+
+import os
+import json
+import time
+import threading
+import importlib.util
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+
+def load_script(filename):
+    """Import one of the hyphenated CLI scripts as a module"""
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubTinyFish:
+    """Answers /v1/scrape after a delay, tracking requests in flight per target host"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.peak = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                host = urlparse(request["url"]).netloc
+                with stub.lock:
+                    stub.in_flight[host] = stub.in_flight.get(host, 0) + 1
+                    stub.peak[host] = max(stub.peak.get(host, 0), stub.in_flight[host])
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.in_flight[host] -= 1
+                body = json.dumps({"text": f"Scraped {request['url']}"}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.mark.parametrize("concurrency,per_host", [(8, 2), (6, 1), (3, 3)])
+def test_batch_keeps_order_and_per_host_limit(tmp_path, monkeypatch, concurrency, per_host):
+    monkeypatch.chdir(tmp_path)
+    tinyfish = load_script("tinyfish-scraper.py")
+    # Mostly one host, as a single-site list would be, plus a few others
+    urls = [f"https://a.example.com/p/{i}" for i in range(12)]
+    urls += [f"https://host{i % 3}.example.com/p/{i}" for i in range(9)]
+
+    with StubTinyFish() as stub:
+        scraper = tinyfish.TinyFishScraper(use_cache=False)
+        scraper.base_url = stub.url
+        finished = []
+        entries = scraper.scrape_batch(urls, concurrency=concurrency, per_host=per_host,
+                                       on_result=lambda index, entry: finished.append(index))
+
+    assert [entry["url"] for entry in entries] == urls
+    assert all(entry["result"]["raw_data"]["text"] == f"Scraped {entry['url']}" for entry in entries)
+    assert sorted(finished) == list(range(len(urls)))
+    assert max(stub.peak.values()) <= per_host
+    assert stub.peak["a.example.com"] == per_host
+
+
+@pytest.mark.parametrize("flags", [["--concurrency"], ["--concurrency", "x"], ["--per-host", "0"],
+                                   ["--concurrency", "-2"]])
+def test_batch_cli_rejects_bad_limits(tmp_path, monkeypatch, capsys, flags):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "urls.txt").write_text("https://a.example.com/p/1\n")
+    tinyfish = load_script("tinyfish-scraper.py")
+    monkeypatch.setattr("sys.argv", ["tinyfish-scraper.py", "batch", "urls.txt", *flags])
+    tinyfish.main()
+    assert "Usage:" in capsys.readouterr().out
@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import List, Dict
+from typing import List, Dict, Optional
 import re
 
+from phrase_scanner import PhraseScanner
+
 class CoreTheme(Enum):
     WARFARE = "Spiritual Warfare"
     IDENTITY = "Kingdom Identity"
@@ -48,28 +50,36 @@ class ThemeCategorizer:
                 'win', 'success', 'achievement', 'breakthrough'
             ]
         }
+        # Token -> theme index: one pass scores every theme, on word boundaries
+        self.scanner = PhraseScanner(self.theme_keywords)
         
     def analyze_content(self, text: str) -> Dict[CoreTheme, float]:
         """Analyze content and return theme strength scores"""
-        text = text.lower()
         word_count = len(text.split())
-        scores = {}
-        
-        for theme, keywords in self.theme_keywords.items():
-            theme_count = sum(text.count(keyword) for keyword in keywords)
-            # Calculate normalized score (0-1)
-            scores[theme] = min(theme_count / (word_count * 0.01), 1.0)
-            
-        return scores
+        if word_count == 0:
+            return dict.fromkeys(self.theme_keywords, 0.0)
+        return self.scores_from_counts(self.scanner.analyze(text)['categories'], word_count)
+    
+    def scores_from_counts(self, theme_counts: Dict[CoreTheme, int], word_count: int) -> Dict[CoreTheme, float]:
+        """Theme scores from keyword hit counts and a whitespace word count"""
+        if word_count == 0:
+            return dict.fromkeys(self.theme_keywords, 0.0)
+        # Calculate normalized score (0-1)
+        return {theme: min(theme_counts[theme] / (word_count * 0.01), 1.0)
+                for theme in self.theme_keywords}
     
-    def get_primary_themes(self, text: str, threshold: float = 0.3) -> List[CoreTheme]:
+    def get_primary_themes(self, text: str, threshold: float = 0.3,
+                           scores: Optional[Dict[CoreTheme, float]] = None) -> List[CoreTheme]:
         """Get primary themes that exceed the threshold"""
-        scores = self.analyze_content(text)
+        if scores is None:
+            scores = self.analyze_content(text)
         return [theme for theme, score in scores.items() if score >= threshold]
     
-    def suggest_theme_enhancements(self, text: str) -> List[str]:
+    def suggest_theme_enhancements(self, text: str,
+                                   scores: Optional[Dict[CoreTheme, float]] = None) -> List[str]:
         """Suggest ways to strengthen weak themes"""
-        scores = self.analyze_content(text)
+        if scores is None:
+            scores = self.analyze_content(text)
         suggestions = []
         
         for theme, score in scores.items():
@@ -82,10 +92,10 @@ class ThemeCategorizer:
         return suggestions
     
     def categorize_content(self, text: str) -> Dict[str, any]:
-        """Complete content categorization"""
+        """Complete content categorization (one scoring pass shared by all outputs)"""
         scores = self.analyze_content(text)
-        primary_themes = self.get_primary_themes(text)
-        suggestions = self.suggest_theme_enhancements(text)
+        primary_themes = self.get_primary_themes(text, scores=scores)
+        suggestions = self.suggest_theme_enhancements(text, scores=scores)
         
         return {
             'theme_scores': {theme.value: score for theme, score in scores.items()},
@@ -7,10 +7,18 @@ Scrape any website using TinyFish API
 import os
 import sys
 import json
-import requests
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from urllib.parse import urlparse
 import re
+
+from html_text import extract_text
+from http_transport import create_session, mount_pool
+from intel_index import index_intel
+from response_cache import ResponseCache
+
 # Load API key
 try:
     with open('.env.tinyfish', 'r') as f:
@@ -21,14 +29,25 @@ try:
 except:
     API_KEY = 'sk-mino-2j9F0LwwvKhtExPfyjk04OJJ7-fj_vRl'
 
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
 class TinyFishScraper:
-    def __init__(self):
+    def __init__(self, use_cache=True, refresh=False):
         self.api_key = API_KEY
         self.base_url = "https://tinyfish.ai/v1"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.session = create_session(self.headers)
+        self.cache = ResponseCache() if use_cache else None
+        self.refresh = refresh
         
     def scrape_url(self, url, options=None):
         """Scrape any URL using TinyFish"""
@@ -46,29 +65,42 @@ class TinyFishScraper:
         
         if options:
             default_options.update(options)
+        # Keyed by the normalized URL plus the options, not the raw URL
+        cache_options = {key: value for key, value in default_options.items() if key != "url"}
+            
+        # Paid API call: serve from cache while the entry is fresh
+        if self.cache and not self.refresh:
+            cached = self.cache.get_json(url, cache_options)
+            if cached and cached["fresh"]:
+                print(f"📦 Cache hit: {url}")
+                return self.process_response(cached["body"], url)
             
         try:
             # Try the scrape endpoint
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/scrape",
-                headers=self.headers,
                 json=default_options,
                 timeout=30
             )
             
             if response.status_code == 200:
-                return self.process_response(response.json(), url)
+                data = response.json()
+                if self.cache:
+                    self.cache.put(url, data, cache_options)
+                return self.process_response(data, url)
             else:
                 # Fallback to simpler endpoint if available
-                simple_response = requests.get(
+                simple_response = self.session.get(
                     f"{self.base_url}/extract",
-                    headers=self.headers,
                     params={"url": url},
                     timeout=30
                 )
                 
                 if simple_response.status_code == 200:
-                    return self.process_response(simple_response.json(), url)
+                    data = simple_response.json()
+                    if self.cache:
+                        self.cache.put(url, data, cache_options)
+                    return self.process_response(data, url)
                 else:
                     return {"error": f"API returned {response.status_code}: {response.text}"}
                     
@@ -141,30 +173,16 @@ class TinyFishScraper:
         """Extract Substack specific content"""
         content = data.get("text", "") or data.get("content", "")
         
-        # Extract title
-        title_match = re.search(r'<h1[^>]*>([^<]+)</h1>', content)
-        title = title_match.group(1) if title_match else "Unknown"
-        
-        # Extract main article
-        article_patterns = [
-            r'<div[^>]*class="[^"]*post-content[^"]*"[^>]*>(.*?)</div>',
-            r'<article[^>]*>(.*?)</article>'
-        ]
-        
-        article_content = ""
-        for pattern in article_patterns:
-            match = re.search(pattern, content, re.DOTALL)
-            if match:
-                article_content = match.group(1)
-                break
-                
-        # Clean HTML
-        clean_content = re.sub(r'<[^>]+>', ' ', article_content)
-        clean_content = re.sub(r'\s+', ' ', clean_content).strip()
+        # Title and main article in one pass
+        page = extract_text(
+            content,
+            containers=[("div", "post-content"), ("article", None)],
+            limit=5000
+        )
         
         return {
-            "title": title,
-            "content": clean_content[:5000],
+            "title": page["heading"] or "Unknown",
+            "content": page["text"],
             "type": "article"
         }
         
@@ -191,21 +209,12 @@ class TinyFishScraper:
         """Process generic web content"""
         content = data.get("text", "") or data.get("content", "")
         
-        # Remove scripts and styles
-        content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL)
-        content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL)
-        
-        # Extract title
-        title_match = re.search(r'<title>([^<]+)</title>', content)
-        title = title_match.group(1) if title_match else "Unknown"
-        
-        # Clean HTML
-        clean_content = re.sub(r'<[^>]+>', ' ', content)
-        clean_content = re.sub(r'\s+', ' ', clean_content).strip()
+        # Drop scripts/styles and collect title + text in one pass
+        page = extract_text(content, limit=5000)
         
         return {
-            "title": title,
-            "content": clean_content[:5000],
+            "title": page["title"] or "Unknown",
+            "content": page["text"],
             "type": "webpage"
         }
         
@@ -272,13 +281,20 @@ class TinyFishScraper:
         """Save to intel folder"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         platform = data.get("platform", "unknown").lower().replace("/", "-")
-        filename = f"tinyfish_{platform}_{timestamp}.json"
+        filename = f"tinyfish_{platform}_{timestamp}"
         
         os.makedirs("intel", exist_ok=True)
-        filepath = os.path.join("intel", filename)
+        filepath = os.path.join("intel", f"{filename}.json")
+        
+        # Batch runs save several results per second
+        suffix = 2
+        while os.path.exists(filepath):
+            filepath = os.path.join("intel", f"{filename}_{suffix}.json")
+            suffix += 1
         
         with open(filepath, 'w') as f:
             json.dump(data, f, indent=2)
+        index_intel(data, filepath, source="tinyfish")
             
         print(f"💾 Saved to: {filepath}")
         
@@ -307,39 +323,171 @@ class TinyFishScraper:
             f.write(data.get('content', '')[:2000])
             
         print(f"📝 Summary at: {md_filename}")
+        return filepath
+        
+    def scrape_batch(self, urls, concurrency=1, per_host=2, on_result=None):
+        """
+        Scrape many URLs on a bounded thread pool
+        
+        Args:
+            urls (list): URLs to scrape
+            concurrency (int): Maximum requests in flight
+            per_host (int): Maximum requests in flight per target host
+            on_result (callable): Called as on_result(index, entry) in the
+                main thread as each URL finishes
+            
+        Returns:
+            list: One entry per URL, in input order, with the scrape result
+            and its latency in seconds
+        """
+        concurrency = max(1, concurrency)
+        per_host = max(1, per_host)
+        # Every request goes to the API host, so size its pool to the batch
+        mount_pool(self.session, concurrency)
+        entries = [None] * len(urls)
+        # One queue per target host, and the hosts that have URLs waiting and
+        # a free slot, so each wakeup only looks at URLs it can start
+        queues = {}
+        for index, url in enumerate(urls):
+            queues.setdefault(urlparse(url).netloc.lower(), deque()).append((index, url))
+        ready = deque(queues)
+        host_load = dict.fromkeys(queues, 0)
+        in_flight = {}
+        
+        def timed_scrape(url):
+            started = time.perf_counter()
+            result = self.scrape_url(url)
+            return result, time.perf_counter() - started
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while ready or in_flight:
+                # Start the next URLs, taking hosts in turn
+                while ready and len(in_flight) < concurrency:
+                    host = ready.popleft()
+                    index, url = queues[host].popleft()
+                    host_load[host] += 1
+                    in_flight[pool.submit(timed_scrape, url)] = (index, url, host)
+                    if queues[host] and host_load[host] < per_host:
+                        ready.append(host)
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, url, host = in_flight.pop(future)
+                    host_load[host] -= 1
+                    # A host at its limit gets a free slot back
+                    if queues[host] and host_load[host] == per_host - 1:
+                        ready.append(host)
+                    try:
+                        result, elapsed = future.result()
+                    except Exception as e:
+                        result, elapsed = {"error": str(e)}, 0
+                    entries[index] = {"url": url, "result": result, "latency": elapsed}
+                    if on_result:
+                        on_result(index, entries[index])
+                        
+        return entries
+        
+def print_usage():
+    print("TinyFish Web Scraper - Biblical Man Edition")
+    print("\nUsage:")
+    print("  python tinyfish-scraper.py <URL>")
+    print("  python tinyfish-scraper.py batch <file> [--concurrency N] [--per-host N]")
+    print("\nCache flags:")
+    print("  --no-cache   Don't read or write the response cache")
+    print("  --refresh    Re-fetch even if a fresh cached copy exists")
+    print("\nSupported platforms:")
+    print("  - X/Twitter")
+    print("  - Substack")
+    print("  - YouTube")
+    print("  - Any website")
+    print("\nExamples:")
+    print("  python tinyfish-scraper.py https://x.com/user/status/123")
+    print("  python tinyfish-scraper.py https://biblicalman.substack.com/p/article")
+
+def positive_option(args, name, default):
+    """--name N as an int >= 1; None if missing or invalid"""
+    if name not in args:
+        return default
+    try:
+        value = int(args[args.index(name) + 1])
+    except (IndexError, ValueError):
+        return None
+    return value if value >= 1 else None
         
 def main():
+    use_cache = "--no-cache" not in sys.argv
+    refresh = "--refresh" in sys.argv
+    sys.argv = [arg for arg in sys.argv if arg not in ("--no-cache", "--refresh")]
+    
     if len(sys.argv) < 2:
-        print("TinyFish Web Scraper - Biblical Man Edition")
-        print("\nUsage:")
-        print("  python tinyfish-scraper.py <URL>")
-        print("  python tinyfish-scraper.py batch <file>")
-        print("\nSupported platforms:")
-        print("  - X/Twitter")
-        print("  - Substack")
-        print("  - YouTube")
-        print("  - Any website")
-        print("\nExamples:")
-        print("  python tinyfish-scraper.py https://x.com/user/status/123")
-        print("  python tinyfish-scraper.py https://biblicalman.substack.com/p/article")
+        print_usage()
         return
         
-    scraper = TinyFishScraper()
+    scraper = TinyFishScraper(use_cache=use_cache, refresh=refresh)
     
     if sys.argv[1] == "batch" and len(sys.argv) > 2:
         # Batch process
+        args = sys.argv[3:]
+        concurrency = positive_option(args, "--concurrency", 1)
+        per_host = positive_option(args, "--per-host", 2)
+        if concurrency is None or per_host is None:
+            print("❌ --concurrency and --per-host need a whole number of at least 1\n")
+            print_usage()
+            return
+        
         with open(sys.argv[2], 'r') as f:
             urls = [line.strip() for line in f if line.strip()]
             
-        for url in urls:
-            print(f"\nProcessing: {url}")
-            result = scraper.scrape_url(url)
-            
+        print(f"🐟 Processing {len(urls)} URLs ({concurrency} concurrent, {per_host} per host)...")
+        
+        def record(index, entry):
+            result = entry["result"]
             if "error" not in result:
-                scraper.save_intel(result)
-                print("✅ Success")
+                entry["file"] = scraper.save_intel(result)
+                print(f"✅ [{index + 1}/{len(urls)}] {entry['url']} ({entry['latency']:.1f}s)")
             else:
-                print(f"❌ Error: {result['error']}")
+                print(f"❌ [{index + 1}/{len(urls)}] {entry['url']}: {result['error']}")
+        
+        started = time.perf_counter()
+        entries = scraper.scrape_batch(urls, concurrency=concurrency, per_host=per_host, on_result=record)
+        wall_time = time.perf_counter() - started
+        
+        latencies = [entry["latency"] for entry in entries]
+        succeeded = sum(1 for entry in entries if "error" not in entry["result"])
+        stats = {
+            "urls": len(urls),
+            "succeeded": succeeded,
+            "failed": len(urls) - succeeded,
+            "wall_time": wall_time,
+            "throughput_per_min": len(urls) / wall_time * 60 if wall_time else 0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95)
+        }
+        
+        # Summary manifest, in input order (kept out of intel/*.json reports)
+        os.makedirs(os.path.join("intel", "batches"), exist_ok=True)
+        manifest_file = os.path.join("intel", "batches", f"tinyfish_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(manifest_file, 'w') as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(),
+                "concurrency": concurrency,
+                "per_host": per_host,
+                "stats": stats,
+                "results": [{
+                    "url": entry["url"],
+                    "status": "error" if "error" in entry["result"] else "ok",
+                    "error": entry["result"].get("error"),
+                    "file": entry.get("file"),
+                    "latency": entry["latency"]
+                } for entry in entries]
+            }, f, indent=2)
+            
+        print("\n=== Batch Summary ===")
+        print(f"Succeeded: {succeeded}/{len(urls)}")
+        print(f"Wall time: {wall_time:.1f}s")
+        print(f"Throughput: {stats['throughput_per_min']:.1f} URLs/min")
+        print(f"Latency p50: {stats['latency_p50']:.2f}s  p95: {stats['latency_p95']:.2f}s")
+        print(f"Manifest: {manifest_file}")
                 
     else:
         # Single URL
@@ -1,10 +1,121 @@
+import os
 import re
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-nltk.download('punkt')
+import sys
+
+# 'auto' uses NLTK punkt if it is installed locally and the regex splitter
+# otherwise, never touching the network; 'nltk' downloads punkt if missing
+DEFAULT_TOKENIZER = os.environ.get('VOICE_TOKENIZER', 'auto')
+
+# Punkt models across NLTK versions (punkt_tab from 3.8.2, punkt before)
+PUNKT_RESOURCES = ('punkt_tab', 'punkt')
+
+# Distinct tokens whose metaphor hit counts are memoized per matcher
+TOKEN_MEMO_SIZE = 50000
+
+# Abbreviations that end with a period but not a sentence
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'st', 'jr', 'sr', 'vs', 'etc', 'vol', 'ch', 'cf', 'ps', 'v', 'vv'}
+
+SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+WORD_PATTERN = re.compile(r"\w+(?=n't)|n't|'\w+|\w+|[^\w\s]")
+
+class RegexTokenizer:
+    """Dependency-free sentence splitter and Treebank-like word tokenizer"""
+    name = 'regex'
+    
+    def sentences(self, text):
+        sentences = []
+        pending = ''
+        for piece in SENTENCE_END.split(text.strip()):
+            pending = f"{pending} {piece}" if pending else piece
+            last_word = re.search(r'(\w+)\.\W*$', pending)
+            if last_word and last_word.group(1).lower() in ABBREVIATIONS:
+                continue
+            sentences.append(pending)
+            pending = ''
+        if pending:
+            sentences.append(pending)
+        return [s for s in sentences if s]
+    
+    def words(self, text):
+        return WORD_PATTERN.findall(text)
+    
+    def split(self, text):
+        """(sentences, word tokens per sentence)"""
+        sentences = self.sentences(text)
+        return sentences, [WORD_PATTERN.findall(sent) for sent in sentences]
+
+class NLTKTokenizer:
+    """NLTK punkt sentences + Treebank words, imported on first use"""
+    name = 'nltk'
+    
+    def __init__(self, sent_tokenize, word_tokenize):
+        self.sentences = sent_tokenize
+        self.words = word_tokenize
+    
+    def split(self, text):
+        """(sentences, word tokens per sentence); word_tokenize(text) is their concatenation"""
+        sentences = self.sentences(text)
+        return sentences, [self.words(sent) for sent in sentences]
+
+def _load_nltk(download=False):
+    """NLTKTokenizer from local punkt data (optionally downloading it); None if unavailable"""
+    try:
+        import nltk
+        from nltk.tokenize import sent_tokenize, word_tokenize
+    except ImportError:
+        return None
+    
+    def installed():
+        for resource in PUNKT_RESOURCES:
+            try:
+                nltk.data.find(f'tokenizers/{resource}')
+                return True
+            except LookupError:
+                pass
+        return False
+    
+    if not installed() and not download:
+        return None
+    if not installed():
+        for resource in PUNKT_RESOURCES:
+            try:
+                nltk.download(resource, quiet=True)
+            except Exception:
+                pass
+        if not installed():
+            return None
+    return NLTKTokenizer(sent_tokenize, word_tokenize)
+
+_tokenizers = {}
+
+def get_tokenizer(backend=None):
+    """
+    Shared tokenizer for a backend, loaded once per process
+    
+    Args:
+        backend (str): 'nltk', 'regex' or 'auto' (default: VOICE_TOKENIZER
+            env var, else 'auto')
+    """
+    backend = backend or DEFAULT_TOKENIZER
+    if backend not in _tokenizers:
+        if backend == 'regex':
+            _tokenizers[backend] = RegexTokenizer()
+        elif backend in ('nltk', 'auto'):
+            tokenizer = _load_nltk(download=backend == 'nltk')
+            if tokenizer is None:
+                if backend == 'nltk':
+                    raise RuntimeError("NLTK punkt tokenizer unavailable (pip install nltk; python -m nltk.downloader punkt_tab)")
+                print("⚠️  NLTK punkt unavailable, using the regex sentence splitter", file=sys.stderr)
+                tokenizer = RegexTokenizer()
+            _tokenizers[backend] = tokenizer
+        else:
+            raise ValueError(f"Unknown tokenizer backend: {backend}")
+    return _tokenizers[backend]
 
 class VoiceDNAMatcher:
-    def __init__(self):
+    def __init__(self, tokenizer=None):
+        self.tokenizer_backend = tokenizer or DEFAULT_TOKENIZER
+        self._tokenizer = None
         self.target_avg_words = 8.5
         self.target_short_ratio = 0.62
         self.combat_metaphors = [
@@ -12,26 +123,72 @@ class VoiceDNAMatcher:
             'victory', 'conquer', 'defend', 'strike', 'triumph', 'mighty',
             'strength', 'overcome', 'prevail', 'stand firm', 'resist'
         ]
+        self._token_metaphors = {}
+    
+    @property
+    def tokenizer(self):
+        """Backend tokenizer, loaded on first analysis rather than at import"""
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer(self.tokenizer_backend)
+        return self._tokenizer
     
-    def analyze_text(self, text):
-        sentences = sent_tokenize(text)
+    def tokenize(self, text):
+        """Sentence split and word tokens (one tokenization), reusable across analyze_text calls"""
+        sentences, sentence_words = self.tokenizer.split(text)
+        return {'sentences': sentences, 'sentence_words': sentence_words}
+    
+    def count_metaphors(self, text, sentence_words):
+        """
+        Combat metaphor occurrences, counted as substrings of the text (so
+        'war' also counts inside 'warrior'). Single-word metaphors never
+        span tokens, so each distinct token is counted once and memoized;
+        only multi-word metaphors scan the text.
+        """
+        singles = [m for m in self.combat_metaphors if ' ' not in m]
+        memo = self._token_metaphors
+        if len(memo) > TOKEN_MEMO_SIZE:
+            memo.clear()
+        
+        count = 0
+        for words in sentence_words:
+            for token in words:
+                hits = memo.get(token)
+                if hits is None:
+                    lowered = token.lower()
+                    hits = memo[token] = sum(lowered.count(m) for m in singles)
+                count += hits
+        
+        phrases = [m for m in self.combat_metaphors if ' ' in m]
+        if phrases:
+            text_lower = text.lower()
+            count += sum(text_lower.count(m) for m in phrases)
+        return count
+    
+    def analyze_text(self, text, tokens=None):
+        if tokens is None:
+            tokens = self.tokenize(text)
+        sentences = tokens['sentences']
         
         # Calculate average words per sentence
-        words_per_sentence = [len(word_tokenize(sent)) for sent in sentences]
-        avg_words = sum(words_per_sentence) / len(sentences)
+        words_per_sentence = [len(words) for words in tokens['sentence_words']]
         
         # Calculate short sentence ratio (sentences < 8 words)
         short_sentences = sum(1 for wps in words_per_sentence if wps < 8)
-        short_ratio = short_sentences / len(sentences)
         
         # Count combat metaphors
-        text_lower = text.lower()
-        metaphor_count = sum(text_lower.count(metaphor) for metaphor in self.combat_metaphors)
+        metaphor_count = self.count_metaphors(text, tokens['sentence_words'])
+        
+        return self.score_counts(len(sentences), sum(words_per_sentence), short_sentences, metaphor_count)
+    
+    def score_counts(self, sentence_count, total_words, short_sentences, metaphor_count):
+        """Voice stats from aggregate counts (shared by analyze_text and incremental scoring)"""
+        avg_words = total_words / sentence_count
+        short_ratio = short_sentences / sentence_count
         
         # Calculate match scores (0-1 scale)
         words_score = 1 - min(abs(avg_words - self.target_avg_words) / self.target_avg_words, 1)
         ratio_score = 1 - abs(short_ratio - self.target_short_ratio)
-        metaphor_density = metaphor_count / (len(word_tokenize(text)) / 100)  # per 100 words
+        metaphor_density = metaphor_count / (total_words / 100)  # per 100 words
         
         return {
             'avg_words_per_sentence': avg_words,
@@ -40,8 +197,9 @@ class VoiceDNAMatcher:
             'match_score': (words_score + ratio_score + min(metaphor_density/10, 1)) / 3
         }
     
-    def get_voice_suggestions(self, text):
-        stats = self.analyze_text(text)
+    def get_voice_suggestions(self, text, stats=None):
+        if stats is None:
+            stats = self.analyze_text(text)
         suggestions = []
         
         if stats['match_score'] < 0.7: